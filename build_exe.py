@@ -236,16 +236,20 @@ def sign_executable(exe_path, cert_path, key_path):
         except:
             pass
 
-def build_executable():
+def build_executable(onedir=False):
     """Build the executable"""
     print("🔨 Building executable...")
     
     # PyInstaller command - build it carefully to avoid None values
     cmd = [
         "pyinstaller",
-        "--onefile",  # Single executable file
+        # --onefile unpacks everything to a temp dir on every launch; --onedir starts much faster
+        "--onedir" if onedir else "--onefile",
         "--windowed",  # No console window
-        "--name", "DiscordDaySummarizer"
+        "--name", "DiscordDaySummarizer",
+        # gui.py imports the summarizer and engine lazily, so make sure they are bundled
+        "--hidden-import", "day_summarizer",
+        "--hidden-import", "engine"
     ]
     
     # Add icon if it exists
@@ -264,6 +268,8 @@ def build_executable():
     try:
         subprocess.check_call(cmd)
         print("✅ Executable built successfully!")
+        if onedir:
+            return os.path.join("dist", "DiscordDaySummarizer", "DiscordDaySummarizer.exe")
         return os.path.join("dist", "DiscordDaySummarizer.exe")
     except subprocess.CalledProcessError as e:
         print(f"❌ Build failed: {e}")
@@ -295,7 +301,8 @@ def main():
     
     try:
         # Build executable
-        exe_path = build_executable()
+        # Pass --onedir for a folder build that skips the per-launch unpack step
+        exe_path = build_executable(onedir="--onedir" in sys.argv)
         
         if exe_path and os.path.exists(exe_path):
             print(f"📁 Executable created: {exe_path}")
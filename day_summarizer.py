@@ -5,45 +5,837 @@ Uses your personal Discord account - no bot required!
 """
 
 import os
+import re
 import json
+import shutil
+import hashlib
+import tempfile
+import sqlite3
 import requests
 import asyncio
+import aiohttp
 import time
 import argparse
-from datetime import datetime, timedelta, timezone
+import atexit
+import threading
+import weakref
+import signal
+from datetime import datetime, time as dtime, timedelta, timezone
 from typing import List, Dict, Optional
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, OrderedDict
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
 from dotenv import load_dotenv
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python 3.8
+    ZoneInfo = None
 
 # Load environment variables
 load_dotenv()
 
+# Local cache for directories, throughput stats and other state kept between runs
+CACHE_DIR = os.getenv('CACHE_DIR', '.summarizer_cache')
 
-class OllamaClient:
-    """Client for interacting with Ollama API"""
+
+def cache_path(name: str) -> str:
+    """Return the path of a file inside the local cache directory"""
+    return os.path.join(CACHE_DIR, name)
+
+
+def load_cache(name: str, max_age: Optional[float] = None) -> Optional[Dict]:
+    """Load a JSON cache file, or None if it is missing, corrupt or older than max_age seconds"""
+    try:
+        with open(cache_path(name), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if max_age is not None and time.time() - data.get('saved_at', 0) > max_age:
+        return None
+    return data
+
+
+def save_cache(name: str, data: Dict):
+    """Atomically write a JSON cache file"""
+    try:
+        path = cache_path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = dict(data, saved_at=time.time())
+        # A unique temp file per write, so concurrent writers never clobber each other's
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(path),
+                                         prefix=os.path.basename(path) + '.', suffix='.tmp',
+                                         delete=False) as f:
+            tmp_path = f.name
+            try:
+                json.dump(data, f)
+            except Exception:
+                f.close()
+                os.remove(tmp_path)
+                raise
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            os.remove(tmp_path)
+            raise
+    except OSError as e:
+        print(f"⚠️  Could not write cache {name}: {e}")
+
+
+class CacheWriter:
+    """Runs cache writes on one daemon thread, so the event loop never waits on the disk
+    
+    Writes are coalesced by key: if a key is submitted again before the thread gets to it,
+    only the newest write runs. A write is a function, so it can snapshot its data (or
+    merge with the file on disk) at the moment it is written.
+    """
+    
+    def __init__(self):
+        self._pending: 'OrderedDict[object, object]' = OrderedDict()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._busy = False
+    
+    def submit(self, key, write):
+        with self._condition:
+            self._pending[key] = write
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="cache-writer", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every submitted write is on disk; False on timeout"""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._busy, timeout)
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                _, write = self._pending.popitem(last=False)
+                self._busy = True
+            try:
+                write()
+            except Exception as e:
+                print(f"⚠️  Background cache write failed: {e}")
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+
+cache_writer = CacheWriter()
+atexit.register(cache_writer.flush, 5)
+
+
+class OperationCancelled(BaseException):
+    """Raised when a CancellationToken fires
+    
+    Derives from BaseException (like asyncio.CancelledError) so the broad
+    ``except Exception`` handlers around network calls do not swallow it.
+    """
+
+
+class CancellationToken:
+    """Cooperative cancellation shared by a run's fetch loops and model calls"""
+    
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+    
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+    
+    def cancel(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+    
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise OperationCancelled()
+    
+    def wait(self, seconds: float) -> bool:
+        """Sleep for up to ``seconds``; returns True if cancelled meanwhile"""
+        return self._event.wait(seconds)
+    
+    def register(self, callback):
+        """Run ``callback`` on cancellation (immediately if already cancelled); returns an unregister function"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._unregister(callback)
+        callback()
+        return lambda: None
+    
+    def _unregister(self, callback):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+def cancellable_request(method: str, url: str, cancel_token: Optional[CancellationToken] = None,
+                        session: Optional[requests.Session] = None, **kwargs):
+    """``requests.request`` that returns within a fraction of a second of cancellation
+    
+    The blocking call runs on a helper thread. If the token fires first, OperationCancelled
+    is raised right away and the response is closed as soon as it arrives, so the server
+    sees the disconnect and frees its resources. Pass ``session`` to reuse pooled connections.
+    """
+    http = session or requests
+    if cancel_token is None:
+        return http.request(method, url, **kwargs)
+    cancel_token.raise_if_cancelled()
+    
+    result = {}
+    done = threading.Event()
+    
+    def worker():
+        try:
+            result['response'] = http.request(method, url, **kwargs)
+        except Exception as e:
+            result['error'] = e
+        finally:
+            done.set()
+    
+    def close_when_ready():
+        done.wait()
+        if 'response' in result:
+            result['response'].close()
+    
+    threading.Thread(target=worker, daemon=True).start()
+    while not done.wait(0.1):
+        if cancel_token.is_cancelled:
+            threading.Thread(target=close_when_ready, daemon=True).start()
+            raise OperationCancelled()
+    
+    if 'error' in result:
+        raise result['error']
+    return result['response']
+
+
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def background_loop() -> asyncio.AbstractEventLoop:
+    """Event loop on a daemon thread that runs the async clients behind the blocking wrappers"""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="async-clients", daemon=True).start()
+            _background_loop = loop
+    return _background_loop
+
+
+_async_sessions: List[tuple] = []  # (loop, weakref to aiohttp session) for every pooled session
+
+
+def new_client_session(**kwargs) -> aiohttp.ClientSession:
+    """Create a pooled aiohttp session on the running loop, closed automatically at exit"""
+    session = aiohttp.ClientSession(**kwargs)
+    _async_sessions.append((asyncio.get_running_loop(), weakref.ref(session)))
+    return session
+
+
+def close_session_soon(connection: Dict):
+    """Close the session in ``connection['session']`` on the background loop without waiting
+    
+    Registered as a finalizer by the blocking client wrappers, so a discarded client
+    releases its connections instead of leaving them to the exit handler.
+    """
+    session = connection.get('session')
+    if session is not None and not session.closed and _background_loop is not None:
+        asyncio.run_coroutine_threadsafe(session.close(), _background_loop)
+
+
+@atexit.register
+def _close_async_sessions():
+    # Close sessions on their own loops so interpreter exit doesn't warn about unclosed connectors
+    for loop, ref in _async_sessions:
+        session = ref()
+        if session is None or session.closed or not loop.is_running():
+            continue
+        try:
+            asyncio.run_coroutine_threadsafe(session.close(), loop).result(timeout=2)
+        except Exception:
+            pass
+
+
+def run_coroutine_sync(coro, cancel_token: Optional[CancellationToken] = None):
+    """Run a coroutine on the background loop and block until it finishes
+    
+    Cancelling the token cancels the task (aborting its in-flight HTTP request) and
+    raises OperationCancelled here. Must not be called from the background loop itself.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, background_loop())
+    unregister = cancel_token.register(future.cancel) if cancel_token else (lambda: None)
+    try:
+        return future.result()
+    except CancelledError:
+        raise OperationCancelled()
+    finally:
+        unregister()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English chat text (about 4 characters per token)"""
+    return (len(text) + 3) // 4
+
+
+DISCORD_EPOCH_MS = 1420070400000
+
+
+def datetime_to_snowflake(dt: datetime) -> int:
+    """Convert a datetime to the smallest Discord snowflake at that instant"""
+    # Discord snowflakes encode timestamp: ((timestamp_ms - 1420070400000) << 22)
+    return int(dt.timestamp() * 1000 - DISCORD_EPOCH_MS) << 22
+
+
+def snowflake_to_datetime(snowflake) -> datetime:
+    """Recover the creation time encoded in a Discord snowflake"""
+    return datetime.fromtimestamp(((int(snowflake) >> 22) + DISCORD_EPOCH_MS) / 1000, tz=timezone.utc)
+
+
+def format_message_line(message: Dict, depth: int = 0) -> str:
+    """Format a single message as a compact prompt line (empty string if it has no content)"""
+    timestamp_str = message.get('timestamp', '')
+    try:
+        timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+        time_str = timestamp.strftime("%H:%M")
+    except:
+        time_str = "??:??"
+    
+    author = message.get('author', {})
+    author_name = author.get('username', 'Unknown')
+    content = message.get('content', '')
+    
+    # Handle attachments
+    attachments = message.get('attachments', [])
+    if attachments:
+        content += f" [Attachments: {len(attachments)}]"
+    
+    # Handle embeds
+    embeds = message.get('embeds', [])
+    if embeds:
+        content += f" [Embeds: {len(embeds)}]"
+    
+    if not content.strip():
+        return ""
+    
+    # Handle replies
+    if message.get('message_reference'):
+        content = f"[Reply] {content}"
+    
+    indent = "  " * min(depth, 3)
+    return f"{indent}[{time_str}] {author_name}: {content}"
+
+
+class Conversation:
+    """A reply tree plus the unreplied messages that continue it"""
+    
+    def __init__(self, conversation_id: str):
+        self.id = conversation_id
+        self.messages: List[Dict] = []  # Chronological order
+        self.depths: Dict[str, int] = {}  # Message id -> reply depth
+        self.authors = set()
+    
+    def add(self, message: Dict, depth: int = 0):
+        self.messages.append(message)
+        self.depths[message.get('id')] = depth
+        self.authors.add(message.get('author', {}).get('username', 'Unknown'))
+    
+    @property
+    def start(self) -> int:
+        return int(self.messages[0].get('id', 0))
+    
+    @property
+    def end(self) -> int:
+        return int(self.messages[-1].get('id', 0))
+    
+    def __len__(self):
+        return len(self.messages)
+    
+    def format(self) -> str:
+        lines = (format_message_line(msg, self.depths.get(msg.get('id'), 0)) for msg in self.messages)
+        return "\n".join(line for line in lines if line)
+
+
+class ConversationIndex:
+    """O(n) index that links replies into trees and separates interleaved conversations
+    
+    A message joins a conversation by replying (``message_reference``) to a message
+    already in it, or by its author having posted in it within ``gap_seconds``.
+    Otherwise it starts a new conversation.
+    """
+    
+    def __init__(self, messages: List[Dict], gap_seconds: int = 300):
+        self.gap_ms = gap_seconds * 1000
+        self.by_id: Dict[str, Dict] = {}
+        self.children: Dict[str, List[str]] = defaultdict(list)
+        self.conversation_of: Dict[str, Conversation] = {}
+        self.conversations: List[Conversation] = []
+        self._build(messages)
+    
+    @staticmethod
+    def _chronological(messages: List[Dict]) -> List[Dict]:
+        """Return messages oldest first without sorting when the input is already ordered"""
+        ids = [int(msg.get('id', 0)) for msg in messages]
+        if all(a <= b for a, b in zip(ids, ids[1:])):
+            return list(messages)
+        if all(a >= b for a, b in zip(ids, ids[1:])):
+            return list(reversed(messages))  # Discord pages are newest first
+        return sorted(messages, key=lambda msg: int(msg.get('id', 0)))
+    
+    def _build(self, messages: List[Dict]):
+        author_last: Dict[str, tuple] = {}  # username -> (conversation, time_ms)
+        
+        for msg in self._chronological(messages):
+            msg_id = msg.get('id')
+            if msg_id is None:
+                continue
+            time_ms = (int(msg_id) >> 22) + DISCORD_EPOCH_MS
+            author = msg.get('author', {}).get('username', 'Unknown')
+            
+            conversation = None
+            depth = 0
+            parent_id = (msg.get('message_reference') or {}).get('message_id')
+            
+            if parent_id and parent_id in self.conversation_of:
+                conversation = self.conversation_of[parent_id]
+                depth = conversation.depths.get(parent_id, 0) + 1
+                self.children[parent_id].append(msg_id)
+            elif author in author_last and time_ms - author_last[author][1] <= self.gap_ms:
+                conversation = author_last[author][0]
+            
+            if conversation is None:
+                conversation = Conversation(msg_id)
+                self.conversations.append(conversation)
+            
+            conversation.add(msg, depth)
+            self.by_id[msg_id] = msg
+            self.conversation_of[msg_id] = conversation
+            author_last[author] = (conversation, time_ms)
+    
+    def format(self) -> str:
+        """Format all conversations, separated by blank lines"""
+        blocks = (conversation.format() for conversation in self.conversations)
+        return "\n\n".join(block for block in blocks if block)
+    
+    def chunk(self, max_chars: int) -> List[str]:
+        """Pack whole conversations into prompt-sized chunks
+        
+        A conversation is only split (at line boundaries) when it alone exceeds ``max_chars``.
+        """
+        chunks = []
+        current = []
+        current_len = 0
+        
+        for conversation in self.conversations:
+            block = conversation.format()
+            if not block:
+                continue
+            
+            if len(block) > max_chars:
+                if current:
+                    chunks.append("\n\n".join(current))
+                    current, current_len = [], 0
+                chunks.extend(self._split_block(block, max_chars))
+                continue
+            
+            if current and current_len + len(block) + 2 > max_chars:
+                chunks.append("\n\n".join(current))
+                current, current_len = [], 0
+            
+            current.append(block)
+            current_len += len(block) + 2
+        
+        if current:
+            chunks.append("\n\n".join(current))
+        return chunks
+    
+    def sample(self, max_chars: int) -> 'ConversationIndex':
+        """Keep the largest whole conversations that fit in ``max_chars``, in chronological order"""
+        sampled = ConversationIndex([])
+        sampled.gap_ms = self.gap_ms
+        budget = max_chars
+        keep = set()
+        for conversation in sorted(self.conversations, key=len, reverse=True):
+            size = len(conversation.format()) + 2
+            if size <= budget:
+                keep.add(conversation.id)
+                budget -= size
+        sampled.conversations = [c for c in self.conversations if c.id in keep]
+        return sampled
+    
+    @staticmethod
+    def _split_block(block: str, max_chars: int) -> List[str]:
+        pieces = []
+        lines = []
+        length = 0
+        for line in block.split("\n"):
+            if lines and length + len(line) + 1 > max_chars:
+                pieces.append("\n".join(lines))
+                lines, length = [], 0
+            lines.append(line)
+            length += len(line) + 1
+        if lines:
+            pieces.append("\n".join(lines))
+        return pieces
+
+
+def extractive_highlights(messages: List[Dict], max_items: int = 3) -> str:
+    """Pick the most substantial messages as bullet points without calling the model
+    
+    Messages are scored by length, reactions and the number of direct replies they received.
+    """
+    index = ConversationIndex(messages)
+    scored = []
+    for msg in index.by_id.values():
+        content = msg.get('content', '').strip()
+        if len(content) < 20:
+            continue
+        reactions = sum(r.get('count', 0) for r in msg.get('reactions', []))
+        replies = len(index.children.get(msg.get('id'), []))
+        score = min(len(content), 300) / 100 + reactions + 2 * replies
+        scored.append((score, msg))
+    
+    if not scored:
+        return "No significant business activities detected."
+    
+    top = sorted(scored, key=lambda item: item[0], reverse=True)[:max_items]
+    lines = []
+    for _, msg in sorted(top, key=lambda item: int(item[1].get('id', 0))):
+        author = msg.get('author', {}).get('username', 'Unknown')
+        content = " ".join(msg.get('content', '').split())
+        if len(content) > 200:
+            content = content[:197] + "..."
+        lines.append(f"• {author}: {content}")
+    return "\n".join(lines)
+
+
+class GuildDirectory:
+    """Member, role and channel names for a guild, cached on disk with a TTL
+    
+    Roles and channels are fetched in one pass per TTL. Members are harvested in bulk
+    from message authors and ``mentions`` (user accounts cannot list guild members),
+    and accumulate in the cache across runs.
+    """
+    
+    def __init__(self, guild_id: int, ttl: int = 86400):
+        self.guild_id = guild_id
+        self.ttl = ttl
+        self.members: Dict[str, str] = {}
+        self.roles: Dict[str, str] = {}
+        self.channels: Dict[str, str] = {}
+        self.fetched_at = 0.0
+        self._dirty = False
+    
+    @property
+    def cache_name(self) -> str:
+        return f"directory_{self.guild_id}.json"
+    
+    def load(self, client: Optional['DiscordHTTPClient'] = None, guild_info: Optional[Dict] = None):
+        """Load from the disk cache, refreshing roles and channels if the cache is stale"""
+        cached = load_cache(self.cache_name) or {}
+        self.members = cached.get('members', {})
+        self.roles = cached.get('roles', {})
+        self.channels = cached.get('channels', {})
+        self.fetched_at = cached.get('fetched_at', 0.0)
+        
+        if client and time.time() - self.fetched_at > self.ttl:
+            guild_info = guild_info or client.get_guild_info(self.guild_id) or {}
+            self.roles = {role['id']: role.get('name', 'role') for role in guild_info.get('roles', [])}
+            channels = client.get_guild_channels(self.guild_id, text_only=False)
+            if channels:
+                self.channels = {ch['id']: ch.get('name', 'channel') for ch in channels}
+            self.fetched_at = time.time()
+            self._dirty = True
+        return self
+    
+    def observe(self, messages: List[Dict]):
+        """Record every author and mentioned user seen in a batch of messages"""
+        for msg in messages:
+            for user in [msg.get('author', {})] + msg.get('mentions', []):
+                user_id = user.get('id')
+                if not user_id:
+                    continue
+                name = user.get('global_name') or user.get('username')
+                if name and self.members.get(user_id) != name:
+                    self.members[user_id] = name
+                    self._dirty = True
+    
+    def save(self):
+        if self._dirty:
+            save_cache(self.cache_name, {
+                'members': self.members,
+                'roles': self.roles,
+                'channels': self.channels,
+                'fetched_at': self.fetched_at,
+            })
+            self._dirty = False
+
+
+class MessageNormalizer:
+    """Rewrite message content into a compact form before it reaches the model
     
-    def __init__(self, url: str = "http://localhost:11434", model: str = "llama3.2"):
+    - ``<@id>``, ``<#id>`` and ``<@&id>`` tokens become ``@name``, ``#name`` and ``@role``
+    - URLs are shortened to host plus last path segment
+    - Code blocks longer than ``max_code_lines`` collapse to a placeholder with a line count
+    """
+    
+    MENTION_PATTERN = re.compile(r'<(@!?|#|@&)(\d{15,21})>')
+    URL_PATTERN = re.compile(r'https?://([^/\s<>]+)(/[^\s<>]*)?')
+    CODE_BLOCK_PATTERN = re.compile(r'```(\w*)\n?(.*?)```', re.DOTALL)
+    
+    def __init__(self, directory: Optional[GuildDirectory] = None, max_code_lines: int = 8):
+        self.directory = directory
+        self.max_code_lines = max_code_lines
+        self.chars_before = 0
+        self.chars_after = 0
+    
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.chars_before - self.chars_after) // 4
+    
+    def _resolve_mention(self, match) -> str:
+        kind, target_id = match.group(1), match.group(2)
+        directory = self.directory
+        if kind == '#':
+            name = directory.channels.get(target_id) if directory else None
+            return f"#{name or 'channel'}"
+        if kind == '@&':
+            name = directory.roles.get(target_id) if directory else None
+            return f"@{name or 'role'}"
+        name = directory.members.get(target_id) if directory else None
+        return f"@{name or 'user'}"
+    
+    @staticmethod
+    def _shorten_url(match) -> str:
+        host = match.group(1)
+        if host.startswith('www.'):
+            host = host[4:]
+        segments = [seg for seg in (match.group(2) or '').split('?')[0].split('/') if seg]
+        if not segments:
+            return host
+        if len(segments) == 1:
+            return f"{host}/{segments[0][:40]}"
+        return f"{host}/…/{segments[-1][:40]}"
+    
+    def _collapse_code(self, match) -> str:
+        code = match.group(2)
+        line_count = code.count('\n') + (0 if code.endswith('\n') else 1)
+        if line_count <= self.max_code_lines:
+            return match.group(0)
+        language = f"{match.group(1)} " if match.group(1) else ""
+        return f"[{language}code block: {line_count} lines]"
+    
+    def normalize_text(self, content: str) -> str:
+        content = self.CODE_BLOCK_PATTERN.sub(self._collapse_code, content)
+        content = self.MENTION_PATTERN.sub(self._resolve_mention, content)
+        return self.URL_PATTERN.sub(self._shorten_url, content)
+    
+    def normalize(self, messages: List[Dict]) -> List[Dict]:
+        """Return copies of the messages with normalized content"""
+        normalized = []
+        for msg in messages:
+            content = msg.get('content', '')
+            if content:
+                new_content = self.normalize_text(content)
+                self.chars_before += len(content)
+                self.chars_after += len(new_content)
+                msg = dict(msg, content=new_content)
+            normalized.append(msg)
+        return normalized
+
+
+class ThroughputStats:
+    """Rolling prompt and generation throughput of one Ollama host and model, persisted between runs
+    
+    Used to size request timeouts: tiny prompts that hang are detected quickly, while
+    large prompts on a slow host get the time they legitimately need.
+    """
+    
+    CACHE_NAME = "throughput.json"
+    DEFAULT_PROMPT_TPS = 50.0
+    DEFAULT_GENERATION_TPS = 8.0
+    DEFAULT_OUTPUT_TOKENS = 300
+    MIN_TIMEOUT = 15.0
+    MAX_TIMEOUT = 1800.0
+    SAFETY_FACTOR = 2.0
+    
+    _lock = threading.Lock()
+    
+    def __init__(self, url: str, model: str, alpha: float = 0.3):
+        self.key = f"{url}|{model}"
+        self.alpha = alpha
+        self.prompt_tps = self.DEFAULT_PROMPT_TPS
+        self.generation_tps = self.DEFAULT_GENERATION_TPS
+        self.output_tokens = float(self.DEFAULT_OUTPUT_TOKENS)
+        self.load_seconds = 0.0
+        self.samples = 0
+        self._load()
+    
+    def _load(self):
+        entry = (load_cache(self.CACHE_NAME) or {}).get('hosts', {}).get(self.key)
+        if entry:
+            self.prompt_tps = entry.get('prompt_tps', self.prompt_tps)
+            self.generation_tps = entry.get('generation_tps', self.generation_tps)
+            self.output_tokens = entry.get('output_tokens', self.output_tokens)
+            self.load_seconds = entry.get('load_seconds', self.load_seconds)
+            self.samples = entry.get('samples', 0)
+    
+    def save(self):
+        """Persist the rates in the background (this runs after every generate call on the loop)"""
+        cache_writer.submit((self.CACHE_NAME, self.key), self._write)
+    
+    def _write(self):
+        # Only the snapshot needs the lock; the merge with the file runs on the single writer thread
+        with self._lock:
+            entry = {
+                'prompt_tps': self.prompt_tps,
+                'generation_tps': self.generation_tps,
+                'output_tokens': self.output_tokens,
+                'load_seconds': self.load_seconds,
+                'samples': self.samples,
+            }
+        data = load_cache(self.CACHE_NAME) or {}
+        hosts = data.get('hosts', {})
+        hosts[self.key] = entry
+        save_cache(self.CACHE_NAME, {'hosts': hosts})
+    
+    def _blend(self, current: float, measured: float) -> float:
+        # The first measurement replaces the built-in defaults outright
+        if self.samples == 0:
+            return measured
+        return (1 - self.alpha) * current + self.alpha * measured
+    
+    def record(self, result: Dict):
+        """Update the rolling rates from the timing fields of an Ollama /api/generate response"""
+        prompt_count = result.get('prompt_eval_count') or 0
+        prompt_ns = result.get('prompt_eval_duration') or 0
+        eval_count = result.get('eval_count') or 0
+        eval_ns = result.get('eval_duration') or 0
+        if not eval_count or not eval_ns:
+            return
+        
+        with self._lock:
+            if prompt_count and prompt_ns:
+                self.prompt_tps = self._blend(self.prompt_tps, prompt_count / (prompt_ns / 1e9))
+            self.generation_tps = self._blend(self.generation_tps, eval_count / (eval_ns / 1e9))
+            self.output_tokens = self._blend(self.output_tokens, float(eval_count))
+            self.load_seconds = self._blend(self.load_seconds, (result.get('load_duration') or 0) / 1e9)
+            self.samples += 1
+        self.save()
+    
+    def expected_seconds(self, prompt_tokens: int, output_tokens: Optional[float] = None) -> float:
+        output_tokens = self.output_tokens if output_tokens is None else output_tokens
+        return self.load_seconds + prompt_tokens / self.prompt_tps + output_tokens / self.generation_tps
+    
+    def timeout_for(self, prompt_tokens: int) -> float:
+        """Request timeout for a prompt of this size on this host"""
+        timeout = self.SAFETY_FACTOR * self.expected_seconds(prompt_tokens) + 5
+        return max(self.MIN_TIMEOUT, min(timeout, self.MAX_TIMEOUT))
+
+
+class AsyncOllamaClient:
+    """asyncio client for the Ollama API
+    
+    Every request goes through one pooled aiohttp session, and a semaphore caps how many
+    generate/embed calls run against the host at once, so summarizing N channels is N
+    coroutines rather than N threads. Cancelling the awaiting task aborts the in-flight
+    request and frees the Ollama slot. ``_connection`` holds the session and semaphore and
+    can be shared between clients for the same host (see ClientPool).
+    """
+    
+    def __init__(self, url: str = "http://localhost:11434", model: str = "llama3.2", max_prompt_chars: int = 12000,
+                 max_concurrency: int = 4, max_connections: int = 10):
         self.url = url.rstrip('/')
         self.model = model
+        self.max_prompt_chars = max_prompt_chars
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.deadline: Optional[float] = None  # Epoch seconds; caps request timeouts when set
+        self.timeout_retries = 1
+        self.stream_callback = None  # Receives start/token/end events while generating
+        self.limiter: Optional['AIMDController'] = None  # Adaptive request limit of the current run, if any
+        self._throughput: Dict[str, ThroughputStats] = {}
+        self._connection: Dict = {}  # 'session' and 'semaphore', created on the loop that first uses them
     
-    def generate_summary(self, messages, channel_name):
-        """Generate a focused business summary using Ollama"""
+    async def _get_session(self) -> aiohttp.ClientSession:
+        session = self._connection.get('session')
+        if session is None or session.closed:
+            session = new_client_session(connector=aiohttp.TCPConnector(limit=self.max_connections))
+            self._connection['session'] = session
+            self._connection['semaphore'] = asyncio.Semaphore(self.max_concurrency)
+        return session
+    
+    def throughput(self, model: Optional[str] = None) -> ThroughputStats:
+        """Measured throughput for a model on this host"""
+        model = model or self.model
+        if model not in self._throughput:
+            self._throughput[model] = ThroughputStats(self.url, model)
+        return self._throughput[model]
+    
+    def _timeout(self, default: float) -> float:
+        if self.deadline is None:
+            return default
+        return max(1.0, min(default, self.deadline - time.time()))
+    
+    def expected_seconds(self, chars: int, model: Optional[str] = None) -> float:
+        """Expected time to summarize this many characters, including chunk and merge calls"""
+        calls = 1
+        if chars > self.max_prompt_chars:
+            calls = -(-chars // self.max_prompt_chars) + 1
+        stats = self.throughput(model)
+        return stats.expected_seconds(chars // 4, stats.output_tokens * calls)
+    
+    async def generate_summary(self, messages, channel_name, model: Optional[str] = None,
+                               char_budget: Optional[int] = None):
+        """Generate a focused business summary using Ollama
+        
+        ``model`` overrides the configured model for this call, and ``char_budget`` caps the
+        prompt to the largest whole conversations that fit (a single chunk).
+        """
         if not messages:
             return "No messages found in this channel during the specified time period."
         
-        # Prepare message content for summarization
-        message_text = ""
-        for msg in messages:
-            author = msg.get('author', {}).get('username', 'Unknown')
-            content = msg.get('content', '')
-            timestamp = msg.get('timestamp', '')
-            
-            if content.strip():  # Only include messages with content
-                message_text += f"[{timestamp}] {author}: {content}\n"
+        # Group replies into conversations so chunk boundaries never split a discussion
+        index = ConversationIndex(messages)
+        if char_budget:
+            index = index.sample(char_budget)
+        chunks = index.chunk(char_budget or self.max_prompt_chars)
         
-        if not message_text.strip():
+        if not chunks:
             return "No meaningful content found in this channel during the specified time period."
         
+        if len(chunks) == 1:
+            return await self._summarize_text(chunks[0], channel_name, model)
+        
+        # Each chunk holds whole conversations, so the chunks are summarized concurrently
+        partial_summaries = await asyncio.gather(*(
+            self._summarize_text(chunk_text, channel_name, model, source=f"#{channel_name} (part {i + 1})")
+            for i, chunk_text in enumerate(chunks)
+        ))
+        for partial in partial_summaries:
+            if partial.startswith(("Error", "Unexpected error")):
+                return partial
+        
+        return await self._merge_partial_summaries(partial_summaries, channel_name, model)
+    
+    async def _summarize_text(self, message_text, channel_name, model: Optional[str] = None,
+                              source: Optional[str] = None):
+        """Summarize one block of formatted conversations"""
         # Create focused prompt for business-oriented summarization
         prompt = f"""Analyze the Discord channel #{channel_name} messages below and provide a CONCISE business summary.
 
@@ -65,45 +857,147 @@ If the channel contains mostly casual/fun content with no business value, respon
 
 FORMAT: Provide 2-3 bullet points maximum, each focusing on key business outcomes.
 
-Messages:
+Messages (conversations are separated by blank lines, replies are indented):
 {message_text}
 
 Summary:"""
 
-        try:
-            response = requests.post(
+        return await self._generate(prompt, 'Unable to generate summary', model=model,
+                                    source=source or f"#{channel_name}")
+    
+    async def _merge_partial_summaries(self, partial_summaries, channel_name, model: Optional[str] = None):
+        """Fold the summaries of several conversation chunks into one channel summary"""
+        relevant = [s for s in partial_summaries if s.strip() != "No significant business activities detected."]
+        if not relevant:
+            return "No significant business activities detected."
+        if len(relevant) == 1:
+            return relevant[0]
+        
+        combined = "\n\n".join(f"Part {i + 1}:\n{summary}" for i, summary in enumerate(relevant))
+        prompt = f"""The Discord channel #{channel_name} was summarized in several parts, each covering separate conversations.
+Merge them into ONE concise business summary without repeating points.
+
+FORMAT: Provide 2-3 bullet points maximum, each focusing on key business outcomes.
+
+{combined}
+
+Summary:"""
+        
+        return await self._generate(prompt, 'Unable to generate summary', model=model,
+                                    source=f"#{channel_name} (merge)")
+    
+    async def _generate(self, prompt, fallback, label='summary', model: Optional[str] = None,
+                        source: Optional[str] = None):
+        """Send a prompt to Ollama and return the cleaned response text
+        
+        The timeout is sized from measured throughput. A request that exceeds it is treated
+        as hung and retried with a doubled timeout, so a slow but legitimate one can still finish.
+        """
+        stats = self.throughput(model)
+        timeout = stats.timeout_for(estimate_tokens(prompt))
+        
+        for attempt in range(self.timeout_retries + 1):
+            try:
+                result = await self._stream_generate(prompt, model, self._timeout(timeout), source or label)
+                if isinstance(result, str):
+                    return f"Error generating {label}: {result}"
+                
+                stats.record(result)
+                summary = result.get('response') or fallback
+                
+                # Clean up any <think>...</think> blocks by making them tiny
+                summary = re.sub(r'<think>.*?</think>', lambda m: f'<small><i>{m.group(0)}</i></small>', summary, flags=re.DOTALL | re.IGNORECASE)
+                
+                return summary
+            
+            except asyncio.TimeoutError:
+                if attempt < self.timeout_retries and self._timeout(timeout * 2) > timeout:
+                    print(f"   ⏳ No response from Ollama after {timeout:.0f}s, retrying with a longer timeout...")
+                    timeout *= 2
+                    continue
+                return f"Error connecting to Ollama: no response after {timeout:.0f}s"
+            except aiohttp.ClientError as e:
+                return f"Error connecting to Ollama: {str(e)}"
+            except Exception as e:
+                return f"Unexpected error: {str(e)}"
+    
+    def _emit(self, event: Dict):
+        if self.stream_callback:
+            try:
+                self.stream_callback(event)
+            except Exception:
+                pass
+    
+    async def iter_generate(self, prompt, model: Optional[str] = None, timeout: float = 300):
+        """Yield the decoded NDJSON status objects of one streaming /api/generate call
+        
+        An HTTP error is yielded as a single ``{'error': ...}`` object, like Ollama's own errors.
+        Raises asyncio.TimeoutError if the whole generation takes longer than ``timeout``.
+        """
+        session = await self._get_session()
+        async with self._connection['semaphore']:
+            async with session.post(
                 f"{self.url}/api/generate",
                 json={
-                    "model": self.model,
+                    "model": model or self.model,
                     "prompt": prompt,
-                    "stream": False,
+                    "stream": True,
                     "options": {
                         "temperature": 0.3,
                         "top_p": 0.9,
                         "max_tokens": 1000
                     }
                 },
-                timeout=120
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                summary = result.get('response', 'Unable to generate summary')
-                
-                # Clean up any <think>...</think> blocks by making them tiny
-                import re
-                summary = re.sub(r'<think>.*?</think>', lambda m: f'<small><i>{m.group(0)}</i></small>', summary, flags=re.DOTALL | re.IGNORECASE)
-                
-                return summary
-            else:
-                return f"Error generating summary: HTTP {response.status_code}"
-                
-        except requests.exceptions.RequestException as e:
-            return f"Error connecting to Ollama: {str(e)}"
-        except Exception as e:
-            return f"Unexpected error: {str(e)}"
+                timeout=aiohttp.ClientTimeout(total=timeout, sock_connect=5)
+            ) as response:
+                if response.status != 200:
+                    yield {'error': f"HTTP {response.status}"}
+                    return
+                async for line in response.content:
+                    if line.strip():
+                        yield json.loads(line)
+    
+    async def _stream_generate(self, prompt, model: Optional[str], timeout: float, source: str = "summary"):
+        """Run one streaming /api/generate call
+        
+        Returns the final status object with the full response text, or an error string.
+        Tokens are reported to ``stream_callback`` as ``start``/``token``/``end`` events tagged with ``source``.
+        """
+        limiter = self.limiter
+        if limiter:
+            await limiter.acquire()
+        started = time.time()
+        pieces = []
+        chunks = self.iter_generate(prompt, model, timeout)
+        try:
+            async for chunk in chunks:
+                if chunk.get('error'):
+                    return chunk['error']
+                if not pieces:
+                    self._emit({'type': 'start', 'source': source})
+                token = chunk.get('response', '')
+                pieces.append(token)
+                if token:
+                    self._emit({'type': 'token', 'source': source, 'text': token})
+                if chunk.get('done'):
+                    eval_count = chunk.get('eval_count') or len(pieces)
+                    eval_seconds = (chunk.get('eval_duration') or 0) / 1e9
+                    self._emit({
+                        'type': 'end',
+                        'source': source,
+                        'seconds': time.time() - started,
+                        'tokens': eval_count,
+                        'tokens_per_second': eval_count / eval_seconds if eval_seconds else 0.0,
+                    })
+                    return dict(chunk, response="".join(pieces))
+            return "response stream ended early"
+        finally:
+            await chunks.aclose()
+            if limiter:
+                limiter.release()
     
-    def generate_overall_summary(self, all_summaries, guild_name, start_date, end_date):
+    async def generate_overall_summary(self, all_summaries, guild_name, start_date, end_date,
+                                       model: Optional[str] = None):
         """Generate an overall scrum-style summary"""
         if not all_summaries:
             return "No activities detected across any channels."
@@ -133,75 +1027,92 @@ Channel Data:
 
 Overall Summary:"""
 
+        return await self._generate(prompt, 'Unable to generate overall summary', 'overall summary', model=model)
+    
+    async def generate_digest(self, guild_summaries: Dict[str, str], start_date, end_date,
+                              model: Optional[str] = None):
+        """Cross-server digest from each server's executive summary"""
+        combined_content = "".join(f"\n{guild_name}:\n{summary}\n" for guild_name, summary in guild_summaries.items())
+        prompt = f"""Below are the executive summaries of several Discord servers for {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}.
+Write ONE cross-server digest for a manager who follows all of them.
+
+Focus on:
+- The most important outcomes and decisions, naming the server for each
+- Topics, blockers or people that come up in more than one server
+- Anything that needs attention next
+
+Provide 3-5 bullet points maximum.
+
+Server Summaries:
+{combined_content}
+
+Digest:"""
+
+        return await self._generate(prompt, 'Unable to generate digest', 'digest', model=model)
+    
+    async def embed(self, texts: List[str], model: Optional[str] = None, batch_size: int = 32) -> List[List[float]]:
+        """Embed texts with /api/embed, ``batch_size`` inputs per request, batches sent concurrently"""
+        session = await self._get_session()
+        
+        async def embed_batch(batch):
+            async with self._connection['semaphore']:
+                async with session.post(
+                    f"{self.url}/api/embed",
+                    json={"model": model or self.model, "input": batch},
+                    timeout=aiohttp.ClientTimeout(total=120, sock_connect=5)
+                ) as response:
+                    data = await response.json(content_type=None)
+                    if response.status != 200:
+                        raise RuntimeError(f"Ollama embed failed: {data.get('error') or f'HTTP {response.status}'}")
+                    return data.get('embeddings', [])
+        
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        results = await asyncio.gather(*(embed_batch(batch) for batch in batches))
+        return [vector for batch in results for vector in batch]
+    
+    async def warm(self, model: Optional[str] = None, keep_alive: str = "10m") -> bool:
+        """Load the model into memory ahead of a run (a generate call without a prompt only loads it)"""
+        session = await self._get_session()
         try:
-            response = requests.post(
+            async with session.post(
                 f"{self.url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.3,
-                        "top_p": 0.9,
-                        "max_tokens": 1000
-                    }
-                },
-                timeout=120
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                summary = result.get('response', 'Unable to generate overall summary')
-                
-                # Clean up any <think>...</think> blocks
-                import re
-                summary = re.sub(r'<think>.*?</think>', lambda m: f'<small><i>{m.group(0)}</i></small>', summary, flags=re.DOTALL | re.IGNORECASE)
-                
-                return summary
-            else:
-                return "Error generating overall summary"
-                
-        except requests.exceptions.RequestException as e:
-            return f"Error connecting to Ollama: {str(e)}"
-        except Exception as e:
-            return f"Unexpected error: {str(e)}"
+                json={"model": model or self.model, "keep_alive": keep_alive, "stream": False},
+                timeout=aiohttp.ClientTimeout(total=600, sock_connect=5)
+            ) as response:
+                await response.read()
+                return response.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
     
-    def get_available_models(self):
+    async def _get_json(self, path: str) -> tuple:
+        session = await self._get_session()
+        async with session.get(f"{self.url}{path}", timeout=aiohttp.ClientTimeout(total=10)) as response:
+            if response.status != 200:
+                return response.status, None
+            return response.status, await response.json(content_type=None)
+    
+    async def get_available_models(self):
         """Get list of available Ollama models"""
         try:
-            response = requests.get(f"{self.url}/api/tags", timeout=10)
-            if response.status_code == 200:
-                models_data = response.json()
-                return [model['name'] for model in models_data.get('models', [])]
+            status, data = await self._get_json("/api/tags")
+            if status == 200:
+                return [model['name'] for model in data.get('models', [])]
             return []
-        except:
+        except Exception:
             return []
     
-    def download_model(self, model_name):
-        """Download a model if not available"""
-        try:
-            response = requests.post(
-                f"{self.url}/api/pull",
-                json={"name": model_name},
-                timeout=300  # 5 minutes timeout for download
-            )
-            return response.status_code == 200
-        except:
-            return False
-    
-    def test_connection(self) -> bool:
+    async def test_connection(self) -> bool:
         """Test if Ollama is accessible and the model is available"""
         try:
             # Check if Ollama is running
-            response = requests.get(f"{self.url}/api/version", timeout=10)
-            if response.status_code != 200:
+            status, _ = await self._get_json("/api/version")
+            if status != 200:
                 return False
             
             # Check if model is available
-            response = requests.get(f"{self.url}/api/tags", timeout=10)
-            if response.status_code == 200:
-                models = response.json().get('models', [])
-                model_names = [model['name'] for model in models]
+            status, data = await self._get_json("/api/tags")
+            if status == 200:
+                model_names = [model['name'] for model in data.get('models', [])]
                 if not any(self.model in name for name in model_names):
                     print(f"Warning: Model '{self.model}' not found. Available models: {model_names}")
                     print(f"You can pull the model with: ollama pull {self.model}")
@@ -211,183 +1122,1695 @@ Overall Summary:"""
         except Exception as e:
             print(f"Error testing Ollama connection: {e}")
             return False
+    
+    async def close(self):
+        session = self._connection.get('session')
+        if session is not None and not session.closed:
+            await session.close()
 
 
-class DiscordHTTPClient:
-    """Discord HTTP API client for user tokens"""
+class OllamaClient:
+    """Client for interacting with Ollama API
     
-    def __init__(self, token: str):
-        self.token = token.strip().strip('"\'')
-        self.base_url = "https://discord.com/api/v10"
-        self.headers = {
-            "Authorization": self.token,
-            "Content-Type": "application/json",
+    Blocking wrapper around AsyncOllamaClient: calls run as coroutines on the shared
+    background loop and are aborted when ``cancel_token`` fires. Model pulls stay on a
+    requests session, since they are long resumable downloads with their own stall handling.
+    """
+    
+    def __init__(self, url: str = "http://localhost:11434", model: str = "llama3.2", max_prompt_chars: int = 12000,
+                 session: Optional[requests.Session] = None, max_concurrency: int = 4):
+        self.async_client = AsyncOllamaClient(url, model, max_prompt_chars, max_concurrency)
+        self.url = self.async_client.url
+        self.session = session or requests.Session()  # Keep-alive connections for pulls, shareable between clients
+        self.cancel_token: Optional[CancellationToken] = None
+        # Bound to this client's own connection: one ClientPool swaps in stays open for the other jobs
+        weakref.finalize(self, close_session_soon, self.async_client._connection)
+    
+    @property
+    def model(self) -> str:
+        return self.async_client.model
+    
+    @model.setter
+    def model(self, value: str):
+        self.async_client.model = value
+    
+    @property
+    def deadline(self) -> Optional[float]:
+        return self.async_client.deadline
+    
+    @deadline.setter
+    def deadline(self, value: Optional[float]):
+        self.async_client.deadline = value
+    
+    @property
+    def stream_callback(self):
+        return self.async_client.stream_callback
+    
+    @stream_callback.setter
+    def stream_callback(self, value):
+        self.async_client.stream_callback = value
+    
+    def throughput(self, model: Optional[str] = None) -> ThroughputStats:
+        """Measured throughput for a model on this host"""
+        return self.async_client.throughput(model)
+    
+    def expected_seconds(self, chars: int, model: Optional[str] = None) -> float:
+        return self.async_client.expected_seconds(chars, model)
+    
+    def generate_summary(self, messages, channel_name, model: Optional[str] = None, char_budget: Optional[int] = None):
+        """Generate a focused business summary using Ollama"""
+        return run_coroutine_sync(
+            self.async_client.generate_summary(messages, channel_name, model, char_budget), self.cancel_token
+        )
+    
+    def generate_overall_summary(self, all_summaries, guild_name, start_date, end_date, model: Optional[str] = None):
+        """Generate an overall scrum-style summary"""
+        return run_coroutine_sync(
+            self.async_client.generate_overall_summary(all_summaries, guild_name, start_date, end_date, model),
+            self.cancel_token
+        )
+    
+    def generate_digest(self, guild_summaries: Dict[str, str], start_date, end_date, model: Optional[str] = None):
+        """Cross-server digest from each server's executive summary"""
+        return run_coroutine_sync(
+            self.async_client.generate_digest(guild_summaries, start_date, end_date, model),
+            self.cancel_token
+        )
+    
+    def embed(self, texts: List[str], model: Optional[str] = None, batch_size: int = 32) -> List[List[float]]:
+        """Embed texts in concurrent batches"""
+        return run_coroutine_sync(self.async_client.embed(texts, model, batch_size), self.cancel_token)
+    
+    def warm(self, model: Optional[str] = None, keep_alive: str = "10m") -> bool:
+        """Load the model into memory ahead of a run"""
+        return run_coroutine_sync(self.async_client.warm(model, keep_alive), self.cancel_token)
+    
+    def get_available_models(self):
+        """Get list of available Ollama models"""
+        return run_coroutine_sync(self.async_client.get_available_models())
+    
+    PULLS_CACHE = "pulls.json"
+    PULL_STALL_TIMEOUT = 120  # Seconds without a status line before the pull is reattached
+    PULL_REATTACH_ATTEMPTS = 5
+    
+    _pulls_lock = threading.Lock()  # Guards PULLS_CACHE across clients and threads
+    
+    def download_model(self, model_name, progress_callback=None, cancel_token: Optional[CancellationToken] = None) -> bool:
+        """Download a model with a streaming pull, reporting progress to ``progress_callback``
+        
+        There is no overall timeout: only a stream that stalls for PULL_STALL_TIMEOUT seconds
+        or drops is reattached, and Ollama resumes the layers it already has. The pull is
+        recorded in the cache until it finishes, so ``pending_pulls`` can resume it after a restart.
+        """
+        cancel_token = cancel_token or self.cancel_token
+        progress = PullProgress(model_name, progress_callback)
+        self._record_pull(model_name, pending=True)
+        
+        for attempt in range(self.PULL_REATTACH_ATTEMPTS + 1):
+            if attempt:
+                progress.note(f"reattaching (attempt {attempt}/{self.PULL_REATTACH_ATTEMPTS})")
+                if cancel_token:
+                    cancel_token.wait(min(2 ** attempt, 30))
+                    cancel_token.raise_if_cancelled()
+                else:
+                    time.sleep(min(2 ** attempt, 30))
+            try:
+                error = self._stream_pull(model_name, progress, cancel_token)
+            except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.Timeout) as e:
+                progress.note(f"connection lost: {e}")
+                continue
+            
+            if error is None:
+                self._record_pull(model_name, pending=False)
+                progress.finish(ok=True)
+                return True
+            # The server rejected the pull (unknown model, disk full, ...); retrying won't help
+            self._record_pull(model_name, pending=False)
+            progress.finish(ok=False, error=error)
+            return False
+        
+        progress.finish(ok=False, error="connection kept dropping; the download resumes on next start")
+        return False
+    
+    def _stream_pull(self, model_name, progress: 'PullProgress', cancel_token: Optional[CancellationToken]):
+        """Follow one streaming /api/pull; returns None on success or the server's error message"""
+        response = cancellable_request(
+            "POST",
+            f"{self.url}/api/pull",
+            cancel_token,
+            session=self.session,
+            json={"name": model_name, "stream": True},
+            stream=True,
+            timeout=(5, self.PULL_STALL_TIMEOUT)
+        )
+        
+        unregister = cancel_token.register(response.close) if cancel_token else (lambda: None)
+        try:
+            if response.status_code != 200:
+                return f"HTTP {response.status_code}"
+            for line in response.iter_lines():
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get('error'):
+                    return chunk['error']
+                progress.update(chunk)
+                if chunk.get('status') == 'success':
+                    return None
+            
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
+            raise requests.exceptions.ChunkedEncodingError("pull stream ended before success")
+        except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError, AttributeError):
+            # Closing the response from the cancelling thread surfaces here
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
+            raise
+        finally:
+            unregister()
+            response.close()
+    
+    def _record_pull(self, model_name, pending: bool):
+        with self._pulls_lock:
+            pulls = (load_cache(self.PULLS_CACHE) or {}).get('pulls', {})
+            key = f"{self.url}|{model_name}"
+            if pending:
+                pulls.setdefault(key, time.time())
+            else:
+                pulls.pop(key, None)
+            save_cache(self.PULLS_CACHE, {'pulls': pulls})
+    
+    def pending_pulls(self) -> List[str]:
+        """Models whose pull from this host was interrupted before it finished"""
+        pulls = (load_cache(self.PULLS_CACHE) or {}).get('pulls', {})
+        prefix = f"{self.url}|"
+        return [key[len(prefix):] for key in pulls if key.startswith(prefix)]
+    
+    def test_connection(self) -> bool:
+        """Test if Ollama is accessible and the model is available"""
+        return run_coroutine_sync(self.async_client.test_connection())
+    
+    def close(self):
+        run_coroutine_sync(self.async_client.close())
+
+
+class DiscordAPIError(Exception):
+    """A Discord REST call answered with an unexpected HTTP status (raised only where asked for)"""
+    
+    def __init__(self, status: int, path: str):
+        super().__init__(f"HTTP {status} for {path}")
+        self.status = status
+
+
+class AsyncDiscordHTTPClient:
+    """asyncio Discord HTTP API client for user tokens
+    
+    All requests share one pooled aiohttp session (created lazily on the loop that first
+    uses the client). Rate limits are handled in ``request``: a 429 waits ``retry_after``
+    (pausing every route for a global limit), and a route whose bucket is exhausted
+    (X-RateLimit-Remaining: 0) waits for its reset before the next call.
+    """
+    
+    MAX_RATE_LIMIT_RETRIES = 5
+    SHARD_MIN_MESSAGES = 300  # Below this many expected older messages, paging serially is fast enough
+    
+    def __init__(self, token: str, max_connections: int = 10):
+        self.token = token.strip().strip('"\'')
+        self.base_url = "https://discord.com/api/v10"
+        self.headers = {
+            "Authorization": self.token,
+            "Content-Type": "application/json",
             "User-Agent": "DiscordBot (DaySummarizer, 1.0)"
         }
+        self.max_connections = max_connections
+        self.max_shards = int(os.getenv('FETCH_SHARDS', 4))  # Time windows a busy channel is split into (1 = never)
+        self._connection: Dict = {}  # 'session', created on the loop that first uses the client
+        self._route_resets: Dict[str, float] = {}  # route -> loop time when its bucket refills
+        self._global_reset = 0.0
     
-    def test_connection(self) -> bool:
+    async def _get_session(self) -> aiohttp.ClientSession:
+        session = self._connection.get('session')
+        if session is None or session.closed:
+            session = self._connection['session'] = new_client_session(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return session
+    
+    async def _wait_for_rate_limit(self, route: str):
+        loop = asyncio.get_running_loop()
+        delay = max(self._global_reset, self._route_resets.get(route, 0.0)) - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
+    async def request(self, method: str, path: str, params: Optional[Dict] = None) -> tuple:
+        """Return (status, decoded JSON or None) for one API call, waiting out rate limits"""
+        session = await self._get_session()
+        loop = asyncio.get_running_loop()
+        status, data = 0, None
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            await self._wait_for_rate_limit(path)
+            async with session.request(method, f"{self.base_url}{path}", params=params) as response:
+                status = response.status
+                try:
+                    data = json.loads(await response.text() or 'null')
+                except ValueError:
+                    data = None
+                
+                if status == 429:
+                    body = data if isinstance(data, dict) else {}
+                    retry_after = float(body.get('retry_after') or response.headers.get('Retry-After') or 1)
+                    if body.get('global'):
+                        self._global_reset = loop.time() + retry_after
+                    else:
+                        self._route_resets[path] = loop.time() + retry_after
+                    print(f"   ⏳ Rate limited, waiting {retry_after} seconds...")
+                    continue
+                
+                if response.headers.get('X-RateLimit-Remaining') == '0':
+                    reset_after = float(response.headers.get('X-RateLimit-Reset-After') or 0)
+                    self._route_resets[path] = loop.time() + reset_after
+                return status, data
+        return status, data
+    
+    async def test_connection(self) -> bool:
         """Test if the token works"""
         try:
-            response = requests.get(f"{self.base_url}/users/@me", headers=self.headers, timeout=10)
-            if response.status_code == 200:
-                user_data = response.json()
+            status, user_data = await self.request("GET", "/users/@me")
+            if status == 200:
                 print(f"✅ Authenticated as: {user_data.get('username', 'Unknown')}#{user_data.get('discriminator', '0000')}")
                 return True
             else:
-                print(f"❌ Authentication failed: HTTP {response.status_code}")
-                if response.status_code == 401:
+                print(f"❌ Authentication failed: HTTP {status}")
+                if status == 401:
                     print("   Token is invalid or expired")
-                elif response.status_code == 403:
+                elif status == 403:
                     print("   Token lacks required permissions")
                 return False
         except Exception as e:
             print(f"❌ Connection error: {e}")
             return False
     
-    def get_guild_info(self, guild_id: int) -> Optional[Dict]:
+    async def get_guild_info(self, guild_id: int) -> Optional[Dict]:
         """Get guild information"""
         try:
-            response = requests.get(f"{self.base_url}/guilds/{guild_id}", headers=self.headers, timeout=10)
-            if response.status_code == 200:
-                return response.json()
+            status, data = await self.request("GET", f"/guilds/{guild_id}")
+            if status == 200:
+                return data
             else:
-                print(f"❌ Could not access guild {guild_id}: HTTP {response.status_code}")
+                print(f"❌ Could not access guild {guild_id}: HTTP {status}")
                 return None
         except Exception as e:
             print(f"❌ Error getting guild info: {e}")
             return None
     
-    def get_guild_channels(self, guild_id: int) -> List[Dict]:
+    async def get_guild_channels(self, guild_id: int, text_only: bool = True) -> List[Dict]:
         """Get channels in a guild"""
         try:
-            response = requests.get(f"{self.base_url}/guilds/{guild_id}/channels", headers=self.headers, timeout=10)
-            if response.status_code == 200:
-                channels = response.json()
+            status, channels = await self.request("GET", f"/guilds/{guild_id}/channels")
+            if status == 200:
+                if not text_only:
+                    return channels
                 # Filter to text channels only
                 return [ch for ch in channels if ch.get('type') == 0]  # Type 0 = text channel
             else:
-                print(f"❌ Could not get channels: HTTP {response.status_code}")
+                print(f"❌ Could not get channels: HTTP {status}")
                 return []
         except Exception as e:
             print(f"❌ Error getting channels: {e}")
             return []
     
-    def get_channel_messages(self, channel_id: int, after: datetime, before: datetime, limit: int = 100) -> List[Dict]:
-        """Get messages from a channel within a time range"""
-        try:
-            messages = []
-            last_message_id = None
-            total_fetched = 0
+    async def iter_message_pages(self, channel_id: int, after: datetime, before: datetime, limit: int = 100,
+                                 raise_errors: bool = False, before_id: Optional[str] = None):
+        """Yield pages (newest first) of the channel's messages within [after, before], up to ``limit`` in total
+        
+        An HTTP error ends the pages early, or raises DiscordAPIError with ``raise_errors`` (for callers
+        that must not mistake a partial history for a complete one). An unreadable channel is simply empty.
+        ``before_id`` starts paging strictly before that message, like continuing a serial walk.
+        """
+        # Convert datetime to Discord snowflake for API filtering
+        after_snowflake = str(datetime_to_snowflake(after))
+        last_message_id = str(before_id or datetime_to_snowflake(before))
+        yielded = 0
+        total_fetched = 0
+        
+        while yielded < limit and total_fetched < max(2000, 2 * limit):  # Prevent infinite loops
+            params = {
+                "limit": min(100, limit - yielded),
+                "after": after_snowflake,  # Use Discord's built-in filtering
+                "before": last_message_id
+            }
+            status, batch = await self.request("GET", f"/channels/{channel_id}/messages", params)
             
-            # Convert datetime to Discord snowflake for API filtering
-            # Discord snowflakes encode timestamp: ((timestamp_ms - 1420070400000) << 22)
-            after_snowflake = str(int((after.timestamp() - 1420070400) * 1000) << 22)
-            before_snowflake = str(int((before.timestamp() - 1420070400) * 1000) << 22)
+            if status == 403:
+                print(f"   ⚠️  No permission to read channel {channel_id}")
+                break
+            if status != 200:
+                print(f"   ❌ Error getting messages: HTTP {status}")
+                if raise_errors:
+                    raise DiscordAPIError(status, f"/channels/{channel_id}/messages")
+                break
+            if not batch:
+                break
+            total_fetched += len(batch)
             
-            while len(messages) < limit and total_fetched < 2000:  # Prevent infinite loops
-                url = f"{self.base_url}/channels/{channel_id}/messages"
-                params = {
-                    "limit": min(100, limit - len(messages)),
-                    "after": after_snowflake  # Use Discord's built-in filtering
-                }
-                
-                if last_message_id:
-                    params["before"] = last_message_id
-                else:
-                    params["before"] = before_snowflake
-                
-                response = requests.get(url, headers=self.headers, params=params, timeout=30)
-                
-                if response.status_code == 200:
-                    batch = response.json()
-                    if not batch:
-                        break
-                    
-                    total_fetched += len(batch)
-                    
-                    # Double-check with manual filtering for precision
-                    valid_messages = []
-                    found_older_than_range = False
-                    
-                    for msg in batch:
-                        try:
-                            msg_timestamp = datetime.fromisoformat(msg['timestamp'].replace('Z', '+00:00'))
-                            
-                            if after <= msg_timestamp <= before:
-                                valid_messages.append(msg)
-                            elif msg_timestamp < after:
-                                found_older_than_range = True
-                                break
-                        except (ValueError, KeyError) as e:
-                            # Skip messages with invalid timestamps
-                            continue
-                    
-                    messages.extend(valid_messages)
-                    
-                    if batch:
-                        last_message_id = batch[-1]['id']
-                    
-                    # If we found messages older than our range, we can stop
-                    if found_older_than_range:
-                        break
-                        
-                    # If we didn't get a full batch, we're done
-                    if len(batch) < 100:
-                        break
-                        
-                elif response.status_code == 403:
-                    print(f"   ⚠️  No permission to read channel {channel_id}")
-                    break
-                elif response.status_code == 429:
-                    # Rate limited
-                    retry_after = response.json().get('retry_after', 1)
-                    print(f"   ⏳ Rate limited, waiting {retry_after} seconds...")
-                    time.sleep(retry_after)
-                else:
-                    print(f"   ❌ Error getting messages: HTTP {response.status_code}")
+            # Double-check with manual filtering for precision
+            valid_messages = []
+            found_older_than_range = False
+            for msg in batch:
+                try:
+                    msg_timestamp = datetime.fromisoformat(msg['timestamp'].replace('Z', '+00:00'))
+                except (ValueError, KeyError):
+                    # Skip messages with invalid timestamps
+                    continue
+                if after <= msg_timestamp <= before:
+                    valid_messages.append(msg)
+                elif msg_timestamp < after:
+                    found_older_than_range = True
                     break
             
-            # Debug info for troubleshooting
-            if total_fetched > 0 and len(messages) == 0:
-                print(f"   🔍 Fetched {total_fetched} messages but none in date range")
-                print(f"   📅 Looking for: {after.strftime('%Y-%m-%d %H:%M')} to {before.strftime('%Y-%m-%d %H:%M')}")
-            elif len(messages) > 0:
-                # Show first and last message timestamps for verification
-                first_msg = datetime.fromisoformat(messages[0]['timestamp'].replace('Z', '+00:00'))
-                last_msg = datetime.fromisoformat(messages[-1]['timestamp'].replace('Z', '+00:00'))
-                print(f"   📅 Messages range: {last_msg.strftime('%Y-%m-%d %H:%M')} to {first_msg.strftime('%Y-%m-%d %H:%M')}")
-            
-            return messages
+            yielded += len(valid_messages)
+            yield valid_messages
+            last_message_id = batch[-1]['id']
             
+            # Stop once past the range or when the API has no more pages
+            if found_older_than_range or len(batch) < 100:
+                break
+        
+        # Debug info for troubleshooting
+        if total_fetched > 0 and yielded == 0:
+            print(f"   🔍 Fetched {total_fetched} messages but none in date range")
+            print(f"   📅 Looking for: {after.strftime('%Y-%m-%d %H:%M')} to {before.strftime('%Y-%m-%d %H:%M')}")
+    
+    async def get_channel_messages(self, channel_id: int, after: datetime, before: datetime, limit: int = 100,
+                                   on_page=None, raise_errors: bool = False) -> List[Dict]:
+        """Get messages from a channel within a time range
+        
+        ``on_page`` is called with each fetched page (a list of messages) for progress reporting.
+        Errors give an empty list, or are raised with ``raise_errors``.
+        """
+        messages = []
+        try:
+            pages = self.iter_message_pages(channel_id, after, before, limit, raise_errors)
+            async for page in pages:
+                messages.extend(page)
+                if on_page:
+                    on_page(page)
+                # A full first page spanning little time means a busy channel: fetch the rest in parallel windows
+                shards = self._plan_shards(page, after, limit) if len(messages) == len(page) else None
+                if shards:
+                    await pages.aclose()
+                    messages = await self._fetch_shards(channel_id, page, shards, after, before, limit, on_page,
+                                                        raise_errors)
+                    break
         except Exception as e:
             print(f"❌ Error getting messages from channel {channel_id}: {e}")
+            if raise_errors:
+                raise
+            return []
+        
+        if messages:
+            # Show first and last message timestamps for verification
+            first_msg = datetime.fromisoformat(messages[0]['timestamp'].replace('Z', '+00:00'))
+            last_msg = datetime.fromisoformat(messages[-1]['timestamp'].replace('Z', '+00:00'))
+            print(f"   📅 Messages range: {last_msg.strftime('%Y-%m-%d %H:%M')} to {first_msg.strftime('%Y-%m-%d %H:%M')}")
+        return messages[:limit]
+    
+    def _plan_shards(self, first_page: List[Dict], after: datetime, limit: int) -> Optional[List[tuple]]:
+        """Time windows to fetch the rest of a channel concurrently, or None if paging serially is fine
+        
+        Returns (start, end, window limit) oldest first. The first page's message density
+        estimates how many older messages there are: the windows only reach back as far as
+        ``limit`` is expected to need, and each is limited to about its expected share (with
+        some margin). Where the estimate falls short, ``_fetch_shards`` pages the rest serially.
+        """
+        if self.max_shards < 2 or len(first_page) < 100:
+            return None
+        newest = snowflake_to_datetime(first_page[0]['id'])
+        oldest = snowflake_to_datetime(first_page[-1]['id'])
+        remaining_span = (oldest - after).total_seconds()
+        density = len(first_page) / max((newest - oldest).total_seconds(), 1.0)  # Messages per second
+        needed = limit - len(first_page)
+        expected = min(density * remaining_span, needed)
+        if expected < self.SHARD_MIN_MESSAGES:
+            return None
+        
+        span = min(remaining_span, needed / density * 1.25)
+        count = min(self.max_shards, int(expected // 200) + 1)  # At least a couple of pages per window
+        window_limit = min(needed, int(density * span / count * 1.5) + 100)
+        start = oldest - timedelta(seconds=span)
+        step = timedelta(seconds=span / count)
+        # Snowflake bounds are exclusive at millisecond resolution, so neighbouring windows overlap by 1 ms
+        return [(start + step * i, oldest if i == count - 1 else start + step * (i + 1) + timedelta(milliseconds=1),
+                 window_limit) for i in range(count)]
+    
+    async def _fetch_shards(self, channel_id: int, first_page: List[Dict], shards: List[tuple], after: datetime,
+                            before: datetime, limit: int, on_page=None, raise_errors: bool = False) -> List[Dict]:
+        """Fetch the time windows concurrently and merge them, newest first, without boundary duplicates
+        
+        The result must be the same newest ``limit`` messages serial paging returns, so windows are
+        taken newest first, and a window that hit its limit is paged to its start before any older
+        window counts.
+        """
+        by_id = {msg['id']: msg for msg in first_page}
+        
+        async def fetch(window_start, window_end, window_limit, before_id=None):
+            collected = []
+            async for page in self.iter_message_pages(channel_id, window_start, window_end, window_limit,
+                                                      raise_errors, before_id):
+                collected.extend(page)
+                if on_page:
+                    on_page(page)
+            return collected
+        
+        # The newest window continues exactly where the first page stopped
+        last = len(shards) - 1
+        results = await asyncio.gather(*(
+            fetch(start, before, window_limit, first_page[-1]['id']) if i == last else fetch(start, end, window_limit)
+            for i, (start, end, window_limit) in enumerate(shards)
+        ))
+        
+        for (start, _, window_limit), messages in reversed(list(zip(shards, results))):
+            for msg in messages:
+                by_id.setdefault(msg['id'], msg)
+            if len(by_id) >= limit:
+                break
+            if len(messages) >= window_limit:
+                # Denser than estimated: the older part of this window comes before older windows
+                oldest = min(messages, key=lambda msg: int(msg['id']))
+                for msg in await fetch(start, before, limit - len(by_id), oldest['id']):
+                    by_id.setdefault(msg['id'], msg)
+                if len(by_id) >= limit:
+                    break
+        
+        # The busy stretch ended sooner than the first page suggested: page what is left serially
+        if len(by_id) < limit and shards[0][0] > after:
+            oldest = min(by_id, key=int)
+            for msg in await fetch(after, before, limit - len(by_id), oldest):
+                by_id.setdefault(msg['id'], msg)
+        
+        print(f"   ⚡ Busy channel {channel_id}: fetched {len(shards)} time windows in parallel")
+        return sorted(by_id.values(), key=lambda msg: int(msg['id']), reverse=True)[:limit]
+    
+    async def get_many_channel_messages(self, channel_ids: List[int], after: datetime, before: datetime,
+                                        limit: int = 100, concurrency: int = 8, on_page=None,
+                                        on_channel=None, raise_errors: bool = False) -> Dict[int, List[Dict]]:
+        """Fetch several channels concurrently (``concurrency`` coroutines at a time)
+        
+        ``on_channel(channel_id, messages)`` is called as each channel finishes. With ``raise_errors``
+        the first failed channel raises instead of coming back empty.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch(channel_id):
+            async with semaphore:
+                messages = await self.get_channel_messages(channel_id, after, before, limit, on_page, raise_errors)
+            if on_channel:
+                on_channel(channel_id, messages)
+            return channel_id, messages
+        
+        return dict(await asyncio.gather(*(fetch(channel_id) for channel_id in channel_ids)))
+    
+    async def close(self):
+        session = self._connection.get('session')
+        if session is not None and not session.closed:
+            await session.close()
+
+
+class DiscordHTTPClient:
+    """Discord HTTP API client for user tokens
+    
+    Blocking wrapper around AsyncDiscordHTTPClient: every call runs as a coroutine on the
+    shared background loop, so threads using the same client share its connection pool
+    and rate-limit state.
+    """
+    
+    def __init__(self, token: str):
+        self.async_client = AsyncDiscordHTTPClient(token)
+        self.token = self.async_client.token
+        self.headers = self.async_client.headers
+        weakref.finalize(self, close_session_soon, self.async_client._connection)
+    
+    @property
+    def base_url(self) -> str:
+        return self.async_client.base_url
+    
+    @base_url.setter
+    def base_url(self, value: str):
+        self.async_client.base_url = value
+    
+    def request(self, method: str, path: str, params: Optional[Dict] = None) -> tuple:
+        """Return (status, decoded JSON or None) for one API call, waiting out rate limits"""
+        return run_coroutine_sync(self.async_client.request(method, path, params))
+    
+    def test_connection(self) -> bool:
+        """Test if the token works"""
+        return run_coroutine_sync(self.async_client.test_connection())
+    
+    def get_guild_info(self, guild_id: int) -> Optional[Dict]:
+        """Get guild information"""
+        return run_coroutine_sync(self.async_client.get_guild_info(guild_id))
+    
+    def get_guild_channels(self, guild_id: int, text_only: bool = True) -> List[Dict]:
+        """Get channels in a guild"""
+        return run_coroutine_sync(self.async_client.get_guild_channels(guild_id, text_only))
+    
+    def get_channel_messages(self, channel_id: int, after: datetime, before: datetime, limit: int = 100,
+                             cancel_token: Optional[CancellationToken] = None, on_page=None) -> List[Dict]:
+        """Get messages from a channel within a time range
+        
+        ``on_page`` is called with each fetched page (a list of messages) for progress reporting.
+        """
+        return run_coroutine_sync(
+            self.async_client.get_channel_messages(channel_id, after, before, limit, on_page), cancel_token
+        )
+    
+    def get_many_channel_messages(self, channel_ids: List[int], after: datetime, before: datetime, limit: int = 100,
+                                  concurrency: int = 8, cancel_token: Optional[CancellationToken] = None,
+                                  on_page=None, on_channel=None) -> Dict[int, List[Dict]]:
+        """Fetch several channels concurrently on the background loop"""
+        return run_coroutine_sync(
+            self.async_client.get_many_channel_messages(
+                channel_ids, after, before, limit, concurrency, on_page, on_channel
+            ),
+            cancel_token
+        )
+    
+    def close(self):
+        run_coroutine_sync(self.async_client.close())
+
+
+class HealthChecker:
+    """Discord and Ollama connectivity probes, run in parallel and cached for a short TTL
+    
+    One shared instance (``health_checker``) backs validate_config, the GUI settings tab
+    and the dashboard status, so a run started right after a check reuses its results.
+    Concurrent callers asking for the same probe wait on a single request. Probes are
+    coroutines on the background loop: blocking callers use ``check_*``, code already on
+    the loop awaits ``check_*_async``.
+    """
+    
+    def __init__(self, ttl: float = 60):
+        self.ttl = ttl
+        self._results: Dict[tuple, Dict] = {}
+        self._inflight: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+        self._connection: Dict = {}  # aiohttp session for Ollama probes
+    
+    def _submit(self, key: tuple, probe, force: bool) -> Future:
+        with self._lock:
+            result = self._results.get(key)
+            if result and not force and time.time() - result['checked_at'] < self.ttl:
+                future = Future()
+                future.set_result(result)
+                return future
+            future = self._inflight.get(key)
+            if future is None:
+                future = asyncio.run_coroutine_threadsafe(self._run_probe(key, probe), background_loop())
+                self._inflight[key] = future
+            return future
+    
+    async def _run_probe(self, key: tuple, probe) -> Dict:
+        try:
+            result = await probe()
+        except Exception as e:
+            result = {'ok': False, 'error': str(e) or type(e).__name__}  # aiohttp timeouts have no message
+        result['checked_at'] = time.time()
+        with self._lock:
+            self._results[key] = result
+            self._inflight.pop(key, None)
+        return result
+    
+    def _discord_future(self, client: Optional['DiscordHTTPClient'], guild_id: Optional[int], force: bool) -> Future:
+        if client is None:
+            future = Future()
+            future.set_result({'ok': False, 'error': 'DISCORD_TOKEN not set', 'checked_at': time.time()})
+            return future
+        
+        async def probe():
+            # A successful guild lookup proves the token too, so one round trip covers both
+            status, data = await client.async_client.request("GET", f"/guilds/{guild_id}" if guild_id else "/users/@me")
+            if status == 200:
+                if guild_id:
+                    return {'ok': True, 'guild': data, 'detail': data.get('name', 'server')}
+                return {'ok': True, 'guild': None, 'detail': data.get('username', 'Unknown')}
+            errors = {401: "Token is invalid or expired", 403: "Token lacks access to this server",
+                      404: f"Server {guild_id} not found"}
+            return {'ok': False, 'error': errors.get(status, f"HTTP {status}")}
+        
+        return self._submit(('discord', client.base_url, client.token, guild_id), probe, force)
+    
+    def _ollama_future(self, url: str, force: bool) -> Future:
+        async def probe():
+            session = self._connection.get('session')
+            if session is None or session.closed:
+                session = self._connection['session'] = new_client_session()
+            async with session.get(f"{url}/api/tags", timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status != 200:
+                    return {'ok': False, 'error': f"HTTP {response.status}", 'models': []}
+                data = await response.json(content_type=None)
+            models = [model['name'] for model in data.get('models', [])]
+            return {'ok': True, 'models': models, 'detail': f"{len(models)} models"}
+        
+        return self._submit(('ollama', url), probe, force)
+    
+    def check_discord(self, client: Optional['DiscordHTTPClient'], guild_id: Optional[int] = None,
+                      force: bool = False) -> Dict:
+        return self._discord_future(client, guild_id, force).result()
+    
+    def check_ollama(self, url: str, force: bool = False) -> Dict:
+        return self._ollama_future(url, force).result()
+    
+    def check_all(self, client: Optional['DiscordHTTPClient'], guild_id: Optional[int], ollama_url: str,
+                  force: bool = False) -> Dict[str, Dict]:
+        """Probe Discord and Ollama concurrently"""
+        discord = self._discord_future(client, guild_id, force)
+        ollama = self._ollama_future(ollama_url, force)
+        return {'discord': discord.result(), 'ollama': ollama.result()}
+    
+    async def check_ollama_async(self, url: str, force: bool = False) -> Dict:
+        return await asyncio.wrap_future(self._ollama_future(url, force))
+    
+    async def check_all_async(self, client: Optional['DiscordHTTPClient'], guild_id: Optional[int], ollama_url: str,
+                              force: bool = False) -> Dict[str, Dict]:
+        """``check_all`` for callers on the background loop"""
+        discord = self._discord_future(client, guild_id, force)
+        ollama = self._ollama_future(ollama_url, force)
+        return {'discord': await asyncio.wrap_future(discord), 'ollama': await asyncio.wrap_future(ollama)}
+    
+    @staticmethod
+    def has_model(ollama_result: Dict, model: str) -> bool:
+        return any(model in name for name in ollama_result.get('models', []))
+    
+    def invalidate(self, kind: Optional[str] = None):
+        """Forget cached results (all of them, or only 'discord' / 'ollama')"""
+        with self._lock:
+            for key in list(self._results):
+                if kind is None or key[0] == kind:
+                    del self._results[key]
+
+
+health_checker = HealthChecker(float(os.getenv('HEALTH_CHECK_TTL', 60)))
+
+
+def format_eta(seconds: float) -> str:
+    """Format a duration as e.g. '45s', '3m 10s' or '1h 05m'"""
+    seconds = int(max(0, seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+
+
+class MessageRangeCache:
+    """Fetched messages per channel plus the time ranges they cover, shared by overlapping jobs
+    
+    A request only fetches the parts of its range that no earlier request covered, and a
+    per-channel lock makes a concurrent request wait for an in-progress fetch of the same
+    channel instead of downloading it twice. Coverage never extends past the time of the
+    fetch, so a later job for "today" still picks up newer messages. Beyond ``MAX_MESSAGES``
+    the least recently used channels are dropped whole, messages and coverage together.
+    """
+    
+    MAX_MESSAGES = 100000
+    
+    def __init__(self):
+        # channel_id -> {'messages': {id: msg}, 'ranges': [(start, end)]}, least recently used first
+        self._channels: 'OrderedDict[int, Dict]' = OrderedDict()
+        self._locks: Dict[int, threading.Lock] = defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+        self.fetched_ranges = 0
+        self.reused_ranges = 0
+    
+    def _channel_lock(self, channel_id: int) -> threading.Lock:
+        with self._lock:
+            return self._locks[channel_id]
+    
+    @staticmethod
+    def _gaps(ranges: List[tuple], start: datetime, end: datetime) -> List[tuple]:
+        gaps, cursor = [], start
+        for covered_start, covered_end in ranges:
+            if covered_end < cursor:
+                continue
+            if covered_start > end:
+                break
+            if covered_start > cursor:
+                gaps.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+    
+    @staticmethod
+    def _merge(ranges: List[tuple]) -> List[tuple]:
+        merged = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+    
+    def _entry(self, channel_id: int) -> Dict:
+        with self._lock:
+            entry = self._channels.setdefault(channel_id, {'messages': {}, 'ranges': []})
+            self._channels.move_to_end(channel_id)
+            return entry
+    
+    def _evict(self):
+        """Drop least recently used channels until the cache is back under MAX_MESSAGES"""
+        with self._lock:
+            total = sum(len(entry['messages']) for entry in self._channels.values())
+            for channel_id in list(self._channels):
+                if total <= self.MAX_MESSAGES:
+                    break
+                lock = self._locks[channel_id]
+                if not lock.acquire(blocking=False):
+                    continue  # Being fetched (or collected) right now
+                total -= len(self._channels.pop(channel_id)['messages'])
+                lock.release()
+    
+    def _record(self, entry: Dict, gap: tuple, batch: List[Dict], fetched_at: datetime, limit: int):
+        self.fetched_ranges += 1
+        for msg in batch:
+            entry['messages'][msg['id']] = msg
+        # An empty result may be a transient error, so it is not recorded as coverage
+        if not batch:
+            return
+        covered_start = gap[0]
+        if len(batch) >= limit:
+            # Truncated at the message limit: only the newest part of the gap is complete
+            covered_start = min(snowflake_to_datetime(msg['id']) for msg in batch)
+        entry['ranges'] = self._merge(entry['ranges'] + [(covered_start, min(gap[1], fetched_at))])
+    
+    @staticmethod
+    def _collect(entry: Dict, after: datetime, before: datetime, limit: int) -> List[Dict]:
+        in_range = [msg for msg in entry['messages'].values()
+                    if after <= snowflake_to_datetime(msg['id']) <= before]
+        in_range.sort(key=lambda msg: int(msg['id']), reverse=True)
+        return in_range[:limit]
+    
+    def fetch(self, client: 'DiscordHTTPClient', channel_id: int, after: datetime, before: datetime, limit: int,
+              cancel_token: Optional[CancellationToken] = None, on_page=None) -> List[Dict]:
+        """Messages in [after, before], newest first, fetching only what is not cached yet"""
+        return self.fetch_many(client, [channel_id], after, before, limit, concurrency=1,
+                               cancel_token=cancel_token, on_page=on_page)[channel_id]
+    
+    def fetch_many(self, client: 'DiscordHTTPClient', channel_ids: List[int], after: datetime, before: datetime,
+                   limit: int, concurrency: int = 8, cancel_token: Optional[CancellationToken] = None,
+                   on_page=None, on_channel=None) -> Dict[int, List[Dict]]:
+        """Like ``fetch`` for several channels, downloading their missing ranges concurrently
+        
+        ``on_channel(channel_id, messages)`` is called as each channel's download completes.
+        """
+        locks = [self._channel_lock(channel_id) for channel_id in sorted(set(channel_ids))]
+        for lock in locks:  # Always in id order, so two batches can't deadlock
+            lock.acquire()
+        try:
+            entries = {channel_id: self._entry(channel_id) for channel_id in channel_ids}
+            gaps = {channel_id: self._gaps(entry['ranges'], after, before) for channel_id, entry in entries.items()}
+            self.reused_ranges += sum(1 for channel_gaps in gaps.values() if not channel_gaps)
+            
+            async_client = client.async_client
+            
+            async def fetch_channel(channel_id, semaphore):
+                async with semaphore:
+                    for gap in gaps[channel_id]:
+                        fetched_at = datetime.now(timezone.utc)
+                        try:
+                            batch = await async_client.get_channel_messages(channel_id, gap[0], gap[1], limit, on_page,
+                                                                            raise_errors=True)
+                        except Exception:
+                            continue  # Already logged; a partial history must not be recorded as coverage
+                        self._record(entries[channel_id], gap, batch, fetched_at, limit)
+                if on_channel:
+                    on_channel(channel_id, self._collect(entries[channel_id], after, before, limit))
+            
+            async def fetch_all():
+                semaphore = asyncio.Semaphore(concurrency)
+                await asyncio.gather(*(fetch_channel(channel_id, semaphore) for channel_id in entries))
+            
+            run_coroutine_sync(fetch_all(), cancel_token)
+            results = {channel_id: self._collect(entry, after, before, limit) for channel_id, entry in entries.items()}
+        finally:
+            for lock in locks:
+                lock.release()
+        self._evict()
+        return results
+    
+    def clear(self):
+        with self._lock:
+            self._channels.clear()
+
+
+class ClientPool:
+    """Discord and Ollama connections, channel lists, fetched messages and channel summaries
+    shared by queued jobs (and by the runs of a daemon)
+    
+    Discord clients are shared outright (they hold no per-run state). Ollama clients carry a
+    run's cancel token and callbacks, so each job gets its own instance on top of a shared
+    HTTP session and shared throughput measurements.
+    """
+    
+    MAX_SUMMARIES = 500
+    
+    def __init__(self, channel_ttl: float = 300):
+        self.channel_ttl = channel_ttl
+        self.messages = MessageRangeCache()
+        self._summaries: 'OrderedDict[str, str]' = OrderedDict()  # summary_key -> summary, least recent first
+        self._discord: Dict[str, 'DiscordHTTPClient'] = {}
+        self._ollama_sessions: Dict[str, requests.Session] = {}
+        self._ollama_connections: Dict[str, Dict] = {}
+        self._throughput: Dict[str, Dict[str, ThroughputStats]] = {}
+        self._channels: Dict[int, tuple] = {}  # guild_id -> (fetched_at, channels)
+        self._lock = threading.Lock()
+    
+    def discord(self, token: str) -> 'DiscordHTTPClient':
+        with self._lock:
+            if token not in self._discord:
+                self._discord[token] = DiscordHTTPClient(token)
+            return self._discord[token]
+    
+    def ollama(self, url: str, model: str, max_prompt_chars: int = 12000, max_concurrency: int = 4) -> OllamaClient:
+        url = url.rstrip('/')
+        with self._lock:
+            session = self._ollama_sessions.setdefault(url, requests.Session())
+            connection = self._ollama_connections.setdefault(url, {})
+            throughput = self._throughput.setdefault(url, {})
+        client = OllamaClient(url, model, max_prompt_chars, session=session, max_concurrency=max_concurrency)
+        # One aiohttp session and generate semaphore per host, so concurrent jobs share the concurrency bound
+        client.async_client._connection = connection
+        client.async_client._throughput = throughput
+        return client
+    
+    def guild_channels(self, client: 'DiscordHTTPClient', guild_id: int) -> List[Dict]:
+        with self._lock:
+            cached = self._channels.get(guild_id)
+        if cached and time.time() - cached[0] < self.channel_ttl:
+            return cached[1]
+        channels = client.get_guild_channels(guild_id)
+        if channels:
+            with self._lock:
+                self._channels[guild_id] = (time.time(), channels)
+        return channels
+    
+    @staticmethod
+    def summary_key(settings: str, channel_name: str, messages: List[Dict]) -> str:
+        """Identity of a channel summary: the model settings plus the exact (normalized) messages"""
+        digest = hashlib.sha1(f"{settings}|{channel_name}".encode('utf-8'))
+        for msg in messages:
+            digest.update(f"\0{msg.get('id')}\0{msg.get('content', '')}".encode('utf-8'))
+        return digest.hexdigest()
+    
+    def cached_summary(self, key: str) -> Optional[str]:
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is not None:
+                self._summaries.move_to_end(key)
+            return summary
+    
+    def store_summary(self, key: str, summary: str):
+        with self._lock:
+            self._summaries[key] = summary
+            self._summaries.move_to_end(key)
+            while len(self._summaries) > self.MAX_SUMMARIES:
+                self._summaries.popitem(last=False)
+
+
+class MessageStore:
+    """Local SQLite store of guild messages written by the gateway listener (gateway.py)
+    
+    Next to the messages it records the time ranges during which the listener was connected.
+    Inside those ranges the store is complete, so reports read them locally and page REST
+    history only for what lies outside (before the listener started, or an unfilled gap).
+    """
+    
+    FILENAME = "messages.db"
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or cache_path(self.FILENAME)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")  # Reports can read while the listener writes
+            self._db.execute("CREATE TABLE IF NOT EXISTS messages "
+                             "(id INTEGER PRIMARY KEY, channel_id INTEGER NOT NULL, guild_id INTEGER, data TEXT NOT NULL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS messages_by_channel ON messages (channel_id, id)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS coverage (guild_id INTEGER NOT NULL, start REAL NOT NULL, end REAL NOT NULL)")
+    
+    @classmethod
+    def open_existing(cls) -> Optional['MessageStore']:
+        """The store in the cache directory, or None if the gateway listener never ran"""
+        path = cache_path(cls.FILENAME)
+        return cls(path) if os.path.exists(path) else None
+    
+    def save_message(self, message: Dict, guild_id: Optional[int] = None):
+        """Insert a message, or merge a (possibly partial) MESSAGE_UPDATE into the stored one"""
+        with self._lock, self._db:
+            row = self._db.execute("SELECT data FROM messages WHERE id = ?", (int(message['id']),)).fetchone()
+            data = dict(json.loads(row[0]), **message) if row else message
+            if 'timestamp' not in data or 'author' not in data:
+                return  # An edit of a message from before the listener started; REST has the full one
+            self._db.execute(
+                "INSERT OR REPLACE INTO messages (id, channel_id, guild_id, data) VALUES (?, ?, ?, ?)",
+                (int(data['id']), int(data['channel_id']), guild_id, json.dumps(data))
+            )
+    
+    def save_messages(self, messages: List[Dict], guild_id: Optional[int] = None):
+        """Store complete messages (e.g. a REST backfill) in one transaction"""
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO messages (id, channel_id, guild_id, data) VALUES (?, ?, ?, ?)",
+                [(int(msg['id']), int(msg['channel_id']), guild_id, json.dumps(msg)) for msg in messages]
+            )
+    
+    def delete_messages(self, message_ids: List):
+        with self._lock, self._db:
+            self._db.executemany("DELETE FROM messages WHERE id = ?", [(int(message_id),) for message_id in message_ids])
+    
+    def messages(self, channel_id: int, after: datetime, before: datetime, limit: int = 1000) -> List[Dict]:
+        """Stored messages of a channel within [after, before], newest first (like the REST pages)"""
+        upper = datetime_to_snowflake(before) + (1 << 22) - 1  # Every snowflake up to the end of that millisecond
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT data FROM messages WHERE channel_id = ? AND id BETWEEN ? AND ? ORDER BY id DESC LIMIT ?",
+                (channel_id, datetime_to_snowflake(after), upper, limit)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+    
+    def coverage(self, guild_id: int) -> List[tuple]:
+        with self._lock:
+            rows = self._db.execute("SELECT start, end FROM coverage WHERE guild_id = ? ORDER BY start", (guild_id,)).fetchall()
+        return [(datetime.fromtimestamp(start, timezone.utc), datetime.fromtimestamp(end, timezone.utc))
+                for start, end in rows]
+    
+    def add_coverage(self, guild_id: int, start: datetime, end: datetime):
+        """Mark [start, end] as completely captured for the guild"""
+        ranges = MessageRangeCache._merge(self.coverage(guild_id) + [(start, end)])
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM coverage WHERE guild_id = ?", (guild_id,))
+            self._db.executemany(
+                "INSERT INTO coverage (guild_id, start, end) VALUES (?, ?, ?)",
+                [(guild_id, range_start.timestamp(), range_end.timestamp()) for range_start, range_end in ranges]
+            )
+    
+    def gaps(self, guild_id: int, after: datetime, before: datetime) -> List[tuple]:
+        """Parts of [after, before] the store does not cover"""
+        return MessageRangeCache._gaps(self.coverage(guild_id), after, before)
+    
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def format_bytes(size: float) -> str:
+    """Format a byte count as e.g. '512 B', '3.4 MB' or '4.7 GB'"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class PullProgress:
+    """Aggregates the per-layer status lines of a streaming model pull into progress events
+    
+    Events are dicts with the model, status text, completed/total bytes across all layers,
+    percent, transfer rate and ETA, passed to ``callback`` at most every ``min_interval``
+    seconds, plus once on every status change and once when the pull finishes (``done``).
+    """
+    
+    def __init__(self, model: str, callback=None, min_interval: float = 0.25):
+        self.model = model
+        self.callback = callback
+        self.min_interval = min_interval
+        self.status = "starting"
+        self.layers: Dict[str, tuple] = {}  # digest -> (completed, total)
+        self.rate = 0.0
+        self._last_sample: Optional[tuple] = None  # (time, completed bytes)
+        self._last_publish = 0.0
+    
+    @property
+    def completed(self) -> int:
+        return sum(done for done, _ in self.layers.values())
+    
+    @property
+    def total(self) -> int:
+        return sum(total for _, total in self.layers.values())
+    
+    def update(self, chunk: Dict):
+        status = chunk.get('status', self.status)
+        status_changed = status != self.status
+        self.status = status
+        if chunk.get('digest') and chunk.get('total'):
+            self.layers[chunk['digest']] = (chunk.get('completed', 0), chunk['total'])
+        
+        now, completed = time.time(), self.completed
+        if self._last_sample and now - self._last_sample[0] >= 1.0:
+            measured = max(0, completed - self._last_sample[1]) / (now - self._last_sample[0])
+            self.rate = measured if not self.rate else 0.7 * self.rate + 0.3 * measured
+            self._last_sample = (now, completed)
+        elif not self._last_sample:
+            self._last_sample = (now, completed)
+        self._publish(force=status_changed)
+    
+    def note(self, status: str):
+        self.status = status
+        self._last_sample = None  # Don't count reconnect pauses against the transfer rate
+        self._publish(force=True)
+    
+    def finish(self, ok: bool, error: Optional[str] = None):
+        self.status = "success" if ok else f"failed: {error}"
+        self._publish(force=True, done=True, ok=ok)
+    
+    def snapshot(self) -> Dict:
+        completed, total = self.completed, self.total
+        remaining = max(0, total - completed)
+        return {
+            'model': self.model,
+            'status': self.status,
+            'completed': completed,
+            'total': total,
+            'percent': 100.0 * completed / total if total else 0.0,
+            'rate': self.rate,
+            'eta_seconds': remaining / self.rate if self.rate else None,
+        }
+    
+    def _publish(self, force: bool = False, **extra):
+        if not self.callback:
+            return
+        now = time.time()
+        if not force and now - self._last_publish < self.min_interval:
+            return
+        self._last_publish = now
+        event = dict(self.snapshot(), done=False, ok=None)
+        event.update(extra)
+        self.callback(event)
+    
+    @staticmethod
+    def describe(event: Dict) -> str:
+        """Human-readable one-liner for a pull progress event"""
+        if not event['total']:
+            return f"{event['model']}: {event['status']}"
+        text = (f"{event['model']}: {event['status']} - {event['percent']:.1f}% "
+                f"({format_bytes(event['completed'])} / {format_bytes(event['total'])})")
+        if event['rate'] and not event.get('done'):
+            text += f" at {format_bytes(event['rate'])}/s"
+            if event['eta_seconds'] is not None:
+                text += f", ETA {format_eta(event['eta_seconds'])}"
+        return text
+
+
+class ProgressTracker:
+    """Work-unit counters for a run, published as rate-limited progress events with an ETA
+    
+    The ETA combines the channels still to fetch (at the per-channel fetch time measured in
+    earlier runs) with the prompt tokens and model calls still to summarize (at this host's
+    measured ``ThroughputStats``). Events are dicts passed to ``callback`` at most every
+    ``min_interval`` seconds, plus once on every stage change.
+    """
+    
+    CACHE_NAME = "fetch_throughput.json"
+    STAGES = ("starting", "fetching", "summarizing", "overall", "done")
+    
+    def __init__(self, callback=None, throughput: Optional[ThroughputStats] = None, min_interval: float = 0.25):
+        self.callback = callback
+        self.throughput = throughput
+        self.min_interval = min_interval
+        self.started = time.time()
+        self.stage = "starting"
+        self.channels_total = 0
+        self.channels_fetched = 0
+        self.pages_fetched = 0
+        self.tokens_fetched = 0
+        self.channels_to_summarize = 0
+        self.channels_summarized = 0
+        self.prompt_tokens_total = 0
+        self.prompt_tokens_done = 0
+        self.concurrency = 1
+        self._fetch_started: Optional[float] = None
+        self._last_publish = 0.0
+        self._lock = threading.Lock()
+        self.seconds_per_channel = (load_cache(self.CACHE_NAME) or {}).get('seconds_per_channel', 1.0)
+    
+    def update(self, stage: Optional[str] = None, **counters):
+        """Set counters (and optionally move to a new stage)"""
+        with self._lock:
+            if stage and stage != self.stage:
+                self._enter_stage(stage)
+            else:
+                stage = None
+            for name, value in counters.items():
+                setattr(self, name, value)
+        self._publish(force=stage is not None)
+    
+    def advance(self, **increments):
+        """Increment counters"""
+        with self._lock:
+            for name, amount in increments.items():
+                setattr(self, name, getattr(self, name) + amount)
+        self._publish()
+    
+    def _enter_stage(self, stage: str):
+        if stage == "fetching":
+            self._fetch_started = time.time()
+        elif self.stage == "fetching" and self.channels_fetched:
+            # Remember this host's fetch speed for the next run's ETA
+            measured = (time.time() - self._fetch_started) / self.channels_fetched
+            self.seconds_per_channel = 0.7 * self.seconds_per_channel + 0.3 * measured
+            data = {'seconds_per_channel': self.seconds_per_channel}
+            cache_writer.submit(self.CACHE_NAME, lambda: save_cache(self.CACHE_NAME, data))
+        self.stage = stage
+    
+    def _summarize_seconds(self, tokens: float, calls: float) -> float:
+        stats = self.throughput
+        if stats is None or calls <= 0:
+            return 0.0
+        per_call = stats.load_seconds + stats.output_tokens / stats.generation_tps
+        return (tokens / stats.prompt_tps + calls * per_call) / max(self.concurrency, 1)
+    
+    def eta_seconds(self) -> float:
+        overall = self._summarize_seconds(500, 1)
+        if self.stage in ("starting", "fetching"):
+            channels_left = max(0, self.channels_total - self.channels_fetched)
+            # Extrapolate the summarize work from the channels fetched so far
+            scale = self.channels_total / self.channels_fetched if self.channels_fetched else 1
+            tokens = self.tokens_fetched * scale
+            calls = self.channels_total if not self.channels_fetched else self.channels_to_summarize * scale
+            return channels_left * self.seconds_per_channel + self._summarize_seconds(tokens, calls) + overall
+        if self.stage == "summarizing":
+            tokens_left = max(0, self.prompt_tokens_total - self.prompt_tokens_done)
+            calls_left = max(0, self.channels_to_summarize - self.channels_summarized)
+            return self._summarize_seconds(tokens_left, calls_left) + overall
+        if self.stage == "overall":
+            return overall
+        return 0.0
+    
+    def snapshot(self) -> Dict:
+        with self._lock:
+            elapsed = time.time() - self.started
+            eta = self.eta_seconds()
+            fraction = 1.0 if self.stage == "done" else elapsed / max(elapsed + eta, 1e-6)
+            return {
+                'stage': self.stage,
+                'channels_total': self.channels_total,
+                'channels_fetched': self.channels_fetched,
+                'pages_fetched': self.pages_fetched,
+                'channels_to_summarize': self.channels_to_summarize,
+                'channels_summarized': self.channels_summarized,
+                'prompt_tokens_total': self.prompt_tokens_total,
+                'prompt_tokens_done': self.prompt_tokens_done,
+                'elapsed': elapsed,
+                'eta': eta,
+                'fraction': min(fraction, 0.99 if self.stage != "done" else 1.0),
+            }
+    
+    def _publish(self, force: bool = False):
+        if not self.callback:
+            return
+        now = time.time()
+        if not force and now - self._last_publish < self.min_interval:
+            return
+        self._last_publish = now
+        self.callback(self.snapshot())
+    
+    @staticmethod
+    def describe(event: Dict) -> str:
+        """One-line human readable progress for an event"""
+        stage = event['stage']
+        if stage == "fetching":
+            text = (f"Fetching {event['channels_fetched']}/{event['channels_total']} channels "
+                    f"({event['pages_fetched']} pages)")
+        elif stage == "summarizing":
+            text = (f"Summarizing {event['channels_summarized']}/{event['channels_to_summarize']} channels "
+                    f"({event['prompt_tokens_done'] / 1000:.1f}k/{event['prompt_tokens_total'] / 1000:.1f}k tokens)")
+        elif stage == "overall":
+            text = "Writing overall summary"
+        elif stage == "done":
+            return f"Done in {format_eta(event['elapsed'])}"
+        else:
+            text = "Starting"
+        return f"{text} • ETA {format_eta(event['eta'])}"
+
+
+class AIMDController:
+    """Adaptive limit on in-flight Ollama requests (additive increase, multiplicative decrease)
+    
+    The limit grows by about one per window of completions while latency stays near the
+    best seen, and halves when latency spikes or a request fails. Latency is measured
+    relative to the time expected for the request size (from ``ThroughputStats``), so
+    large and small channels compare fairly. The baseline drifts slowly upwards so a host
+    that is permanently busier is not penalized forever. Each generate request (a chunk of
+    a large channel included) holds one slot via ``acquire``/``release`` on the loop.
+    """
+    
+    def __init__(self, max_limit: int = 4, min_limit: int = 1, initial: int = 1,
+                 tolerance: float = 1.3, spike: float = 2.0, decrease: float = 0.5):
+        self.max_limit = max(max_limit, min_limit)
+        self.min_limit = min_limit
+        self.limit = float(min(max(initial, min_limit), self.max_limit))
+        self.tolerance = tolerance
+        self.spike = spike
+        self.decrease = decrease
+        self.baseline: Optional[float] = None  # Observed / expected duration
+        self.started = time.time()
+        self.history = [(0.0, int(self.limit))]  # (seconds since start, in-flight limit)
+        self.in_flight = 0
+        self._waiters: List[asyncio.Future] = []
+    
+    @property
+    def in_flight_limit(self) -> int:
+        return max(self.min_limit, int(self.limit))
+    
+    async def acquire(self):
+        """Wait for a free request slot under the current limit"""
+        while self.in_flight >= self.in_flight_limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+        self.in_flight += 1
+    
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+    
+    def _wake(self):
+        # Waiters re-check the limit themselves, so waking all of them is safe
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+    
+    def record(self, elapsed: float, expected: float, error: bool = False):
+        before = self.in_flight_limit
+        
+        if error:
+            self.limit = max(self.min_limit, self.limit * self.decrease)
+        else:
+            latency = elapsed / max(expected, 1e-3)
+            if self.baseline is None or latency < self.baseline:
+                self.baseline = latency
+            
+            if latency > self.baseline * self.spike:
+                self.limit = max(self.min_limit, self.limit * self.decrease)
+            elif latency <= self.baseline * self.tolerance:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            
+            self.baseline += 0.05 * (latency - self.baseline)
+        
+        if self.in_flight_limit != before:
+            self.history.append((round(time.time() - self.started, 1), self.in_flight_limit))
+            self._wake()
+    
+    def describe(self) -> str:
+        return " → ".join(f"{limit}@{seconds:.0f}s" for seconds, limit in self.history)
+
+
+def parse_deadline(value: Optional[str], now: Optional[datetime] = None) -> Optional[datetime]:
+    """Parse a run deadline given as local "HH:MM" (next occurrence) or an ISO datetime"""
+    if not value:
+        return None
+    now = now or datetime.now().astimezone()
+    
+    try:
+        clock = datetime.strptime(value, '%H:%M')
+        deadline = now.replace(hour=clock.hour, minute=clock.minute, second=0, microsecond=0)
+        if deadline <= now:
+            deadline += timedelta(days=1)
+        return deadline
+    except ValueError:
+        pass
+    
+    try:
+        deadline = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid deadline: {value} (use HH:MM or YYYY-MM-DDTHH:MM)")
+    if deadline.tzinfo is None:
+        deadline = deadline.astimezone()  # Interpret naive datetimes as local time
+    return deadline
+
+
+class DeadlineScheduler:
+    """Orders channel work and degrades it step by step so a run finishes before its deadline
+    
+    Degradation levels, applied only when the estimated remaining work no longer fits:
+    0. full summaries with the configured model
+    1. the smaller ``fallback_model``
+    2. prompts capped at ``degraded_prompt_chars`` (largest whole conversations only)
+    3. extractive highlights, no model calls
+    Levels only ever increase during a run.
+    """
+    
+    FULL, FALLBACK_MODEL, TIGHT_BUDGET, EXTRACTIVE = range(4)
+    LEVEL_NAMES = ["full", "fallback model", "tight token budget", "extractive highlights"]
+    FALLBACK_SPEEDUP = 0.5  # Assumed cost of the fallback model relative to the main one
+    
+    def __init__(self, deadline: Optional[datetime] = None, fallback_model: Optional[str] = None,
+                 degraded_prompt_chars: int = 4000, reserve_seconds: float = 60,
+                 log_callback=None):
+        self.deadline = deadline
+        self.fallback_model = fallback_model
+        self.degraded_prompt_chars = degraded_prompt_chars
+        self.reserve_seconds = reserve_seconds  # Kept back for the overall summary and saving
+        self.log_callback = log_callback or print
+        self.level = self.FULL
+        self.call_overhead = 15.0  # Seconds per model call regardless of prompt size
+        self.seconds_per_char = 1 / 400  # Refined from measured calls
+        self.degraded_channels: Dict[int, List[str]] = defaultdict(list)
+    
+    def remaining(self) -> float:
+        if self.deadline is None:
+            return float('inf')
+        return self.deadline.timestamp() - time.time()
+    
+    @staticmethod
+    def order(channel_messages: Dict[str, List[Dict]]) -> List[tuple]:
+        """Largest channels first, so the longest job never starts last"""
+        return sorted(channel_messages.items(), key=lambda item: _messages_chars(item[1]), reverse=True)
+    
+    def _estimate(self, channel_chars: List[int], level: int) -> float:
+        if level >= self.EXTRACTIVE:
+            return 0.0
+        total = 0.0
+        for chars in channel_chars:
+            if level >= self.TIGHT_BUDGET:
+                chars = min(chars, self.degraded_prompt_chars)
+            total += self.call_overhead + chars * self.seconds_per_char
+        if level >= self.FALLBACK_MODEL and self.fallback_model:
+            total *= self.FALLBACK_SPEEDUP
+        return total
+    
+    def choose_level(self, channel_chars: List[int]) -> int:
+        """Pick the least degraded level whose estimate for the remaining channels fits"""
+        available = self.remaining() - self.reserve_seconds
+        level = self.level
+        while level < self.EXTRACTIVE:
+            if level == self.FALLBACK_MODEL and not self.fallback_model:
+                level += 1
+                continue
+            if self._estimate(channel_chars, level) <= available:
+                break
+            level += 1
+        
+        if level > self.level:
+            self.log_callback(f"⏱️ {available:.0f}s left before deadline - degrading to {self.LEVEL_NAMES[level]}")
+            self.level = level
+        return self.level
+    
+    def calibrate(self, stats: ThroughputStats):
+        """Seed the cost model from throughput measured in earlier runs"""
+        if stats.samples:
+            self.call_overhead = stats.expected_seconds(0)
+            self.seconds_per_char = 1 / (stats.prompt_tps * 4)
+    
+    def record(self, chars: int, elapsed: float, level: int):
+        """Refine the cost model from a completed model call"""
+        if level >= self.EXTRACTIVE or chars <= 0:
+            return
+        if level >= self.FALLBACK_MODEL and self.fallback_model:
+            elapsed /= self.FALLBACK_SPEEDUP
+        measured = max(elapsed - self.call_overhead, 0.0) / chars
+        self.seconds_per_char = 0.7 * self.seconds_per_char + 0.3 * measured
+    
+    def note(self, channel_name: str, level: int):
+        if level > self.FULL:
+            self.degraded_channels[level].append(channel_name)
+    
+    def report_notes(self) -> List[str]:
+        """Describe what was degraded, for the report"""
+        notes = []
+        for level in sorted(self.degraded_channels):
+            channels = ", ".join(f"#{name}" for name in self.degraded_channels[level])
+            detail = self.LEVEL_NAMES[level]
+            if level == self.FALLBACK_MODEL:
+                detail += f" ({self.fallback_model})"
+            elif level == self.TIGHT_BUDGET:
+                detail += f" ({self.degraded_prompt_chars} characters per channel)"
+            notes.append(f"Deadline degradation - {detail}: {channels}")
+        return notes
+
+
+def _messages_chars(messages: List[Dict]) -> int:
+    return sum(len(msg.get('content', '')) for msg in messages)
+
+
+def write_report_files(markdown_content: str, html_content: str, filename_base: str) -> tuple:
+    """Write a markdown/HTML report pair, never overwriting an earlier one; returns both filenames"""
+    base, suffix = filename_base, 2
+    while os.path.exists(f"{base}.md") or os.path.exists(f"{base}.html"):
+        base = f"{filename_base}_{suffix}"
+        suffix += 1
+    
+    md_filename = f"{base}.md"
+    with open(md_filename, 'w', encoding='utf-8') as f:
+        f.write(markdown_content)
+    
+    html_filename = f"{base}.html"
+    with open(html_filename, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+    return md_filename, html_filename
+
+
+class RunCheckpoint:
+    """Fetched messages and finished channel summaries of one run, saved as each completes
+    
+    Stored under ``checkpoints/<key>/`` in the cache directory. The key hashes the guild,
+    date range, model and summarization settings, so a resumed run only reuses work that
+    would have come out the same. Each fetched channel is its own file, so saving after
+    every channel stays cheap however many channels the run has, and all writes go through
+    ``cache_writer`` because channels are recorded from the fetch loop.
+    """
+    
+    DIRECTORY = "checkpoints"
+    MAX_AGE = 7 * 86400
+    
+    def __init__(self, settings: Dict):
+        self.settings = settings
+        self.key = hashlib.sha1(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+        self.state = self._empty_state()
+        self._lock = threading.Lock()
+    
+    def _empty_state(self) -> Dict:
+        return {'settings': self.settings, 'created_at': time.time(), 'fetched': {}, 'summaries': {}}
+    
+    def _name(self, name: str) -> str:
+        return f"{self.DIRECTORY}/{self.key}/{name}"
+    
+    def load(self) -> bool:
+        """Load a saved checkpoint for these settings; False if there is none (or it expired)"""
+        cache_writer.flush()
+        data = load_cache(self._name("run.json"), self.MAX_AGE)
+        if not data:
+            return False
+        self.state = data
+        return True
+    
+    def clear(self):
+        """Delete the saved checkpoint and start over"""
+        cache_writer.flush()
+        shutil.rmtree(cache_path(f"{self.DIRECTORY}/{self.key}"), ignore_errors=True)
+        self.state = self._empty_state()
+    
+    def _save(self):
+        name = self._name("run.json")
+        cache_writer.submit(name, lambda: save_cache(name, self._snapshot()))
+    
+    def _snapshot(self) -> Dict:
+        with self._lock:
+            return dict(self.state, fetched=dict(self.state['fetched']), summaries=dict(self.state['summaries']))
+    
+    def record_channel(self, channel_id: int, messages: List[Dict]):
+        if messages:
+            name = self._name(f"channel_{channel_id}.json")
+            cache_writer.submit(name, lambda: save_cache(name, {'messages': messages}))
+        with self._lock:
+            self.state['fetched'][str(channel_id)] = len(messages)
+            self._save()
+    
+    def fetched_messages(self, channel_id: int) -> Optional[List[Dict]]:
+        """Messages saved for a channel, or None if it was not fetched yet"""
+        count = self.state['fetched'].get(str(channel_id))
+        if count is None:
+            return None
+        if count == 0:
             return []
+        data = load_cache(self._name(f"channel_{channel_id}.json"))
+        return data['messages'] if data else None
+    
+    def record_summary(self, channel_name: str, data: Dict):
+        with self._lock:
+            self.state['summaries'][channel_name] = data
+            self._save()
+    
+    @property
+    def summaries(self) -> Dict[str, Dict]:
+        return self.state['summaries']
+    
+    def describe(self) -> str:
+        age = time.time() - self.state.get('saved_at', self.state['created_at'])
+        return (f"{len(self.state['fetched'])} channels fetched, {len(self.summaries)} summarized, "
+                f"saved {format_eta(age)} ago")
+    
+    @classmethod
+    def prune(cls, max_age: Optional[float] = None):
+        """Delete checkpoints of runs abandoned more than ``max_age`` seconds ago"""
+        max_age = cls.MAX_AGE if max_age is None else max_age
+        try:
+            keys = os.listdir(cache_path(cls.DIRECTORY))
+        except OSError:
+            return
+        for key in keys:
+            name = f"{cls.DIRECTORY}/{key}/run.json"
+            if os.path.exists(cache_path(name)) and load_cache(name, max_age) is None:
+                shutil.rmtree(cache_path(f"{cls.DIRECTORY}/{key}"), ignore_errors=True)
+
+
+class RollingSummaries:
+    """Per-channel partial summaries of the messages that arrived in each rolling window
+    
+    The daemon's rolling passes (``--rolling``) summarize each window of new messages as it
+    closes, while the model is otherwise idle. A report over a range the windows cover then
+    only folds each channel's partials together instead of summarizing the whole day at once.
+    Windows never cross a UTC midnight, so they line up with report dates. The key hashes
+    the guild and model settings, so partials are only reused by reports that would have
+    produced them the same way.
+    """
+    
+    DIRECTORY = "rolling"
+    MAX_AGE_DAYS = 8
+    
+    def __init__(self, settings: Dict):
+        self.settings = settings
+        self.key = hashlib.sha1(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+        self.name = f"{self.DIRECTORY}/{self.key}.json"
+        data = load_cache(self.name) or {}
+        self.windows = [(datetime.fromisoformat(start), datetime.fromisoformat(end))
+                        for start, end in data.get('windows', [])]
+        self.partials: List[Dict] = data.get('partials', [])
+    
+    def covered_until(self, start: datetime) -> Optional[datetime]:
+        """End of the unbroken run of windows starting at or before ``start``; None if ``start`` is not covered"""
+        for window_start, window_end in MessageRangeCache._merge(self.windows):
+            if window_start <= start < window_end:
+                return window_end
+        return None
+    
+    def next_windows(self, until: datetime) -> List[tuple]:
+        """Windows from the end of the last pass (at most a day back) up to ``until``, split at midnight"""
+        start = until.replace(hour=0, minute=0, second=0, microsecond=0)
+        if self.windows:
+            start = max(start - timedelta(days=1), max(end for _, end in self.windows))
+        windows = []
+        while start < until:
+            midnight = start.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+            windows.append((start, min(midnight, until)))
+            start = windows[-1][1]
+        return windows
+    
+    def record(self, start: datetime, end: datetime, channel_summaries: Dict[str, Dict]):
+        """Save one window's partial summaries (channels without new messages are left out)"""
+        for channel_name, data in channel_summaries.items():
+            self.partials.append(dict(data, channel=channel_name, start=start.isoformat(), end=end.isoformat()))
+        self.windows.append((start, end))
+        
+        oldest = end - timedelta(days=self.MAX_AGE_DAYS)
+        self.windows = [(window_start, window_end) for window_start, window_end in self.windows if window_end > oldest]
+        self.partials = [partial for partial in self.partials if datetime.fromisoformat(partial['end']) > oldest]
+        save_cache(self.name, {
+            'settings': self.settings,
+            'windows': [(window_start.isoformat(), window_end.isoformat()) for window_start, window_end in self.windows],
+            'partials': self.partials,
+        })
+    
+    def channel_partials(self, start: datetime, end: datetime) -> Dict[str, List[Dict]]:
+        """Partials of windows starting within [start, end), per channel in time order"""
+        by_channel: Dict[str, List[Dict]] = defaultdict(list)
+        for partial in sorted(self.partials, key=lambda partial: partial['start']):
+            if start <= datetime.fromisoformat(partial['start']) < end:
+                by_channel[partial['channel']].append(partial)
+        return dict(by_channel)
 
 
 class DiscordDaySummarizer:
     """Discord summarizer using HTTP API for personal accounts"""
     
-    def __init__(self, start_date: Optional[str] = None, end_date: Optional[str] = None, log_callback=None):
+    def __init__(self, start_date: Optional[str] = None, end_date: Optional[str] = None, log_callback=None,
+                 deadline: Optional[str] = None, cancel_token: Optional[CancellationToken] = None,
+                 progress_callback=None, stream_callback=None, guild_id: Optional[int] = None,
+                 pool: Optional[ClientPool] = None, resume: bool = False):
         self.token = os.getenv('DISCORD_TOKEN')
         guild_id_str = os.getenv('GUILD_ID')
-        self.guild_id = int(guild_id_str) if guild_id_str else None
+        self.guild_id = guild_id or (int(guild_id_str) if guild_id_str else None)
+        self.pool = pool  # Shared clients and fetched messages when running from a JobQueue
         self.max_messages = int(os.getenv('MAX_MESSAGES_PER_CHANNEL', 1000))
         self.summary_style = os.getenv('SUMMARY_STYLE', 'detailed')
         self.log_callback = log_callback or print  # Use callback if provided, otherwise print
+        self.directory_ttl = int(os.getenv('DIRECTORY_CACHE_TTL', 86400))
+        self.guild_info = None
+        self.deadline = parse_deadline(deadline or os.getenv('RUN_DEADLINE'))
+        self.fallback_model = os.getenv('FALLBACK_MODEL') or None
+        self.degraded_prompt_chars = int(os.getenv('DEGRADED_PROMPT_CHARS', 4000))
+        self.run_notes: List[str] = []
+        self.overview: Dict = {}  # Server name, executive summary and totals of the last report
+        self.max_concurrency = int(os.getenv('OLLAMA_MAX_CONCURRENCY', 4))
+        self.fetch_concurrency = int(os.getenv('FETCH_CONCURRENCY', 8))
+        self.run_metrics: Dict = {}
+        self.cancel_token = cancel_token or CancellationToken()
+        self.progress_callback = progress_callback
+        self.progress = ProgressTracker()
         
         # Set date range
         self.start_date, self.end_date = self._parse_date_range(start_date, end_date)
         
         # Initialize HTTP client
         if self.token:
-            self.client = DiscordHTTPClient(self.token)
+            self.client = pool.discord(self.token) if pool else DiscordHTTPClient(self.token)
         else:
             self.client = None
         
         # Initialize Ollama client
         ollama_url = os.getenv('OLLAMA_URL', 'http://localhost:11434')
         ollama_model = os.getenv('OLLAMA_MODEL', 'llama3.2')
-        self.ollama = OllamaClient(ollama_url, ollama_model)
+        max_prompt_chars = int(os.getenv('MAX_PROMPT_CHARS', 12000))
+        if pool:
+            self.ollama = pool.ollama(ollama_url, ollama_model, max_prompt_chars, self.max_concurrency)
+        else:
+            self.ollama = OllamaClient(ollama_url, ollama_model, max_prompt_chars, max_concurrency=self.max_concurrency)
+        self.ollama.cancel_token = self.cancel_token
+        self.ollama.stream_callback = stream_callback
+        
+        # Fetched channels and finished summaries are saved as they complete, so a failed run can resume
+        self.resume = resume
+        self.failed_channels: List[str] = []
+        self.checkpoint = RunCheckpoint(self.checkpoint_settings())
+        self.channel_order: List[str] = []
+    
+    def checkpoint_settings(self) -> Dict:
+        """Everything that changes a run's output, so checkpoints are only reused by identical runs"""
+        return {
+            'guild_id': self.guild_id,
+            'start': self.start_date.isoformat(),
+            'end': self.end_date.isoformat(),
+            'ollama_url': self.ollama.url,
+            'model': self.ollama.model,
+            'max_prompt_chars': self.ollama.async_client.max_prompt_chars,
+            'max_messages': self.max_messages,
+            'summary_style': self.summary_style,
+        }
+    
+    def rolling_settings(self) -> Dict:
+        """Settings that change a channel summary, so rolling partials are only folded into matching reports"""
+        return {
+            'guild_id': self.guild_id,
+            'ollama_url': self.ollama.url,
+            'model': self.ollama.model,
+            'max_prompt_chars': self.ollama.async_client.max_prompt_chars,
+        }
     
     def _parse_date_range(self, start_date: Optional[str], end_date: Optional[str]) -> tuple[datetime, datetime]:
         """Parse and validate date range"""
@@ -478,25 +2901,37 @@ class DiscordDaySummarizer:
             self.log_callback("❌ Error: GUILD_ID not found in environment variables")
             return False
         
-        if not self.client or not self.client.test_connection():
-            self.log_callback("❌ Error: Cannot authenticate with Discord")
+        # Both probes run concurrently and reuse any result checked in the last HEALTH_CHECK_TTL seconds
+        health = health_checker.check_all(self.client, self.guild_id, self.ollama.url)
+        discord, ollama = health['discord'], health['ollama']
+        
+        if not discord['ok']:
+            self.log_callback(f"❌ Error: Cannot authenticate with Discord ({discord.get('error', 'unknown error')})")
+            return False
+        self.guild_info = discord.get('guild') or self.guild_info
+        
+        if not ollama['ok']:
+            self.log_callback(f"❌ Error: Cannot connect to Ollama ({ollama.get('error', 'unknown error')})")
             return False
         
-        if not self.ollama.test_connection():
-            self.log_callback("❌ Error: Cannot connect to Ollama")
+        if not health_checker.has_model(ollama, self.ollama.model):
+            self.log_callback(f"❌ Error: Model '{self.ollama.model}' not found. Available models: {ollama['models']}")
+            self.log_callback(f"   You can pull the model with: ollama pull {self.ollama.model}")
             return False
         
         self.log_callback("✅ Configuration validated successfully")
         return True
     
-    def fetch_messages_in_range(self) -> Dict[str, List[Dict]]:
-        """Fetch messages from the specified date range"""
+    def fetch_messages_in_range(self, after: Optional[datetime] = None) -> Dict[str, List[Dict]]:
+        """Fetch messages from the specified date range (or only from ``after`` to its end)"""
         if not self.client or self.guild_id is None:
             self.log_callback("❌ Client not initialized or guild_id not set")
             return {}
-            
-        self.log_callback(f"📅 Fetching messages from {self.start_date.strftime('%Y-%m-%d %H:%M:%S UTC')} "
-              f"to {self.end_date.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+        
+        start = max(after or self.start_date, self.start_date)
+        if start < self.end_date:
+            self.log_callback(f"📅 Fetching messages from {start.strftime('%Y-%m-%d %H:%M:%S UTC')} "
+                  f"to {self.end_date.strftime('%Y-%m-%d %H:%M:%S UTC')}")
         
         days_diff = (self.end_date - self.start_date).days
         if days_diff == 0:
@@ -506,33 +2941,59 @@ class DiscordDaySummarizer:
         else:
             self.log_callback(f"📆 Date range: {days_diff} days")
         
-        # Get guild info
-        guild_info = self.client.get_guild_info(self.guild_id)
+        # Get guild info (usually already fetched by the health check)
+        guild_info = self.guild_info or self.client.get_guild_info(self.guild_id)
         if not guild_info:
             return {}
+        self.guild_info = guild_info
         
         self.log_callback(f"🏠 Connected to server: {guild_info.get('name', 'Unknown')}")
         
         # Get channels
-        channels = self.client.get_guild_channels(self.guild_id)
+        if self.pool:
+            channels = self.pool.guild_channels(self.client, self.guild_id)
+        else:
+            channels = self.client.get_guild_channels(self.guild_id)
+        self.channel_order = [channel.get('name', 'unknown') for channel in channels]
         self.log_callback(f"📝 Found {len(channels)} text channels")
+        if start >= self.end_date:
+            return {}  # Everything up to the end was already summarized by rolling passes
         
         channel_messages = {}
         total_messages = 0
+        self.progress.update(stage="fetching", channels_total=len(channels))
         
-        for channel in channels:
-            channel_name = channel.get('name', 'unknown')
-            channel_id = int(channel.get('id', 0))
-            
-            self.log_callback(f"📝 Fetching from #{channel_name}...")
-            
-            messages = self.client.get_channel_messages(
-                channel_id, 
-                self.start_date, 
-                self.end_date, 
-                self.max_messages
+        def on_page(batch):
+            self.progress.advance(pages_fetched=1)
+        
+        def on_channel(channel_id, messages):
+            self.checkpoint.record_channel(channel_id, messages)
+            self.progress.advance(
+                channels_fetched=1,
+                channels_to_summarize=1 if messages else 0,
+                tokens_fetched=_messages_chars(messages) // 4
             )
-            
+        
+        # All channels are fetched concurrently as coroutines on the shared background loop
+        self.cancel_token.raise_if_cancelled()
+        channel_ids = [int(channel.get('id', 0)) for channel in channels]
+        fetched = {}
+        for channel_id in channel_ids:
+            messages = self.checkpoint.fetched_messages(channel_id)
+            if messages is not None:
+                fetched[channel_id] = messages
+                self.progress.advance(channels_fetched=1, channels_to_summarize=1 if messages else 0,
+                                      tokens_fetched=_messages_chars(messages) // 4)
+        if fetched:
+            self.log_callback(f"♻️ Reusing {len(fetched)} fetched channels from the checkpoint")
+        to_fetch = [channel_id for channel_id in channel_ids if channel_id not in fetched]
+        
+        if to_fetch and start < self.end_date:
+            fetched.update(self._fetch_window(to_fetch, start, self.end_date, on_page, on_channel))
+        
+        for channel, channel_id in zip(channels, channel_ids):
+            channel_name = channel.get('name', 'unknown')
+            messages = fetched.get(channel_id, [])
             if messages:
                 channel_messages[channel_name] = messages
                 total_messages += len(messages)
@@ -543,79 +3004,282 @@ class DiscordDaySummarizer:
         self.log_callback(f"\n📊 Total messages collected: {total_messages} across {len(channel_messages)} channels")
         return channel_messages
     
+    def _fetch_range(self, channel_ids: List[int], start: datetime, end: datetime,
+                     on_page=None, on_channel=None) -> Dict[int, List[Dict]]:
+        """Page REST history of the channels in [start, end], through the shared pool cache if there is one"""
+        if self.pool:
+            # Jobs sharing a pool only download the parts of the range no other job has fetched
+            return self.pool.messages.fetch_many(
+                self.client, channel_ids, start, end, self.max_messages,
+                concurrency=self.fetch_concurrency, cancel_token=self.cancel_token,
+                on_page=on_page, on_channel=on_channel
+            )
+        return self.client.get_many_channel_messages(
+            channel_ids, start, end, self.max_messages,
+            concurrency=self.fetch_concurrency, cancel_token=self.cancel_token,
+            on_page=on_page, on_channel=on_channel
+        )
+    
+    def _fetch_window(self, channel_ids: List[int], start: datetime, end: datetime,
+                      on_page=None, on_channel=None) -> Dict[int, List[Dict]]:
+        """Messages of the channels in [start, end], from the gateway store where it has them, else REST"""
+        store = MessageStore.open_existing()
+        try:
+            if store and self._store_covers_range(store, start, end):
+                return self._fetch_with_store(store, channel_ids, start, end, on_page, on_channel)
+            self.log_callback(f"📝 Fetching {len(channel_ids)} channels ({self.fetch_concurrency} at a time)...")
+            return self._fetch_range(channel_ids, start, end, on_page, on_channel)
+        finally:
+            if store:
+                store.close()
+    
+    def _store_gaps(self, store: 'MessageStore', start: datetime, end: datetime) -> List[tuple]:
+        """Parts of [start, end] (up to now) the gateway listener did not capture"""
+        end = min(end, datetime.now(timezone.utc))
+        return store.gaps(self.guild_id, start, end) if end > start else []
+    
+    def _store_covers_range(self, store: 'MessageStore', start: datetime, end: datetime) -> bool:
+        end = min(end, datetime.now(timezone.utc))
+        return end > start and self._store_gaps(store, start, end) != [(start, end)]
+    
+    def _fetch_with_store(self, store: 'MessageStore', channel_ids: List[int], start: datetime, end: datetime,
+                          on_page=None, on_channel=None) -> Dict[int, List[Dict]]:
+        """Read the range from the gateway message store, paging REST only for the uncovered gaps"""
+        gaps = self._store_gaps(store, start, end)
+        if gaps:
+            missing = ", ".join(f"{gap_start.strftime('%m-%d %H:%M')}–{gap_end.strftime('%H:%M')}" for gap_start, gap_end in gaps)
+            self.log_callback(f"📡 Reading {len(channel_ids)} channels from the gateway store; fetching gaps over REST: {missing}")
+        else:
+            self.log_callback(f"📡 Reading {len(channel_ids)} channels from the gateway store (range fully captured, no REST calls)")
+        
+        from_rest: Dict[int, List[Dict]] = defaultdict(list)
+        for gap_start, gap_end in gaps:
+            for channel_id, messages in self._fetch_range(channel_ids, gap_start, gap_end, on_page).items():
+                from_rest[channel_id].extend(messages)
+        
+        fetched = {}
+        for channel_id in channel_ids:
+            self.cancel_token.raise_if_cancelled()
+            by_id = {msg['id']: msg for msg in store.messages(channel_id, start, end, self.max_messages)}
+            by_id.update((msg['id'], msg) for msg in from_rest.get(channel_id, []))
+            messages = sorted(by_id.values(), key=lambda msg: int(msg['id']), reverse=True)[:self.max_messages]
+            fetched[channel_id] = messages
+            if on_channel:
+                on_channel(channel_id, messages)
+        return fetched
+    
+    def normalize_messages(self, channel_messages: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        """Resolve mentions, shorten URLs and collapse large code blocks before summarizing"""
+        directory = GuildDirectory(self.guild_id, ttl=self.directory_ttl)
+        directory.load(self.client, self.guild_info)
+        for messages in channel_messages.values():
+            directory.observe(messages)
+        directory.save()
+        
+        normalizer = MessageNormalizer(directory)
+        normalized = {name: normalizer.normalize(messages) for name, messages in channel_messages.items()}
+        self.log_callback(f"🧹 Normalized message content: ~{normalizer.tokens_saved} tokens saved")
+        return normalized
+    
     def format_messages_for_summary(self, messages: List[Dict]) -> str:
-        """Format messages for AI processing"""
-        formatted = []
+        """Format messages for AI processing, grouped into reply-linked conversations"""
+        return ConversationIndex(messages).format()
+    
+    def roll_partials(self, until: Optional[datetime] = None) -> int:
+        """Summarize each channel's messages since the last rolling pass into partial summaries
         
-        for message in messages:
-            timestamp_str = message.get('timestamp', '')
-            try:
-                timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                time_str = timestamp.strftime("%H:%M")
-            except:
-                time_str = "??:??"
-            
-            author = message.get('author', {})
-            author_name = author.get('username', 'Unknown')
-            content = message.get('content', '')
-            
-            # Handle attachments
-            attachments = message.get('attachments', [])
-            if attachments:
-                content += f" [Attachments: {len(attachments)}]"
-            
-            # Handle embeds
-            embeds = message.get('embeds', [])
-            if embeds:
-                content += f" [Embeds: {len(embeds)}]"
+        Run periodically (the daemon's ``--rolling``), so a report over the covered windows only
+        has to fold the partials. Returns the number of channel partials saved.
+        """
+        if not self.validate_config():
+            return 0
+        rolling = RollingSummaries(self.rolling_settings())
+        windows = rolling.next_windows(until or datetime.now(timezone.utc))
+        if not windows:
+            return 0
+        
+        if self.pool:
+            channels = self.pool.guild_channels(self.client, self.guild_id)
+        else:
+            channels = self.client.get_guild_channels(self.guild_id)
+        names = {int(channel.get('id', 0)): channel.get('name', 'unknown') for channel in channels}
+        scheduler = DeadlineScheduler(None, self.fallback_model, self.degraded_prompt_chars, log_callback=self.log_callback)
+        
+        async def summarize_all(channel_messages):
+            results = await asyncio.gather(*(
+                self.summarize_channel(name, messages, scheduler, DeadlineScheduler.FULL)
+                for name, messages in channel_messages.items()
+            ))
+            return {name: summary for name, (summary, *_) in zip(channel_messages, results)}
+        
+        saved = 0
+        for start, end in windows:
+            self.cancel_token.raise_if_cancelled()
+            fetched = self._fetch_window(list(names), start, end)
+            channel_messages = {names[channel_id]: messages for channel_id, messages in fetched.items() if messages}
+            if channel_messages:
+                channel_messages = self.normalize_messages(channel_messages)
+            summaries = run_coroutine_sync(summarize_all(channel_messages), self.cancel_token)
             
-            # Handle replies
-            if message.get('message_reference'):
-                content = f"[Reply] {content}"
+            failed = [name for name, summary in summaries.items() if summary.startswith(("Error", "Unexpected error"))]
+            if failed:
+                # The window is retried by the next pass; its finished channels come back from the summary cache
+                self.log_callback(f"⚠️ Rolling window {start.strftime('%H:%M')}–{end.strftime('%H:%M')} not saved, "
+                                  f"failed: {', '.join('#' + name for name in failed)}")
+                break
+            rolling.record(start, end, {
+                name: {'message_count': len(channel_messages[name]), 'summary': summary}
+                for name, summary in summaries.items()
+            })
+            saved += len(summaries)
+            if summaries:
+                self.log_callback(f"🧩 Rolled {start.strftime('%Y-%m-%d %H:%M')}–{end.strftime('%H:%M')} UTC: "
+                                  f"{sum(len(messages) for messages in channel_messages.values())} new messages "
+                                  f"in {len(summaries)} channels")
+        return saved
+    
+    def fold_partials(self, partials: Dict[str, List[Dict]], channel_summaries: Dict[str, Dict],
+                      scheduler: DeadlineScheduler) -> Dict[str, Dict]:
+        """Merge each channel's rolling partials (and the summary of its newer messages) into one summary"""
+        async def fold(channel_name):
+            pieces = [partial['summary'] for partial in partials.get(channel_name, [])]
+            message_count = sum(partial['message_count'] for partial in partials.get(channel_name, []))
+            latest = channel_summaries.get(channel_name)
+            if latest:
+                if latest['summary'].startswith(("Error", "Unexpected error")):
+                    return latest  # Reported as failed, so the run can be resumed
+                pieces.append(latest['summary'])
+                message_count += latest['message_count']
             
-            if content.strip():
-                formatted.append(f"[{time_str}] {author_name}: {content}")
+            if len(pieces) == 1:
+                summary = pieces[0]
+            elif scheduler.remaining() < scheduler.call_overhead:
+                summary = "\n".join(pieces)
+            else:
+                summary = await self.ollama.async_client._merge_partial_summaries(pieces, channel_name)
+                if summary.startswith(("Error", "Unexpected error")):
+                    summary = "\n".join(pieces)  # Unmerged partials still beat a failed channel
+            return {'message_count': message_count, 'summary': summary}
         
-        return "\n".join(formatted)
+        async def fold_all(names):
+            return dict(zip(names, await asyncio.gather(*(fold(name) for name in names))))
+        
+        names = list(partials) + [name for name in channel_summaries if name not in partials]
+        folded = run_coroutine_sync(fold_all(names), self.cancel_token)
+        self.log_callback(f"🧩 Folded rolling partials of {len(partials)} channels")
+        return folded
     
-    def generate_summary(self) -> tuple:
-        """Generate the complete daily summary and return (markdown, html, filename)"""
+    def generate_summary(self, channel_messages: Optional[Dict[str, List[Dict]]] = None) -> tuple:
+        """Generate the complete daily summary and return (markdown, html, filename)
+        
+        ``channel_messages`` (channel name -> messages, in server order) skips the fetch, for
+        callers that fetched the range themselves, like the per-day backfill.
+        """
+        run_started = time.time()
+        self.run_metrics = {}
+        self.progress = ProgressTracker(self.progress_callback, self.ollama.throughput())
         self.log_callback("🚀 Starting Discord Day Summarizer...")
         self.log_callback(f"📅 Date Range: {self.start_date.strftime('%Y-%m-%d')} to {self.end_date.strftime('%Y-%m-%d')}")
         
         if not self.validate_config():
             return "❌ Configuration validation failed", "", ""
         
+        # Windows already summarized by rolling passes are folded in instead of fetched and summarized again
+        rolling = RollingSummaries(self.rolling_settings())
+        rolled_until = rolling.covered_until(self.start_date) if channel_messages is None else None
+        partials = rolling.channel_partials(self.start_date, min(rolled_until, self.end_date)) if rolled_until else {}
+        if rolled_until:
+            self.log_callback(f"🧩 Rolling partials cover up to {rolled_until.strftime('%Y-%m-%d %H:%M')} UTC "
+                              f"({len(partials)} channels); summarizing only newer messages")
+        
+        RunCheckpoint.prune()
+        settings = self.checkpoint_settings()  # Picks up settings overridden after __init__
+        if rolled_until:
+            settings['rolled_until'] = rolled_until.isoformat()
+        self.checkpoint = RunCheckpoint(settings)
+        if self.resume and self.checkpoint.load():
+            self.log_callback(f"♻️ Resuming from checkpoint: {self.checkpoint.describe()}")
+        else:
+            if self.resume:
+                self.log_callback("💾 No checkpoint found for these settings, starting a fresh run")
+            self.checkpoint.clear()
+        
         # Fetch messages
-        channel_messages = self.fetch_messages_in_range()
+        if channel_messages is None:
+            channel_messages = self.fetch_messages_in_range(after=rolled_until)
+        else:
+            self.channel_order = list(channel_messages)
+            channel_messages = {name: messages for name, messages in channel_messages.items() if messages}
         
-        if not channel_messages:
+        if not channel_messages and not partials:
             return "📭 No messages found for the specified date range.", "", ""
         
+        self.cancel_token.raise_if_cancelled()
+        channel_messages = self.normalize_messages(channel_messages)
+        
         # Get guild info
         guild_name = "Unknown Server"
         if self.client and self.guild_id:
-            guild_info = self.client.get_guild_info(self.guild_id)
+            guild_info = self.guild_info or self.client.get_guild_info(self.guild_id)
             guild_name = guild_info.get('name', 'Unknown Server') if guild_info else 'Unknown Server'
         
         # Generate channel summaries
         self.log_callback("🤖 Generating AI summaries...")
-        channel_summaries = {}
+        scheduler = DeadlineScheduler(
+            self.deadline, self.fallback_model, self.degraded_prompt_chars, log_callback=self.log_callback
+        )
+        scheduler.calibrate(self.ollama.throughput())
+        if self.deadline:
+            self.ollama.deadline = self.deadline.timestamp()
+            self.log_callback(f"⏱️ Deadline: {self.deadline.strftime('%Y-%m-%d %H:%M')} "
+                              f"({scheduler.remaining() / 60:.0f} minutes left)")
         
-        for channel_name, messages in channel_messages.items():
-            if messages:
-                self.log_callback(f"🤖 Analyzing #{channel_name} ({len(messages)} messages)...")
-                channel_summary = self.ollama.generate_summary(messages, channel_name)
-                channel_summaries[channel_name] = {
-                    'message_count': len(messages),
-                    'summary': channel_summary
-                }
+        resumed = {name: data for name, data in self.checkpoint.summaries.items() if name in channel_messages}
+        if resumed:
+            self.log_callback(f"♻️ Reusing {len(resumed)} channel summaries from the checkpoint")
+        remaining = {name: messages for name, messages in channel_messages.items() if name not in resumed}
+        channel_summaries = self.summarize_channels(remaining, scheduler)
+        channel_summaries.update(resumed)
+        if partials:
+            channel_summaries = self.fold_partials(partials, channel_summaries, scheduler)
+        self.failed_channels = [name for name, data in channel_summaries.items()
+                                if data['summary'].startswith(("Error", "Unexpected error"))]
+        
+        # Restore server channel order for the report
+        order = self.channel_order + [name for name in channel_summaries if name not in self.channel_order]
+        channel_summaries = {name: channel_summaries[name] for name in order if name in channel_summaries}
         
         # Generate overall summary
+        self.cancel_token.raise_if_cancelled()
+        self.progress.update(stage="overall")
         self.log_callback("🤖 Generating overall summary...")
-        overall_summary = self.ollama.generate_overall_summary(
-            channel_summaries, guild_name, self.start_date, self.end_date
-        )
+        if scheduler.remaining() < scheduler.call_overhead:
+            overall_summary = self._extractive_overall_summary(channel_summaries)
+            scheduler.note("overall summary", DeadlineScheduler.EXTRACTIVE)
+        else:
+            degraded = scheduler.level >= DeadlineScheduler.FALLBACK_MODEL
+            overall_summary = self.ollama.generate_overall_summary(
+                channel_summaries, guild_name, self.start_date, self.end_date,
+                model=scheduler.fallback_model if degraded else None
+            )
+        self.run_notes = scheduler.report_notes()
+        self.ollama.deadline = None
+        self.progress.update(stage="done")
+        
+        self.run_metrics.update({
+            'started_at': datetime.fromtimestamp(run_started).isoformat(timespec='seconds'),
+            'elapsed_seconds': round(time.time() - run_started, 1),
+            'channels': len(channel_summaries),
+            'messages': sum(data['message_count'] for data in channel_summaries.values()),
+        })
+        self.save_run_metrics()
+        self.overview = {
+            'guild_id': self.guild_id,
+            'guild_name': guild_name,
+            'summary': overall_summary,
+            'messages': self.run_metrics['messages'],
+            'channels': len(channel_summaries),
+        }
         
         # Create title
         start_date_str = self.start_date.strftime('%Y-%m-%d')
@@ -652,20 +3316,149 @@ class DiscordDaySummarizer:
         
         return markdown_content, html_content, filename_base
     
-    def create_markdown_content(self, title, overall_summary, channel_summaries, date_str):
+    def save_run_metrics(self, keep: int = 50):
+        """Append this run's metrics to the history kept in the cache directory"""
+        history = (load_cache("run_metrics.json") or {}).get('runs', [])
+        history.append(self.run_metrics)
+        save_cache("run_metrics.json", {'runs': history[-keep:]})
+    
+    def summarize_channels(self, channel_messages: Dict[str, List[Dict]], scheduler: DeadlineScheduler) -> Dict:
+        """Summarize channels concurrently, largest first, under an adaptive in-flight limit
+        
+        Each channel is a coroutine on the background loop; cancelling the run cancels them all.
+        """
+        channel_summaries = run_coroutine_sync(self._summarize_channels(channel_messages, scheduler), self.cancel_token)
+        self.cancel_token.raise_if_cancelled()
+        return channel_summaries
+    
+    async def _summarize_channels(self, channel_messages: Dict[str, List[Dict]], scheduler: DeadlineScheduler) -> Dict:
+        controller = AIMDController(max_limit=self.max_concurrency)
+        ordered = [item for item in scheduler.order(channel_messages) if item[1]]
+        pending_chars = [_messages_chars(messages) for _, messages in ordered]
+        channel_summaries = {}
+        self.progress.update(
+            stage="summarizing",
+            channels_to_summarize=len(ordered),
+            prompt_tokens_total=sum(pending_chars) // 4
+        )
+        in_flight = {}
+        position = 0
+        # Chunks of a large channel count against the same limit as whole channels
+        self.ollama.async_client.limiter = controller
+        
+        try:
+            while position < len(ordered) or in_flight:
+                while position < len(ordered) and len(in_flight) < controller.in_flight_limit:
+                    channel_name, messages = ordered[position]
+                    level = scheduler.choose_level(pending_chars[position:])
+                    self.log_callback(f"🤖 Analyzing #{channel_name} ({len(messages)} messages)...")
+                    task = asyncio.ensure_future(self.summarize_channel(channel_name, messages, scheduler, level))
+                    in_flight[task] = (channel_name, messages, pending_chars[position], level, time.time())
+                    position += 1
+                
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    channel_name, messages, chars, level, started = in_flight.pop(task)
+                    summary, used_level, errored, cached = task.result()
+                    elapsed = time.time() - started
+                    
+                    # A failed call still counts against the limit, even when highlights replaced it;
+                    # a reused summary made no call, so it says nothing about the host's latency
+                    if not cached and (errored or used_level < DeadlineScheduler.EXTRACTIVE):
+                        if level >= DeadlineScheduler.TIGHT_BUDGET:
+                            chars = min(chars, scheduler.degraded_prompt_chars)
+                        if not errored:
+                            scheduler.record(chars, elapsed, level)
+                        model = scheduler.fallback_model if level >= DeadlineScheduler.FALLBACK_MODEL else None
+                        expected = self.ollama.expected_seconds(chars, model)
+                        controller.record(elapsed, expected, error=errored)
+                    scheduler.note(channel_name, used_level)
+                    self.progress.concurrency = controller.in_flight_limit
+                    self.progress.advance(channels_summarized=1, prompt_tokens_done=_messages_chars(messages) // 4)
+                    
+                    channel_summaries[channel_name] = {
+                        'message_count': len(messages),
+                        'summary': summary
+                    }
+                    # Only full-quality summaries are worth keeping for a resumed run
+                    if used_level == DeadlineScheduler.FULL and not errored:
+                        self.checkpoint.record_summary(channel_name, channel_summaries[channel_name])
+        finally:
+            # Cancelled or failed: abort the remaining requests so their Ollama slots free up
+            for task in in_flight:
+                task.cancel()
+            self.ollama.async_client.limiter = None
+        
+        self.run_metrics['concurrency'] = controller.history
+        self.log_callback(f"📈 Ollama concurrency: {controller.describe()}")
+        return channel_summaries
+    
+    async def summarize_channel(self, channel_name: str, messages: List[Dict], scheduler: DeadlineScheduler,
+                                level: int) -> tuple:
+        """Summarize one channel at a degradation level
+        
+        Returns (summary, level used, errored, cached); a cached summary was reused from the pool
+        without a model call.
+        """
+        if level >= DeadlineScheduler.EXTRACTIVE:
+            return extractive_highlights(messages), level, False, False
+        
+        model = scheduler.fallback_model if level >= DeadlineScheduler.FALLBACK_MODEL else None
+        budget = scheduler.degraded_prompt_chars if level >= DeadlineScheduler.TIGHT_BUDGET else None
+        
+        # Channels whose messages are unchanged since an earlier run on the same pool reuse its summary
+        key = None
+        if self.pool:
+            settings = f"{self.ollama.url}|{model or self.ollama.model}|{budget or self.ollama.async_client.max_prompt_chars}"
+            key = self.pool.summary_key(settings, channel_name, messages)
+            summary = self.pool.cached_summary(key)
+            if summary is not None:
+                self.log_callback(f"♻️ #{channel_name} is unchanged, reusing its summary")
+                return summary, level, False, True
+        
+        summary = await self.ollama.async_client.generate_summary(messages, channel_name, model=model, char_budget=budget)
+        errored = summary.startswith(("Error", "Unexpected error"))
+        if key and not errored:
+            self.pool.store_summary(key, summary)
+        
+        if errored and self.deadline:
+            # Out of time mid-call: ship highlights rather than an error
+            return extractive_highlights(messages), DeadlineScheduler.EXTRACTIVE, True, False
+        return summary, level, errored, False
+    
+    def _extractive_overall_summary(self, channel_summaries) -> str:
+        """Overall summary built from the first point of each channel, without a model call"""
+        lines = []
+        for channel_name, data in channel_summaries.items():
+            if data['summary'] == "No significant business activities detected.":
+                continue
+            first_line = next((line.strip() for line in data['summary'].splitlines() if line.strip()), "")
+            if first_line:
+                lines.append(f"• #{channel_name}: {first_line.lstrip('•-* ')}")
+        return "\n".join(lines[:6]) or "No significant business activities detected across all channels."
+    
+    def create_markdown_content(self, title, overall_summary, channel_summaries, date_str, section_prefix="#"):
         """Create clean markdown content"""
         content = f"""# {title}
 
 ## 🎯 Executive Summary
 {overall_summary}
 
-## 📋 Channel Details
 """
         
+        if self.run_notes:
+            notes = "\n".join(f"- {note}" for note in self.run_notes)
+            content += f"""## ⚠️ Run Notes
+{notes}
+
+"""
+        
+        content += "## 📋 Channel Details\n"
+        
         for channel_name, data in channel_summaries.items():
             if data['summary'] != "No significant business activities detected.":
                 content += f"""
-### #{channel_name}
+### {section_prefix}{channel_name}
 **Messages:** {data['message_count']}
 
 {data['summary']}
@@ -675,7 +3468,7 @@ class DiscordDaySummarizer:
         
         return content
     
-    def create_html_content(self, title, overall_summary, channel_summaries, date_str):
+    def create_html_content(self, title, overall_summary, channel_summaries, date_str, section_prefix="#"):
         """Create modern HTML content"""
         
         # Count active channels
@@ -878,7 +3671,20 @@ class DiscordDaySummarizer:
                 <div class="executive-summary">
                     {overall_summary.replace(chr(10), '<br>')}
                 </div>
-            </div>
+            </div>"""
+        
+        if self.run_notes:
+            notes_html = "<br>".join(f"⚠️ {note}" for note in self.run_notes)
+            html_content += f"""
+            
+            <div class="section">
+                <h2>⚠️ Run Notes</h2>
+                <div class="executive-summary">
+                    {notes_html}
+                </div>
+            </div>"""
+        
+        html_content += """
             
             <div class="section">
                 <h2>📋 Channel Details</h2>"""
@@ -889,7 +3695,7 @@ class DiscordDaySummarizer:
                 html_content += f"""
                 <div class="channel">
                     <div class="channel-header">
-                        <div class="channel-name">#{channel_name}</div>
+                        <div class="channel-name">{section_prefix}{channel_name}</div>
                         <div class="channel-meta">{data['message_count']} messages analyzed</div>
                     </div>
                     <div class="channel-content">
@@ -910,6 +3716,16 @@ class DiscordDaySummarizer:
         
         return html_content
     
+    def save_report(self, markdown_content: str, html_content: str, filename_base: str) -> tuple:
+        """Write the markdown and HTML reports, never overwriting an earlier report; returns both filenames"""
+        md_filename, html_filename = write_report_files(markdown_content, html_content, filename_base)
+        if self.failed_channels:
+            self.log_callback(f"💾 {len(self.failed_channels)} channel summaries failed; "
+                              f"run again with --resume to retry only those")
+        else:
+            self.checkpoint.clear()
+        return md_filename, html_filename
+    
     def run(self):
         """Run the summarizer and save files"""
         try:
@@ -920,15 +3736,7 @@ class DiscordDaySummarizer:
                 print(f"❌ {markdown_content}")
                 return
             
-            # Save markdown file
-            md_filename = f"{filename_base}.md"
-            with open(md_filename, 'w', encoding='utf-8') as f:
-                f.write(markdown_content)
-            
-            # Save HTML file
-            html_filename = f"{filename_base}.html"
-            with open(html_filename, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            md_filename, html_filename = self.save_report(markdown_content, html_content, filename_base)
             
             print(f"\n✅ Summary generated successfully!")
             print(f"📄 Markdown: {md_filename}")
@@ -947,10 +3755,700 @@ class DiscordDaySummarizer:
             print(markdown_content[:500] + "..." if len(markdown_content) > 500 else markdown_content)
             print("="*60)
             
+        except OperationCancelled:
+            print("\n🛑 Operation cancelled by user")
         except Exception as e:
             print(f"❌ Error: {e}")
 
 
+class SummaryJob:
+    """One queued report: a date range (optionally for another guild) with its status and timing"""
+    
+    ACTIVE = ("queued", "running")
+    
+    def __init__(self, job_id: int, start_date: str, end_date: str, guild_id: Optional[int] = None):
+        self.id = job_id
+        self.start_date = start_date
+        self.end_date = end_date
+        self.guild_id = guild_id
+        self.status = "queued"  # queued -> running -> done / failed / cancelled
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.progress: Optional[Dict] = None  # Latest ProgressTracker event
+        self.files: tuple = ()
+        self.error: Optional[str] = None
+        self.cancel_token = CancellationToken()
+        self.summarizer: Optional['DiscordDaySummarizer'] = None
+        self.settings: Dict = {}  # The summarizer's checkpoint settings; identical settings give identical reports
+        self.key: Optional[str] = None
+        self.cached = False  # Finished instantly by reusing an earlier job's report
+        self.overview: Dict = {}  # Server name and executive summary of the finished report
+    
+    @property
+    def label(self) -> str:
+        dates = self.start_date if self.start_date == self.end_date else f"{self.start_date} → {self.end_date}"
+        return f"#{self.id} {dates}" + (f" (guild {self.guild_id})" if self.guild_id else "")
+    
+    @property
+    def elapsed(self) -> float:
+        if not self.started:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+    
+    def describe(self) -> str:
+        """Status line for job lists, e.g. 'running 42s - Summarizing 3/8 channels - ETA 1m 10s'"""
+        text = self.status
+        if self.started:
+            text += f" {format_eta(self.elapsed)}"
+        if self.status == "running" and self.progress:
+            text += f" - {ProgressTracker.describe(self.progress)}"
+        elif self.status == "failed" and self.error:
+            text += f" - {self.error}"
+        elif self.status == "done" and self.files:
+            text += f" - {self.files[-1]}"
+        return text
+    
+    def to_dict(self) -> Dict:
+        """JSON-friendly view of the job for the HTTP API"""
+        return {
+            'id': self.id,
+            'status': self.status,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'guild_id': self.guild_id,
+            'model': self.settings.get('model'),
+            'style': self.settings.get('summary_style'),
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+            'elapsed': round(self.elapsed, 1),
+            'progress': self.progress,
+            'files': list(self.files),
+            'error': self.error,
+            'cached': self.cached,
+            'description': self.describe(),
+        }
+
+
+class JobQueue:
+    """Runs queued SummaryJobs on a few worker threads that share one ClientPool
+    
+    Overlapping date ranges reuse each other's fetched messages through the pool, and two
+    workers (JOB_CONCURRENCY) let one job fetch from Discord while another is summarizing.
+    A job with the same settings as one still running is merged into it, and one matching a
+    finished report of a range that had already ended reuses that report.
+    ``on_update`` is called with the job on every status change and progress event, and
+    ``on_log(job, message)`` with each of its log lines.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None, pool: Optional[ClientPool] = None,
+                 on_update=None, log_callback=None, stream_callback=None, on_log=None):
+        self.pool = pool or ClientPool()
+        self.on_update = on_update
+        self.on_log = on_log
+        self.log_callback = log_callback or print
+        self.stream_callback = stream_callback
+        self.jobs: Dict[int, SummaryJob] = {}
+        self._reports: Dict[str, SummaryJob] = {}  # Settings key -> finished job whose report can be reused
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._changed = threading.Condition()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or int(os.getenv('JOB_CONCURRENCY', 2)), thread_name_prefix="job"
+        )
+    
+    def submit(self, start_date: str, end_date: str, guild_id: Optional[int] = None, resume: bool = False,
+               style: Optional[str] = None, model: Optional[str] = None, refresh: bool = False,
+               max_messages: Optional[int] = None, deadline: Optional[str] = None) -> SummaryJob:
+        """Queue a report; raises ValueError for an unparseable date range
+        
+        ``style``, ``model``, ``max_messages`` and ``deadline`` override the configured ones
+        for this job. Unless ``refresh``
+        is set, identical work already running or finished is returned instead of redone.
+        """
+        job = SummaryJob(0, start_date, end_date, guild_id)
+        
+        def log(message):
+            self.log_callback(f"[#{job.id}] {message}")
+            if self.on_log:
+                self.on_log(job, message)
+        
+        def on_progress(event):
+            job.progress = event
+            self._notify(job)
+        
+        def on_stream(event):
+            if self.stream_callback:
+                self.stream_callback(dict(event, source=f"#{job.id} {event['source']}"))
+        
+        job.summarizer = DiscordDaySummarizer(
+            start_date, end_date, log_callback=log, cancel_token=job.cancel_token,
+            progress_callback=on_progress, stream_callback=on_stream, guild_id=guild_id, pool=self.pool,
+            resume=resume, deadline=deadline
+        )
+        if style:
+            job.summarizer.summary_style = style
+        if max_messages:
+            job.summarizer.max_messages = max_messages
+        if model:
+            job.summarizer.ollama.model = model
+        job.settings = job.summarizer.checkpoint_settings()
+        job.key = RunCheckpoint(job.settings).key
+        
+        with self._lock:
+            earlier = None if refresh else self._reusable(job.key)
+            if earlier and earlier.status in SummaryJob.ACTIVE:
+                return earlier
+            job.id = self._next_id
+            self._next_id += 1
+            self.jobs[job.id] = job
+        
+        if earlier:
+            job.status = "done"
+            job.cached = True
+            job.files = earlier.files
+            job.overview = earlier.overview
+            job.started = job.finished = time.time()
+            job.summarizer = None
+            log(f"♻️ Same report as job #{earlier.id}, reusing {earlier.files[-1]}")
+            self._notify(job)
+            return job
+        
+        self._notify(job)
+        self._executor.submit(self._run, job)
+        return job
+    
+    def _reusable(self, key: str) -> Optional[SummaryJob]:
+        for job in self.jobs.values():
+            if job.key == key and job.status in SummaryJob.ACTIVE:
+                return job
+        report = self._reports.get(key)
+        if report and all(os.path.exists(path) for path in report.files):
+            return report
+        return None
+    
+    def find_checkpoint(self, start_date: str, end_date: str, guild_id: Optional[int] = None) -> Optional[RunCheckpoint]:
+        """The unfinished run saved for these settings, unless a queued job is already working on it"""
+        summarizer = DiscordDaySummarizer(start_date, end_date, log_callback=lambda message: None,
+                                          guild_id=guild_id, pool=self.pool)
+        busy = {job.summarizer.checkpoint.key for job in self.active_jobs() if job.summarizer}
+        checkpoint = summarizer.checkpoint
+        if checkpoint.key in busy or not checkpoint.load():
+            return None
+        return checkpoint
+    
+    def cancel(self, job_id: int):
+        job = self.jobs.get(job_id)
+        if job and job.status in SummaryJob.ACTIVE:
+            job.cancel_token.cancel()
+            if job.status == "queued":
+                job.status = "cancelled"
+                self._notify(job)
+    
+    def cancel_all(self):
+        for job_id in list(self.jobs):
+            self.cancel(job_id)
+    
+    def active_jobs(self) -> List[SummaryJob]:
+        return [job for job in self.jobs.values() if job.status in SummaryJob.ACTIVE]
+    
+    def wait(self, jobs: List[SummaryJob], cancel_token: Optional[CancellationToken] = None) -> bool:
+        """Block until all ``jobs`` have finished; False if ``cancel_token`` fired first"""
+        with self._changed:
+            while any(job.status in SummaryJob.ACTIVE for job in jobs):
+                if cancel_token and cancel_token.is_cancelled:
+                    return False
+                self._changed.wait(0.5)
+        return True
+    
+    def _notify(self, job: SummaryJob):
+        if self.on_update:
+            self.on_update(job)
+        with self._changed:
+            self._changed.notify_all()
+    
+    def _run(self, job: SummaryJob):
+        if job.cancel_token.is_cancelled:
+            return
+        job.status = "running"
+        job.started = time.time()
+        self._notify(job)
+        try:
+            markdown_content, html_content, filename_base = job.summarizer.generate_summary()
+            if html_content:
+                job.files = job.summarizer.save_report(markdown_content, html_content, filename_base)
+                job.overview = job.summarizer.overview
+                job.status = "done"
+                # A range that had already ended when the job started can't gain messages, so its report is final
+                if not job.summarizer.failed_channels and \
+                        job.summarizer.end_date <= datetime.fromtimestamp(job.started, timezone.utc):
+                    with self._lock:
+                        self._reports[job.key] = job
+            else:
+                job.error = markdown_content
+                job.status = "failed"
+        except OperationCancelled:
+            job.status = "cancelled"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished = time.time()
+            job.summarizer = None  # Release the fetched messages; the pool keeps what others can reuse
+            self._notify(job)
+
+
+class GuildBatch:
+    """Reports for several guilds over one date range, run together on a shared JobQueue
+    
+    Every guild is a job on the same ClientPool: one Discord client (and so one rate
+    limiter) for the token, one Ollama connection under one concurrency limit, and each
+    connection check done once. The guilds fetch and summarize interleaved, so the batch
+    takes about as long as its largest guild. ``digest`` adds a cross-server digest built
+    from the reports' executive summaries.
+    """
+    
+    def __init__(self, guild_ids: List[int], start_date: Optional[str] = None, end_date: Optional[str] = None,
+                 digest: bool = False, style: Optional[str] = None, cancel_token: Optional[CancellationToken] = None,
+                 log_callback=None, max_messages: Optional[int] = None, deadline: Optional[str] = None,
+                 resume: bool = False):
+        if not guild_ids:
+            raise ValueError("No guild ids given for the batch")
+        self.guild_ids = list(dict.fromkeys(guild_ids))
+        self.start_date = start_date or 'yesterday'
+        self.end_date = end_date or self.start_date
+        self.digest = digest
+        self.style = style
+        self.max_messages = max_messages
+        self.deadline = deadline
+        self.resume = resume
+        self.cancel_token = cancel_token or CancellationToken()
+        self.log_callback = log_callback or print
+        self.queue = JobQueue(max_workers=len(self.guild_ids), log_callback=self.log_callback)
+        self.digest_files: tuple = ()
+    
+    @staticmethod
+    def parse_guild_ids(value: Optional[str] = None, path: Optional[str] = None) -> List[int]:
+        """Guild ids from a comma/space separated list and/or a file with one id per line (# comments)"""
+        tokens = (value or "").replace(',', ' ').split()
+        if path:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.split('#', 1)[0].strip()
+                    if line:
+                        tokens.append(line.split()[0])
+        bad = [token for token in tokens if not token.isdigit()]
+        if bad:
+            raise ValueError(f"Invalid guild id(s): {', '.join(bad)}")
+        return [int(token) for token in tokens]
+    
+    def run(self) -> List[SummaryJob]:
+        """Run every guild's report and the digest; returns the finished jobs"""
+        started = time.time()
+        self.log_callback(f"🏠 Batch of {len(self.guild_ids)} servers: {self.start_date} → {self.end_date}")
+        jobs = [self.queue.submit(self.start_date, self.end_date, guild_id, resume=self.resume, style=self.style,
+                                  max_messages=self.max_messages, deadline=self.deadline)
+                for guild_id in self.guild_ids]
+        if not self.queue.wait(jobs, self.cancel_token):
+            self.queue.cancel_all()
+            self.queue.wait(jobs)
+            raise OperationCancelled()
+        
+        for job in jobs:
+            if job.status == "done":
+                name = job.overview.get('guild_name', job.guild_id)
+                self.log_callback(f"✅ {name}: {job.files[-1]} ({format_eta(job.elapsed)})")
+            else:
+                self.log_callback(f"❌ Guild {job.guild_id}: {job.error or job.status}")
+        
+        done = [job for job in jobs if job.status == "done" and job.overview]
+        if self.digest:
+            if len(done) > 1:
+                self.digest_files = self.write_digest(done)
+                self.log_callback(f"🧭 Digest: {self.digest_files[-1]}")
+            else:
+                self.log_callback("🧭 Digest skipped: fewer than two servers have a report")
+        self.log_callback(f"🏁 Batch finished in {format_eta(time.time() - started)}")
+        return jobs
+    
+    def write_digest(self, jobs: List[SummaryJob]) -> tuple:
+        """Summarize the reports' executive summaries into one cross-server digest report"""
+        renderer = DiscordDaySummarizer(self.start_date, self.end_date, log_callback=self.log_callback,
+                                        cancel_token=self.cancel_token, pool=self.queue.pool)
+        sections = {}
+        for job in jobs:
+            name = job.overview['guild_name']
+            if name in sections:
+                name = f"{name} ({job.guild_id})"
+            sections[name] = {'message_count': job.overview['messages'], 'summary': job.overview['summary']}
+        
+        self.log_callback(f"🤖 Generating cross-server digest for {len(sections)} servers...")
+        digest = renderer.ollama.generate_digest(
+            {name: data['summary'] for name, data in sections.items()}, renderer.start_date, renderer.end_date
+        )
+        if digest.startswith(("Error", "Unexpected error")):
+            self.log_callback(f"⚠️ {digest}")
+            digest = renderer._extractive_overall_summary(sections)
+        
+        start_date_str = renderer.start_date.strftime('%Y-%m-%d')
+        end_date_str = renderer.end_date.strftime('%Y-%m-%d')
+        dates = start_date_str if start_date_str == end_date_str else f"{start_date_str}_to_{end_date_str}"
+        title = f"Cross-Server Digest - {start_date_str}"
+        return write_report_files(
+            renderer.create_markdown_content(title, digest, sections, start_date_str, section_prefix="🏠 "),
+            renderer.create_html_content(title, digest, sections, start_date_str, section_prefix="🏠 "),
+            f"digest_{dates}_{datetime.now().strftime('%H%M%S')}"
+        )
+
+
+class DailyBackfill:
+    """One report per day of a date range (``--per-day``), from a single fetch of the whole range
+    
+    Every channel is paged once over the full range, and each page is bucketed by the UTC
+    day of its messages' snowflakes as it arrives, so at most ``MAX_MESSAGES_PER_CHANNEL``
+    messages per channel per day are held. Once a day's bucket is full, paging jumps to the
+    midnight that starts it, so a busy day never uses up the pages meant for older days.
+    The days are then summarized concurrently on one ClientPool, and an index page links
+    all the daily reports.
+    """
+    
+    def __init__(self, start_date: Optional[str], end_date: Optional[str], style: Optional[str] = None,
+                 max_workers: Optional[int] = None, cancel_token: Optional[CancellationToken] = None,
+                 log_callback=None, max_messages: Optional[int] = None, deadline: Optional[str] = None):
+        self.cancel_token = cancel_token or CancellationToken()
+        self.log_callback = log_callback or print
+        self.pool = ClientPool()
+        self.fetcher = DiscordDaySummarizer(start_date, end_date, log_callback=self.log_callback,
+                                            cancel_token=self.cancel_token, pool=self.pool)
+        if max_messages:
+            self.fetcher.max_messages = max_messages
+        self.deadline = deadline  # One deadline for the whole backfill, shared by every day's summarizer
+        self.style = style
+        self.max_workers = max_workers or int(os.getenv('JOB_CONCURRENCY', 2))
+        start = self.fetcher.start_date
+        self.days = [(start + timedelta(days=offset)).strftime('%Y-%m-%d')
+                     for offset in range((self.fetcher.end_date - start).days + 1)
+                     if start + timedelta(days=offset) < self.fetcher.end_date]
+        self.pages = 0
+        self.index_files: tuple = ()
+    
+    def fetch_days(self) -> Dict[str, Dict[str, List[Dict]]]:
+        """Page every channel once over the whole range; returns day -> channel name -> messages"""
+        fetcher = self.fetcher
+        if fetcher.pool:
+            channels = fetcher.pool.guild_channels(fetcher.client, fetcher.guild_id)
+        else:
+            channels = fetcher.client.get_guild_channels(fetcher.guild_id)
+        per_day = fetcher.max_messages
+        buckets: Dict[str, Dict[str, List[Dict]]] = {day: {channel.get('name', 'unknown'): [] for channel in channels}
+                                                     for day in self.days}
+        self.log_callback(f"📝 Fetching {len(channels)} channels once for {len(self.days)} days "
+                          f"(up to {per_day} messages per channel per day)...")
+        
+        async def fetch(channel, semaphore):
+            name = channel.get('name', 'unknown')
+            before = fetcher.end_date
+            async with semaphore:
+                while before > fetcher.start_date:
+                    capacity = sum(per_day - len(buckets[day][name]) for day in self.days)
+                    pages = fetcher.client.async_client.iter_message_pages(
+                        int(channel.get('id', 0)), fetcher.start_date, before, capacity)
+                    full_day = None
+                    try:
+                        async for page in pages:
+                            self.pages += 1
+                            for msg in page:
+                                day = snowflake_to_datetime(msg['id']).strftime('%Y-%m-%d')
+                                bucket = buckets.get(day, {}).get(name)
+                                if bucket is None:
+                                    continue
+                                if len(bucket) >= per_day:
+                                    full_day = day
+                                    break
+                                bucket.append(msg)  # Pages are newest first, so each day keeps its newest messages
+                            if full_day:
+                                break
+                    finally:
+                        await pages.aclose()
+                    if full_day is None:
+                        break  # Reached the start of the range
+                    # The rest of this day would only be dropped: continue from the midnight that starts it
+                    day_start = datetime.strptime(full_day, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+                    if day_start >= before:
+                        break
+                    before = day_start
+        
+        async def fetch_all():
+            semaphore = asyncio.Semaphore(fetcher.fetch_concurrency)
+            await asyncio.gather(*(fetch(channel, semaphore) for channel in channels))
+        
+        run_coroutine_sync(fetch_all(), self.cancel_token)
+        total = sum(len(messages) for day in buckets.values() for messages in day.values())
+        self.log_callback(f"📊 {total} messages in {self.pages} pages, split into {len(self.days)} days")
+        return buckets
+    
+    def summarize_day(self, day: str, channel_messages: Dict[str, List[Dict]]) -> Dict:
+        """Generate and save one day's report; returns its entry for the index"""
+        summarizer = DiscordDaySummarizer(day, day, log_callback=lambda message: self.log_callback(f"[{day}] {message}"),
+                                          cancel_token=self.cancel_token, pool=self.pool, deadline=self.deadline)
+        summarizer.max_messages = self.fetcher.max_messages
+        if self.style:
+            summarizer.summary_style = self.style
+        markdown_content, html_content, filename_base = summarizer.generate_summary(channel_messages)
+        if not html_content:
+            return {'day': day, 'files': (), 'summary': markdown_content, 'messages': 0}
+        files = summarizer.save_report(markdown_content, html_content, filename_base)
+        self.log_callback(f"✅ {day}: {files[-1]}")
+        return {'day': day, 'files': files, 'summary': summarizer.overview['summary'],
+                'messages': summarizer.overview['messages']}
+    
+    def run(self) -> List[Dict]:
+        """Fetch once, summarize every day concurrently and write the index; returns the index entries"""
+        started = time.time()
+        self.log_callback(f"🗓️ Per-day reports for {self.days[0]} → {self.days[-1]} ({len(self.days)} days)")
+        if not self.fetcher.validate_config():
+            raise ValueError("Configuration validation failed")
+        buckets = self.fetch_days()
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="day") as executor:
+            futures = [executor.submit(self.summarize_day, day, buckets.pop(day)) for day in self.days]
+            try:
+                entries = [future.result() for future in futures]
+            except BaseException:
+                self.cancel_token.cancel()
+                raise
+        
+        self.index_files = self.write_index(entries)
+        self.log_callback(f"📚 Index: {self.index_files[-1]}")
+        self.log_callback(f"🏁 {len(self.days)} daily reports in {format_eta(time.time() - started)}")
+        return entries
+    
+    def write_index(self, entries: List[Dict]) -> tuple:
+        """Markdown/HTML index of the daily reports, each with its executive summary and a link"""
+        with_messages = [entry for entry in entries if entry['files']]
+        busiest = max(with_messages, key=lambda entry: entry['messages'], default=None)
+        overview = f"{len(with_messages)} of {len(entries)} days had activity, " \
+                   f"{sum(entry['messages'] for entry in entries)} messages in total."
+        if busiest:
+            overview += f"\nBusiest day: {busiest['day']} ({busiest['messages']} messages)."
+        
+        def sections(extension: str, link) -> Dict[str, Dict]:
+            return {
+                entry['day']: {
+                    'message_count': entry['messages'],
+                    'summary': f"{link(entry['files'][0 if extension == 'md' else 1])}\n{entry['summary']}"
+                    if entry['files'] else entry['summary'],
+                }
+                for entry in entries
+            }
+        
+        title = f"Daily Reports - {self.days[0]} to {self.days[-1]}"
+        return write_report_files(
+            self.fetcher.create_markdown_content(
+                title, overview, sections('md', lambda path: f"[Open report]({path})"), self.days[0], section_prefix="📅 "),
+            self.fetcher.create_html_content(
+                title, overview, sections('html', lambda path: f'<a href="{path}">Open report</a>'), self.days[0],
+                section_prefix="📅 "),
+            f"index_{self.days[0]}_to_{self.days[-1]}"
+        )
+
+
+class ReportSchedule:
+    """When the daemon runs reports, e.g. "daily 08:00" or "daily 08:00, 17:30; weekly mon 09:00"
+    
+    Entries are separated by ';'. Each is an optional ``daily`` or ``weekly <day>`` followed
+    by one or more "HH:MM" wall-clock times in ``timezone_name`` (an IANA name; default the
+    REPORT_TIMEZONE env var, else the system's local zone). Daily reports cover yesterday,
+    weekly reports the seven days before the run.
+    """
+    
+    WEEKDAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+    
+    def __init__(self, spec: str, timezone_name: Optional[str] = None):
+        self.spec = spec
+        self.tz = self._zone(timezone_name or os.getenv('REPORT_TIMEZONE'))
+        self.entries: List[Dict] = []
+        for part in filter(None, (part.strip() for part in spec.split(';'))):
+            words = part.replace(',', ' ').split()
+            weekday = None
+            if words[0].lower() == 'daily':
+                words = words[1:]
+            elif words[0].lower() == 'weekly':
+                if len(words) < 2 or words[1].lower()[:3] not in self.WEEKDAYS:
+                    raise ValueError(f"Invalid schedule entry: {part} (use 'weekly mon 09:00')")
+                weekday = self.WEEKDAYS.index(words[1].lower()[:3])
+                words = words[2:]
+            if not words:
+                raise ValueError(f"Schedule entry has no time: {part}")
+            
+            for word in words:
+                try:
+                    clock = datetime.strptime(word, '%H:%M')
+                except ValueError:
+                    raise ValueError(f"Invalid schedule time: {word} (use HH:MM)")
+                self.entries.append({'weekday': weekday, 'hour': clock.hour, 'minute': clock.minute})
+        
+        if not self.entries:
+            raise ValueError("The report schedule is empty")
+    
+    @staticmethod
+    def _zone(name: Optional[str]):
+        """The ZoneInfo for ``name``, or None for the system's local zone"""
+        if not name:
+            return None
+        if ZoneInfo is None:
+            raise ValueError("REPORT_TIMEZONE needs Python 3.9 or newer")
+        try:
+            return ZoneInfo(name)
+        except (KeyError, ValueError):  # ZoneInfoNotFoundError is a KeyError
+            raise ValueError(f"Unknown time zone: {name}")
+    
+    @staticmethod
+    def _next_for(entry: Dict, now: datetime, zone=None) -> datetime:
+        """The entry's first wall-clock time after ``now`` in ``zone`` (None: the local zone)"""
+        day = now.astimezone(zone).date()
+        if entry['weekday'] is not None:
+            day += timedelta(days=(entry['weekday'] - day.weekday()) % 7)
+        while True:
+            when = datetime.combine(day, dtime(entry['hour'], entry['minute']))
+            # Resolve the UTC offset for this date, not now's, and normalise through UTC so a
+            # time skipped by a DST change moves to the real time after it
+            when = when.replace(tzinfo=zone).astimezone(timezone.utc) if zone else when.astimezone(timezone.utc)
+            if when > now:
+                return when.astimezone(zone)
+            day += timedelta(days=1 if entry['weekday'] is None else 7)
+    
+    def next_run(self, now: Optional[datetime] = None) -> tuple:
+        """(local datetime, entry) of the first scheduled report after ``now``"""
+        now = now or datetime.now(timezone.utc)
+        return min(((self._next_for(entry, now, self.tz), entry) for entry in self.entries),
+                   key=lambda item: item[0].astimezone(timezone.utc))
+    
+    @staticmethod
+    def date_range(entry: Dict) -> tuple:
+        if entry['weekday'] is not None:
+            return "7 days ago", "yesterday"
+        return "yesterday", "yesterday"
+    
+    @classmethod
+    def describe(cls, entry: Dict) -> str:
+        clock = f"{entry['hour']:02d}:{entry['minute']:02d}"
+        if entry['weekday'] is not None:
+            return f"weekly report ({cls.WEEKDAYS[entry['weekday']]} {clock})"
+        return f"daily report ({clock})"
+
+
+class SummaryDaemon:
+    """Stays resident and runs reports on a ReportSchedule
+    
+    One ClientPool lives as long as the process, so HTTP sessions, channel lists, fetched
+    messages and channel summaries stay warm between runs. ``prewarm_minutes`` before each
+    run the daemon re-checks both connections, refreshes the channel list and loads the
+    model into Ollama, so the run itself starts hot. With ``rolling_minutes`` set, new messages
+    are summarized every that many minutes while waiting, and reports fold those partials.
+    """
+    
+    def __init__(self, schedule: ReportSchedule, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                 prewarm_minutes: float = 3, cancel_token: Optional[CancellationToken] = None, log_callback=None,
+                 rolling_minutes: float = 0):
+        self.schedule = schedule
+        self.start_date = start_date
+        self.end_date = end_date
+        self.prewarm_minutes = prewarm_minutes
+        self.rolling_minutes = rolling_minutes
+        self.cancel_token = cancel_token or CancellationToken()
+        self.log_callback = log_callback or print
+        self.pool = ClientPool()
+        self._next_roll = time.time()
+    
+    def _wait_until(self, when: datetime) -> bool:
+        """Sleep until ``when``, running rolling passes as they come due; False if cancelled first"""
+        while True:
+            remaining = (when - datetime.now(timezone.utc)).total_seconds()
+            if remaining <= 0:
+                return True
+            if self.rolling_minutes and time.time() >= self._next_roll:
+                self.roll()
+                continue
+            if self.rolling_minutes:
+                remaining = min(remaining, max(self._next_roll - time.time(), 0))
+            # Re-read the clock every minute so a suspended machine doesn't oversleep
+            if self.cancel_token.wait(min(remaining, 60)):
+                return False
+    
+    def roll(self):
+        """Summarize the messages that arrived since the last rolling pass"""
+        self._next_roll = time.time() + self.rolling_minutes * 60
+        try:
+            summarizer = DiscordDaySummarizer(log_callback=self.log_callback, cancel_token=self.cancel_token, pool=self.pool)
+            summarizer.roll_partials()
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            self.log_callback(f"⚠️ Rolling pass failed: {e}")
+    
+    def prewarm(self):
+        """Open connections, refresh channel metadata and load the model ahead of a run"""
+        started = time.time()
+        try:
+            warm = DiscordDaySummarizer(log_callback=self.log_callback, cancel_token=self.cancel_token, pool=self.pool)
+            health = health_checker.check_all(warm.client, warm.guild_id, warm.ollama.url, force=True)
+            if health['discord']['ok'] and warm.guild_id:
+                self.pool.guild_channels(warm.client, warm.guild_id)
+            # Keep the model loaded until the run starts, with some slack
+            loaded = health['ollama']['ok'] and warm.ollama.warm(keep_alive=f"{int(self.prewarm_minutes) + 5}m")
+            self.log_callback(
+                f"🔥 Pre-warmed in {time.time() - started:.1f}s "
+                f"(Discord {'✅' if health['discord']['ok'] else '❌'}, model {'✅' if loaded else '❌'})"
+            )
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            self.log_callback(f"⚠️ Pre-warm failed: {e}")
+    
+    def run_report(self, entry: Dict):
+        """Run one scheduled report; failures are logged so the daemon keeps its schedule"""
+        if self.start_date or self.end_date:
+            start_date, end_date = self.start_date, self.end_date
+        else:
+            start_date, end_date = ReportSchedule.date_range(entry)
+        self.log_callback(f"🗓️ Running scheduled {ReportSchedule.describe(entry)}: {start_date} → {end_date}")
+        try:
+            summarizer = DiscordDaySummarizer(
+                start_date, end_date, log_callback=self.log_callback, cancel_token=self.cancel_token,
+                progress_callback=cli_progress_printer(), pool=self.pool
+            )
+            markdown_content, html_content, filename_base = summarizer.generate_summary()
+            if not html_content:
+                self.log_callback(f"❌ {markdown_content}")
+                return
+            md_filename, html_filename = summarizer.save_report(markdown_content, html_content, filename_base)
+            self.log_callback(f"✅ Report saved: {md_filename}, {html_filename}")
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            self.log_callback(f"❌ Scheduled report failed: {e}")
+    
+    def run_forever(self):
+        """Run reports on schedule until the cancel token fires"""
+        self.log_callback(f"🕰️ Daemon started with schedule: {self.schedule.spec}"
+                          + (f" (rolling summaries every {self.rolling_minutes:g} minutes)" if self.rolling_minutes else ""))
+        try:
+            while True:
+                when, entry = self.schedule.next_run()
+                self.log_callback(f"⏰ Next: {ReportSchedule.describe(entry)} at {when.strftime('%a %Y-%m-%d %H:%M')}")
+                if not self._wait_until(when.astimezone(timezone.utc) - timedelta(minutes=self.prewarm_minutes)):
+                    break
+                self.prewarm()
+                if not self._wait_until(when):
+                    break
+                self.run_report(entry)
+        except OperationCancelled:
+            pass
+        self.log_callback("🛑 Daemon stopped")
+
+
 def parse_arguments():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(
@@ -962,6 +4460,12 @@ Date Format Examples:
   python day_summarizer.py --start-date "3 days ago" --end-date "yesterday"
   python day_summarizer.py --start-date today
   python day_summarizer.py (defaults to yesterday)
+  python day_summarizer.py --start-date yesterday --deadline 09:00
+  python day_summarizer.py --start-date yesterday --resume
+  python day_summarizer.py --daemon --schedule "daily 08:00; weekly mon 09:00"
+  python day_summarizer.py --daemon --rolling 60
+  python day_summarizer.py --guilds 111,222,333 --digest
+  python day_summarizer.py --start-date 2025-06-01 --end-date 2025-06-30 --per-day
 
 Supported date formats:
   • YYYY-MM-DD (e.g., 2025-07-10)
@@ -996,16 +4500,134 @@ Note: Maximum date range is 30 days.
         help='Maximum messages per channel (overrides MAX_MESSAGES_PER_CHANNEL env var)'
     )
     
-    return parser.parse_args()
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue the last unfinished run with the same settings, skipping channels it already fetched or summarized'
+    )
+    
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Stay running and generate reports on a schedule, keeping connections and caches warm'
+    )
+    
+    parser.add_argument(
+        '--schedule',
+        type=str,
+        help='Daemon schedule, e.g. "daily 08:00" or "daily 08:00, 17:30; weekly mon 09:00" '
+             '(overrides REPORT_SCHEDULE env var)'
+    )
+    
+    parser.add_argument(
+        '--rolling',
+        type=float,
+        metavar='MINUTES',
+        help='Daemon mode: summarize new messages every MINUTES so reports only fold partial summaries '
+             '(overrides ROLLING_INTERVAL_MINUTES env var)'
+    )
+    
+    parser.add_argument(
+        '--per-day',
+        action='store_true',
+        help='Write one report per day of the range (plus an index page), fetching the range only once'
+    )
+    
+    parser.add_argument(
+        '--guilds',
+        type=str,
+        help='Batch mode: comma-separated guild ids, one report each, run together'
+    )
+    
+    parser.add_argument(
+        '--guilds-file',
+        type=str,
+        help='Batch mode: file with one guild id per line'
+    )
+    
+    parser.add_argument(
+        '--digest',
+        action='store_true',
+        help='Batch mode: also write a cross-server digest of all the reports'
+    )
+    
+    parser.add_argument(
+        '--deadline',
+        type=str,
+        help='Finish the report by this local time ("HH:MM" or ISO datetime), degrading summaries if needed '
+             '(overrides RUN_DEADLINE env var)'
+    )
+    
+    args = parser.parse_args()
+    if args.per_day and args.resume:
+        parser.error("--per-day runs can't be resumed; rerun the range instead")
+    if args.per_day and (args.guilds or args.guilds_file):
+        parser.error("--per-day works on one server; it can't be combined with --guilds")
+    if args.digest and not (args.guilds or args.guilds_file):
+        parser.error("--digest needs --guilds or --guilds-file")
+    return args
+
+
+def cli_progress_printer(interval: float = 10.0):
+    """Progress callback for the CLI: prints a status line at most every ``interval`` seconds"""
+    last = {'time': 0.0, 'stage': None}
+    
+    def callback(event):
+        now = time.time()
+        if event['stage'] == last['stage'] and now - last['time'] < interval:
+            return
+        last.update(time=now, stage=event['stage'])
+        print(f"⏳ {event['fraction'] * 100:.0f}% • {ProgressTracker.describe(event)}")
+    
+    return callback
+
+
+def install_interrupt_handler(cancel_token: CancellationToken):
+    """Turn the first Ctrl-C into a cooperative cancellation; a second one force-quits"""
+    def handler(signum, frame):
+        if cancel_token.is_cancelled:
+            raise KeyboardInterrupt
+        print("\n🛑 Cancelling... (press Ctrl-C again to force quit)")
+        cancel_token.cancel()
+    
+    signal.signal(signal.SIGINT, handler)
 
 
 def main():
     args = parse_arguments()
+    cancel_token = CancellationToken()
+    install_interrupt_handler(cancel_token)
     
     try:
+        if args.daemon:
+            schedule = ReportSchedule(args.schedule or os.getenv('REPORT_SCHEDULE', 'daily 08:00'))
+            SummaryDaemon(
+                schedule, args.start_date, args.end_date,
+                prewarm_minutes=float(os.getenv('DAEMON_PREWARM_MINUTES', 3)),
+                cancel_token=cancel_token,
+                rolling_minutes=args.rolling if args.rolling is not None else float(os.getenv('ROLLING_INTERVAL_MINUTES', 0))
+            ).run_forever()
+            return
+        
+        if args.per_day:
+            DailyBackfill(args.start_date, args.end_date, style=args.style, cancel_token=cancel_token,
+                          max_messages=args.max_messages, deadline=args.deadline).run()
+            return
+        
+        if args.guilds or args.guilds_file:
+            guild_ids = GuildBatch.parse_guild_ids(args.guilds, args.guilds_file)
+            GuildBatch(guild_ids, args.start_date, args.end_date, digest=args.digest, style=args.style,
+                       cancel_token=cancel_token, max_messages=args.max_messages, deadline=args.deadline,
+                       resume=args.resume).run()
+            return
+        
         summarizer = DiscordDaySummarizer(
             start_date=args.start_date,
-            end_date=args.end_date
+            end_date=args.end_date,
+            deadline=args.deadline,
+            cancel_token=cancel_token,
+            progress_callback=cli_progress_printer(),
+            resume=args.resume
         )
         
         # Override settings from command line if provided
@@ -1019,7 +4641,7 @@ def main():
     except ValueError as e:
         print(f"❌ Configuration error: {e}")
         print("\nUse --help for usage information")
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, OperationCancelled):
         print("\n🛑 Operation cancelled by user")
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
@@ -0,0 +1,74 @@
+"""
+Background asyncio engine for the Discord Day Summarizer GUI
+GUI actions run as coroutines on the same long-lived loop that owns the async Discord and
+Ollama clients (day_summarizer.background_loop), awaiting them directly. The GUI submits
+coroutines and gets results back through thread-safe callbacks, instead of starting a new
+thread (and new connections) for every button press.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from day_summarizer import ClientPool, CancellationToken, background_loop, health_checker
+
+
+class AsyncEngine:
+    """The shared client pool plus the loop its async clients live on
+
+    ``submit`` schedules a coroutine from any thread and returns a concurrent Future;
+    its optional ``callback(result, error)`` runs on the loop thread, so GUI callers
+    should only touch thread-safe state there (e.g. put onto their UI queue).
+    Model pulls (a resumable requests download) and the GUI's checkpoint lookups block, so
+    they go through a small executor owned by the engine.
+    """
+
+    def __init__(self, blocking_workers: int = 2):
+        self.pool = ClientPool()
+        self.loop = background_loop()
+        self._blocking = ThreadPoolExecutor(max_workers=blocking_workers, thread_name_prefix="engine-pull")
+
+    def submit(self, coro, callback=None):
+        """Schedule a coroutine on the engine loop; ``callback(result, error)`` runs when it finishes"""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        if callback:
+            def done(fut):
+                if fut.cancelled():
+                    callback(None, asyncio.CancelledError())
+                elif fut.exception() is not None:
+                    callback(None, fut.exception())
+                else:
+                    callback(fut.result(), None)
+            future.add_done_callback(done)
+        return future
+
+    async def run_blocking(self, func, *args, **kwargs):
+        """Await a blocking call on the engine's executor"""
+        return await self.loop.run_in_executor(self._blocking, functools.partial(func, *args, **kwargs))
+
+    # GUI actions
+
+    async def check_connections(self, token: str, guild_id: Optional[int], ollama_url: str,
+                                force: bool = False) -> Dict[str, Dict]:
+        """Discord and Ollama health, probed in parallel through the shared health checker"""
+        client = self.pool.discord(token) if token and guild_id else None
+        return await health_checker.check_all_async(client, guild_id, ollama_url, force)
+
+    async def list_models(self, ollama_url: str, force: bool = True) -> Dict:
+        return await health_checker.check_ollama_async(ollama_url, force)
+
+    async def pull_model(self, ollama_url: str, model_name: str, progress_callback=None,
+                         cancel_token: Optional[CancellationToken] = None) -> bool:
+        client = self.pool.ollama(ollama_url, model_name)
+        success = await self.run_blocking(client.download_model, model_name, progress_callback, cancel_token)
+        if success:
+            health_checker.invalidate('ollama')
+        return success
+
+    async def pending_pulls(self, ollama_url: str) -> List[str]:
+        return self.pool.ollama(ollama_url, "").pending_pulls()
+
+    def shutdown(self):
+        """Release the pull executor (pending actions are abandoned; the loop is a daemon thread)"""
+        self._blocking.shutdown(wait=False)
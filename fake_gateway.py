@@ -0,0 +1,162 @@
+"""
+Local fake Discord gateway for trying the gateway listener offline
+Speaks enough of the gateway protocol for gateway.py (HELLO, IDENTIFY/READY, RESUME/RESUMED
+with event replay, heartbeats) and lets you inject traffic over plain HTTP:
+
+    POST /inject   {"t": "MESSAGE_CREATE", "d": {...}}     dispatch one event to every connection
+    POST /chatter  {"channel_id": "123", "count": 10}      dispatch synthetic MESSAGE_CREATEs
+    POST /drop     {"resumable": true}                     drop every connection (invalidating sessions if false)
+
+Usage: python fake_gateway.py [--port 8770] [--guild-id 1] [--chatter-channel 123 --chatter-every 5]
+Then run the listener with GATEWAY_URL=ws://127.0.0.1:8770/ (and REST pointed wherever gaps should come from).
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from aiohttp import WSMsgType, web
+
+from day_summarizer import datetime_to_snowflake
+
+DISPATCH, HEARTBEAT, IDENTIFY, RESUME, RECONNECT, INVALID_SESSION, HELLO, HEARTBEAT_ACK = 0, 1, 2, 6, 7, 9, 10, 11
+
+
+class FakeGateway:
+    """In-memory gateway: every session keeps its dispatched events so a RESUME can replay them"""
+
+    def __init__(self, guild_id: str, heartbeat_ms: int = 41250):
+        self.guild_id = guild_id
+        self.heartbeat_ms = heartbeat_ms
+        self.sessions: Dict[str, List[Dict]] = {}  # session_id -> dispatched payloads (seq = index + 1)
+        self.connections: Dict[web.WebSocketResponse, str] = {}
+        self._counter = itertools.count()
+
+    def new_message(self, channel_id: str, content: str = None) -> Dict:
+        now = datetime.now(timezone.utc)
+        count = next(self._counter)
+        return {
+            'id': str(datetime_to_snowflake(now) + count % (1 << 22)),
+            'channel_id': str(channel_id),
+            'guild_id': self.guild_id,
+            'timestamp': now.isoformat().replace('+00:00', 'Z'),
+            'author': {'id': str(100 + count % 5), 'username': f"user{count % 5}"},
+            'content': content or f"chatter message {count}",
+            'mentions': [],
+        }
+
+    async def dispatch(self, event: str, data: Dict):
+        """Record the event in every session (connected or not) and send it to live connections"""
+        for session_id, history in self.sessions.items():
+            history.append({'op': DISPATCH, 't': event, 'd': data, 's': len(history) + 1})
+        for ws, session_id in list(self.connections.items()):
+            if session_id and not ws.closed:
+                await ws.send_json(self.sessions[session_id][-1])
+
+    async def websocket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections[ws] = None
+        await ws.send_json({'op': HELLO, 'd': {'heartbeat_interval': self.heartbeat_ms}})
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                payload = json.loads(msg.data)
+                op, data = payload.get('op'), payload.get('d') or {}
+                if op == HEARTBEAT:
+                    await ws.send_json({'op': HEARTBEAT_ACK})
+                elif op == IDENTIFY:
+                    session_id = uuid.uuid4().hex
+                    self.sessions[session_id] = []
+                    self.connections[ws] = session_id
+                    host = request.host
+                    await self.dispatch_to(ws, 'READY', {
+                        'v': 10, 'session_id': session_id, 'resume_gateway_url': f"ws://{host}/",
+                        'user': {'id': '1', 'username': 'me'}, 'guilds': [{'id': self.guild_id}],
+                    })
+                elif op == RESUME:
+                    history = self.sessions.get(data.get('session_id'))
+                    if history is None:
+                        await ws.send_json({'op': INVALID_SESSION, 'd': False})
+                        continue
+                    self.connections[ws] = data['session_id']
+                    for event in history[(data.get('seq') or 0):]:
+                        await ws.send_json(event)
+                    await self.dispatch_to(ws, 'RESUMED', {})
+        finally:
+            self.connections.pop(ws, None)
+        return ws
+
+    async def dispatch_to(self, ws: web.WebSocketResponse, event: str, data: Dict):
+        history = self.sessions[self.connections[ws]]
+        history.append({'op': DISPATCH, 't': event, 'd': data, 's': len(history) + 1})
+        await ws.send_json(history[-1])
+
+    async def inject(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        data = dict(body.get('d') or {})
+        data.setdefault('guild_id', self.guild_id)
+        await self.dispatch(body['t'], data)
+        return web.json_response({'ok': True})
+
+    async def chatter(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        messages = [self.new_message(body['channel_id']) for _ in range(int(body.get('count', 1)))]
+        for message in messages:
+            await self.dispatch('MESSAGE_CREATE', message)
+        return web.json_response({'ok': True, 'ids': [message['id'] for message in messages]})
+
+    async def drop(self, request: web.Request) -> web.Response:
+        body = await request.json() if request.can_read_body else {}
+        if not body.get('resumable', True):
+            self.sessions.clear()
+        for ws in list(self.connections):
+            await ws.close(code=4000)
+        return web.json_response({'ok': True})
+
+
+async def periodic_chatter(gateway: FakeGateway, channel_id: str, every: float):
+    while True:
+        await asyncio.sleep(every * random.uniform(0.5, 1.5))
+        await gateway.dispatch('MESSAGE_CREATE', gateway.new_message(channel_id))
+
+
+def create_app(guild_id: str = "1", heartbeat_ms: int = 41250) -> web.Application:
+    gateway = FakeGateway(guild_id, heartbeat_ms)
+    app = web.Application()
+    app['gateway'] = gateway
+    app.router.add_get('/', gateway.websocket)
+    app.router.add_post('/inject', gateway.inject)
+    app.router.add_post('/chatter', gateway.chatter)
+    app.router.add_post('/drop', gateway.drop)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Discord gateway for offline testing")
+    parser.add_argument('--port', type=int, default=8770)
+    parser.add_argument('--guild-id', default="1")
+    parser.add_argument('--heartbeat-ms', type=int, default=41250, help='Heartbeat interval sent in HELLO')
+    parser.add_argument('--chatter-channel', help='Channel to post synthetic messages to periodically')
+    parser.add_argument('--chatter-every', type=float, default=5.0, help='Average seconds between chatter messages')
+    args = parser.parse_args()
+
+    app = create_app(args.guild_id, args.heartbeat_ms)
+    if args.chatter_channel:
+        async def start_chatter(app):
+            app['chatter'] = asyncio.create_task(
+                periodic_chatter(app['gateway'], args.chatter_channel, args.chatter_every))
+        app.on_startup.append(start_chatter)
+
+    print(f"🧪 Fake gateway on ws://127.0.0.1:{args.port}/ (guild {args.guild_id})")
+    web.run_app(app, host='127.0.0.1', port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+Gateway listener for the Discord Day Summarizer
+Stays connected to the Discord gateway and writes every MESSAGE_CREATE/UPDATE/DELETE of the
+guild into the local message store, together with the time ranges it was connected for.
+Reports over a captured range then read the store instead of paging REST history; REST is
+only used to fill the gaps left by disconnects the gateway could not resume.
+
+Usage: python gateway.py [--guild-id ID] [--backfill-today]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+import aiohttp
+from dotenv import load_dotenv
+
+from day_summarizer import (AsyncDiscordHTTPClient, DiscordAPIError, MessageStore, new_client_session,
+                            snowflake_to_datetime)
+
+load_dotenv()
+
+# Gateway opcodes
+DISPATCH, HEARTBEAT, IDENTIFY, RESUME, RECONNECT, INVALID_SESSION, HELLO, HEARTBEAT_ACK = 0, 1, 2, 6, 7, 9, 10, 11
+
+INTENTS = (1 << 0) | (1 << 9) | (1 << 15)  # GUILDS | GUILD_MESSAGES | MESSAGE_CONTENT
+
+# Close codes after which reconnecting cannot help (bad token, bad intents, ...)
+FATAL_CLOSE_CODES = {4004, 4010, 4011, 4012, 4013, 4014}
+
+
+class GatewayClosed(Exception):
+    """The gateway connection ended; ``resumable`` says whether the session can be resumed"""
+
+    def __init__(self, message: str, resumable: bool = True, code: Optional[int] = None):
+        super().__init__(message)
+        self.resumable = resumable
+        self.code = code
+
+
+class GatewayListener:
+    """Keeps one gateway session alive and mirrors the guild's messages into a MessageStore
+
+    Coverage is recorded up to each heartbeat ACK. A resumed session replays the events it
+    missed, so coverage simply continues; after a fresh IDENTIFY the time since the last
+    covered moment is backfilled over REST before it is marked as covered.
+    """
+
+    MAX_RECONNECT_DELAY = 60.0
+
+    def __init__(self, token: str, guild_id: int, store: MessageStore, gateway_url: Optional[str] = None,
+                 log_callback=None, backfill_since: Optional[datetime] = None, max_messages: int = 1000):
+        self.token = token.strip().strip('"\'')
+        self.guild_id = guild_id
+        self.store = store
+        self.gateway_url = gateway_url or os.getenv('GATEWAY_URL')
+        self.log_callback = log_callback or print
+        self.max_messages = max_messages
+        self.rest = AsyncDiscordHTTPClient(self.token)
+
+        # Resume state of the current session
+        self.session_id: Optional[str] = None
+        self.resume_url: Optional[str] = None
+        self.sequence: Optional[int] = None
+
+        # Coverage: the current unbroken capture started at covered_since and is recorded up to last_covered
+        self.covered_since: Optional[datetime] = None
+        self.last_covered: Optional[datetime] = backfill_since or self._previous_coverage_end()
+        self.events = 0
+        self._established = False  # READY or RESUMED received on the current connection
+        self._stopping = asyncio.Event()
+        self._backfills: set = set()
+
+    def _previous_coverage_end(self) -> Optional[datetime]:
+        """End of what an earlier listener run captured, if recent enough to backfill the gap"""
+        coverage = self.store.coverage(self.guild_id)
+        max_gap = timedelta(hours=float(os.getenv('GATEWAY_MAX_BACKFILL_HOURS', 24)))
+        if coverage and datetime.now(timezone.utc) - coverage[-1][1] <= max_gap:
+            return coverage[-1][1]
+        return None
+
+    async def _resolve_gateway_url(self) -> str:
+        if not self.gateway_url:
+            status, data = await self.rest.request("GET", "/gateway")
+            if status != 200 or not data:
+                raise GatewayClosed(f"Could not look up the gateway URL: HTTP {status}")
+            self.gateway_url = data['url']
+        return self.gateway_url
+
+    def stop(self):
+        self._stopping.set()
+
+    async def run(self):
+        """Connect, and reconnect with backoff, until ``stop`` is called"""
+        session = new_client_session()
+        delay = 1.0
+        try:
+            while not self._stopping.is_set():
+                self._established = False
+                try:
+                    await self._connect(session)
+                except GatewayClosed as e:
+                    if self._established:
+                        delay = 1.0  # Only back off while connections keep failing
+                    if e.code in FATAL_CLOSE_CODES:
+                        self.log_callback(f"❌ Gateway refused the connection ({e.code}): {e}")
+                        return
+                    if not e.resumable:
+                        self.session_id = self.sequence = self.resume_url = None
+                    self.log_callback(f"🔌 Gateway disconnected: {e} "
+                                      f"({'resuming' if self.session_id else 'new session'} in {delay:.0f}s)")
+                except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                    if self._established:
+                        delay = 1.0
+                    self.log_callback(f"🔌 Gateway connection failed: {e} (retrying in {delay:.0f}s)")
+                if self._stopping.is_set():
+                    break
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), delay * random.uniform(0.8, 1.2))
+                except asyncio.TimeoutError:
+                    pass
+                delay = min(delay * 2, self.MAX_RECONNECT_DELAY)
+        finally:
+            for task in self._backfills:
+                task.cancel()
+            await asyncio.gather(*self._backfills, return_exceptions=True)
+            await session.close()
+            await self.rest.close()
+            self.log_callback(f"👋 Gateway listener stopped after {self.events} message events")
+
+    async def _connect(self, session: aiohttp.ClientSession):
+        url = self.resume_url if self.session_id and self.resume_url else await self._resolve_gateway_url()
+        separator = '&' if '?' in url else '?'
+        async with session.ws_connect(f"{url}{separator}v=10&encoding=json", max_msg_size=0) as ws:
+            hello = await ws.receive_json(timeout=30)
+            if hello.get('op') != HELLO:
+                raise GatewayClosed(f"Expected HELLO, got op {hello.get('op')}")
+            interval = hello['d']['heartbeat_interval'] / 1000
+            acked = asyncio.Event()
+            acked.set()
+            heartbeat = asyncio.create_task(self._heartbeat(ws, interval, acked))
+            stop_waiter = asyncio.create_task(self._stopping.wait())
+            try:
+                await self._identify(ws)
+                while True:
+                    receive = asyncio.create_task(ws.receive())
+                    done, _ = await asyncio.wait({receive, stop_waiter, heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+                    if stop_waiter in done:
+                        receive.cancel()
+                        self._extend_coverage()
+                        await ws.close()
+                        return
+                    if heartbeat in done:
+                        receive.cancel()
+                        heartbeat.result()  # Raises the zombie-connection GatewayClosed
+                    msg = receive.result()
+                    if msg.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSING, aiohttp.WSMsgType.CLOSED,
+                                    aiohttp.WSMsgType.ERROR):
+                        code = ws.close_code
+                        raise GatewayClosed(f"closed with code {code}", resumable=code not in (1000, 1001), code=code)
+                    if msg.type == aiohttp.WSMsgType.TEXT:
+                        await self._handle(ws, json.loads(msg.data), acked)
+            finally:
+                heartbeat.cancel()
+                stop_waiter.cancel()
+
+    async def _heartbeat(self, ws, interval: float, acked: asyncio.Event):
+        await asyncio.sleep(interval * random.random())  # Jitter the first beat, as the gateway asks
+        while True:
+            if not acked.is_set():
+                await ws.close(code=4000)
+                raise GatewayClosed("no heartbeat ACK (zombie connection)")
+            acked.clear()
+            await ws.send_json({'op': HEARTBEAT, 'd': self.sequence})
+            await asyncio.sleep(interval)
+
+    async def _identify(self, ws):
+        if self.session_id:
+            await ws.send_json({'op': RESUME, 'd': {
+                'token': self.token, 'session_id': self.session_id, 'seq': self.sequence
+            }})
+        else:
+            await ws.send_json({'op': IDENTIFY, 'd': {
+                'token': self.token,
+                'intents': INTENTS,
+                'properties': {'os': os.name, 'browser': 'DaySummarizer', 'device': 'DaySummarizer'},
+            }})
+
+    async def _handle(self, ws, payload: Dict, acked: asyncio.Event):
+        op = payload.get('op')
+        if payload.get('s') is not None:
+            self.sequence = payload['s']
+
+        if op == HEARTBEAT_ACK:
+            acked.set()
+            self._extend_coverage()
+        elif op == HEARTBEAT:
+            await ws.send_json({'op': HEARTBEAT, 'd': self.sequence})
+        elif op == RECONNECT:
+            raise GatewayClosed("gateway asked to reconnect")
+        elif op == INVALID_SESSION:
+            raise GatewayClosed("session invalidated", resumable=bool(payload.get('d')))
+        elif op == DISPATCH:
+            self._dispatch(payload.get('t'), payload.get('d') or {})
+
+    def _dispatch(self, event: str, data: Dict):
+        if event == 'READY':
+            self.session_id = data.get('session_id')
+            self.resume_url = data.get('resume_gateway_url')
+            self._established = True
+            ready_at = datetime.now(timezone.utc)
+            self.log_callback(f"📡 Gateway session started, capturing guild {self.guild_id}")
+            gap_start, self.covered_since = self.last_covered, ready_at
+            if gap_start and gap_start < ready_at:
+                task = asyncio.create_task(self._backfill(gap_start, ready_at))
+                self._backfills.add(task)
+                task.add_done_callback(self._backfills.discard)
+            return
+        if event == 'RESUMED':
+            self.log_callback("📡 Gateway session resumed (missed events replayed)")
+            self._established = True
+            if self.covered_since is None:
+                self.covered_since = self.last_covered or datetime.now(timezone.utc)
+            return
+
+        if str(data.get('guild_id')) != str(self.guild_id):
+            return
+        if event in ('MESSAGE_CREATE', 'MESSAGE_UPDATE'):
+            self.store.save_message(data, self.guild_id)
+        elif event == 'MESSAGE_DELETE':
+            self.store.delete_messages([data['id']])
+        elif event == 'MESSAGE_DELETE_BULK':
+            self.store.delete_messages(data.get('ids', []))
+        else:
+            return
+        self.events += 1
+
+    def _extend_coverage(self):
+        if self.covered_since is None:
+            return
+        now = datetime.now(timezone.utc)
+        self.store.add_coverage(self.guild_id, self.covered_since, now)
+        self.last_covered = now
+
+    async def _backfill(self, after: datetime, before: datetime):
+        """Page REST history for [after, before] (time the listener was not connected) into the store"""
+        self.log_callback(f"📥 Backfilling {after.strftime('%Y-%m-%d %H:%M')} to {before.strftime('%H:%M')} UTC over REST...")
+        # A failed fetch leaves the gap uncovered: reports then fetch it over REST themselves
+        channels = await self.rest.get_guild_channels(self.guild_id)
+        if not channels:
+            self.log_callback("⚠️ Backfill failed: could not list the guild's channels")
+            return
+        try:
+            fetched = await self.rest.get_many_channel_messages(
+                [int(channel['id']) for channel in channels], after, before, self.max_messages, raise_errors=True
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError, DiscordAPIError) as e:
+            self.log_callback(f"⚠️ Backfill failed: {e}")
+            return
+        total = 0
+        covered_start = after
+        for channel_id, messages in fetched.items():
+            self.store.save_messages([dict(msg, channel_id=msg.get('channel_id', str(channel_id))) for msg in messages],
+                                     self.guild_id)
+            total += len(messages)
+            if len(messages) >= self.max_messages:
+                # Truncated at the message limit: only the part newer than its oldest message is complete
+                covered_start = max(covered_start, min(snowflake_to_datetime(msg['id']) for msg in messages))
+        self.store.add_coverage(self.guild_id, covered_start, before)
+        self.log_callback(f"📥 Backfilled {total} messages from {len(channels)} channels")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Discord Day Summarizer - gateway listener")
+    parser.add_argument('--guild-id', type=int, default=int(os.getenv('GUILD_ID') or 0) or None,
+                        help='Guild to capture (overrides GUILD_ID env var)')
+    parser.add_argument('--gateway-url', help='Gateway URL (overrides GATEWAY_URL env var; looked up by default)')
+    parser.add_argument('--backfill-today', action='store_true',
+                        help='Fetch the messages since midnight UTC over REST first, so today is fully covered')
+    args = parser.parse_args()
+
+    token = os.getenv('DISCORD_TOKEN')
+    if not token or not args.guild_id:
+        print("❌ DISCORD_TOKEN and GUILD_ID (or --guild-id) are required")
+        raise SystemExit(1)
+
+    backfill_since = None
+    if args.backfill_today:
+        backfill_since = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    store = MessageStore()
+    listener = GatewayListener(
+        token, args.guild_id, store, gateway_url=args.gateway_url, backfill_since=backfill_since,
+        max_messages=int(os.getenv('MAX_MESSAGES_PER_CHANNEL', 1000))
+    )
+    print(f"📡 Writing guild {args.guild_id} messages to {store.path} (Ctrl+C to stop)")
+    try:
+        asyncio.run(listener.run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
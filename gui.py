@@ -3,34 +3,135 @@ Modern Discord Day Summarizer GUI
 Beautiful, sleek interface using CustomTkinter - looks exactly like modern Discord!
 """
 
+import time
+STARTUP_T0 = time.perf_counter()
+STARTUP_TIMES = {}  # Startup phase -> seconds, printed by --startup-profile
+
 import customtkinter as ctk
+STARTUP_TIMES['import customtkinter'] = time.perf_counter() - STARTUP_T0
+
 import tkinter as tk
 from tkinter import messagebox, filedialog
+import argparse
+import json
 import os
+import queue
 import threading
-import time
-import webbrowser
 from datetime import datetime
 from dotenv import load_dotenv
-from day_summarizer import DiscordDaySummarizer, OllamaClient, DiscordHTTPClient
+STARTUP_TIMES['import stdlib + dotenv'] = time.perf_counter() - STARTUP_T0 - sum(STARTUP_TIMES.values())
 
 # Load environment variables
 load_dotenv()
 
+# day_summarizer pulls in requests and friends; it is imported on first use, off the paint path
+STARTUP_TARGET_SECONDS = 1.0
+PROFILE_STARTUP = False
+_summarizer = None
+_summarizer_lock = threading.Lock()
+
+def summarizer_module():
+    """Import day_summarizer on first use and remember how long it took"""
+    global _summarizer
+    with _summarizer_lock:
+        if _summarizer is None:
+            started = time.perf_counter()
+            import day_summarizer
+            STARTUP_TIMES['import day_summarizer (deferred)'] = time.perf_counter() - started
+            if PROFILE_STARTUP:
+                print(f"⏱️ import day_summarizer (deferred): {STARTUP_TIMES['import day_summarizer (deferred)'] * 1000:.0f} ms")
+            _summarizer = day_summarizer
+    return _summarizer
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_engine():
+    """Start the background asyncio engine on first use (blocks while day_summarizer imports)"""
+    global _engine
+    summarizer_module()
+    with _engine_lock:
+        if _engine is None:
+            from engine import AsyncEngine
+            _engine = AsyncEngine()
+    return _engine
+
+def gui_state_path():
+    return os.path.join(os.getenv('CACHE_DIR', '.summarizer_cache'), 'gui_state.json')
+
+def load_gui_state():
+    """Last known model list and connection status, shown before any network check runs"""
+    try:
+        with open(gui_state_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_gui_state(state):
+    try:
+        path = gui_state_path()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
 # Set appearance mode and color theme
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
+# Log lines and progress updates are queued by worker threads and applied in one batch per tick
+UI_TICK_MS = 100
+LOG_MAX_LINES = 1000  # Lines kept in each log textbox; the full log goes to LOG_FILE
+LOG_FILE = os.getenv('GUI_LOG_FILE', 'summarizer_gui.log')
+PREVIEW_MAX_CHARS = 2000  # Tail of the streamed summary shown in the live preview
+
+def format_age(seconds):
+    if seconds < 60:
+        return f"{int(max(seconds, 0))}s"
+    if seconds < 3600:
+        return f"{int(seconds // 60)}m"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)}h"
+    return f"{int(seconds // 86400)}d"
+
+def format_health(health):
+    """One-line status bar text for cached or live health check results"""
+    return "   ".join(
+        f"{'🟢' if entry['ok'] else '🔴'} {kind.capitalize()}: {entry.get('detail') or ''}"
+        for kind, entry in sorted(health.items())
+    )
+
 class ModernDiscordSummarizerGUI:
     def __init__(self):
         self.root = ctk.CTk()
         self.root.title("Discord Day Summarizer")
-        self.root.geometry("900x700")
+        self.root.geometry("900x930")
         self.root.iconbitmap() if hasattr(self.root, 'iconbitmap') else None
         
         # Variables
-        self.is_running = False
-        self.current_thread = None
+        self.job_queue = None  # Created on first use; shares clients and fetched messages between jobs
+        self.job_rows = {}
+        self.finished_jobs = set()
+        
+        # Thread-safe UI update pipeline
+        self.ui_queue = queue.Queue()
+        self.pending_progress = None
+        self.log_line_counts = {}
+        
+        # Live preview state (only touched on the UI thread)
+        self.preview_texts = {}
+        self.preview_stats = {}
+        self.preview_source = None
+        self.channel_timings = []
+        
+        # Model downloads in progress
+        self.active_pulls = set()
+        
+        # Engine actions requested while the engine is still booting
+        self.engine_actions = []
         
         # Color scheme (Discord-like)
         self.colors = {
@@ -46,14 +147,53 @@ class ModernDiscordSummarizerGUI:
             'text_muted': '#72767d'
         }
         
-        # Create the interface
+        # Cached model list / connection status from the previous session
+        self.gui_state = load_gui_state()
+        self.startup_visible = None
+        
+        # Paint the dashboard first; the settings tab and network checks follow once idle
+        started = time.perf_counter()
         self.create_interface()
+        STARTUP_TIMES['build window + dashboard'] = time.perf_counter() - started
+        self.root.after(UI_TICK_MS, self.drain_ui_queue)
+        self.root.bind("<Map>", self.on_first_map, add="+")
         
-        # Check initial config
+        # Check initial config (environment only, no network)
         self.check_configuration()
+        self.show_cached_connection_status()
+        
+        self.root.after_idle(self.finish_startup)
+    
+    def finish_startup(self):
+        """Build the settings tab and start background checks after the first paint"""
+        started = time.perf_counter()
+        self.setup_settings_tab()
+        STARTUP_TIMES['build settings tab (deferred)'] = time.perf_counter() - started
         
-        # Load initial models
-        self.refresh_models()
+        cached_models = self.gui_state.get('models')
+        if cached_models:
+            self.model_dropdown.configure(values=cached_models)
+        
+        # Imports day_summarizer in the background, then checks Discord and Ollama in parallel;
+        # a run started within HEALTH_CHECK_TTL reuses these results instead of probing again
+        self.run_health_check()
+        self.resume_pending_pulls()
+    
+    def on_first_map(self, event):
+        """Record when the main window first became visible"""
+        if event.widget is not self.root or self.startup_visible is not None:
+            return
+        self.startup_visible = time.perf_counter() - STARTUP_T0
+        if PROFILE_STARTUP:
+            self.root.after_idle(self.print_startup_profile)
+    
+    def print_startup_profile(self):
+        print("⏱️ Startup profile")
+        for phase, seconds in STARTUP_TIMES.items():
+            print(f"   {phase:<34} {seconds * 1000:7.0f} ms")
+        verdict = "✅" if self.startup_visible <= STARTUP_TARGET_SECONDS else "⚠️"
+        print(f"{verdict} Window visible after {self.startup_visible * 1000:.0f} ms "
+              f"(target {STARTUP_TARGET_SECONDS * 1000:.0f} ms)")
     
     def create_interface(self):
         """Create the modern interface"""
@@ -62,16 +202,15 @@ class ModernDiscordSummarizerGUI:
         self.main_frame.pack(fill="both", expand=True, padx=0, pady=0)
         
         # Create tabview
-        self.tabview = ctk.CTkTabview(self.main_frame, width=860, height=650)
+        self.tabview = ctk.CTkTabview(self.main_frame, width=860, height=880)
         self.tabview.pack(fill="both", expand=True, padx=20, pady=20)
         
         # Add tabs
         self.tab_main = self.tabview.add("📊 Dashboard")
         self.tab_settings = self.tabview.add("⚙️ Settings")
         
-        # Setup tabs
+        # Setup tabs (the settings tab is filled in by finish_startup)
         self.setup_dashboard_tab()
-        self.setup_settings_tab()
     
     def setup_dashboard_tab(self):
         """Setup the main dashboard tab"""
@@ -109,6 +248,14 @@ class ModernDiscordSummarizerGUI:
         )
         self.status_label.pack(side="left", padx=(10, 0))
         
+        self.connection_label = ctk.CTkLabel(
+            status_inner,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color=self.colors['text_secondary']
+        )
+        self.connection_label.pack(side="right")
+        
         # Quick actions section
         quick_frame = ctk.CTkFrame(self.tab_main, height=100, corner_radius=12)
         quick_frame.pack(fill="x", padx=15, pady=5)
@@ -190,6 +337,17 @@ class ModernDiscordSummarizerGUI:
         self.end_date_entry.pack(fill="x", pady=(5, 0))
         self.end_date_entry.insert(0, "today")
         
+        # Guild override (blank = the server from Settings)
+        guild_frame = ctk.CTkFrame(date_inputs_frame, fg_color="transparent")
+        guild_frame.pack(side="left", fill="x", padx=(10, 0))
+        
+        ctk.CTkLabel(guild_frame, text="Guild ID:", font=ctk.CTkFont(size=12, weight="bold")).pack(anchor="w")
+        self.job_guild_entry = ctk.CTkEntry(
+            guild_frame, placeholder_text="from Settings", width=170,
+            height=35, font=ctk.CTkFont(size=12)
+        )
+        self.job_guild_entry.pack(fill="x", pady=(5, 0))
+        
         # Action buttons section
         action_frame = ctk.CTkFrame(self.tab_main, height=80, corner_radius=12)
         action_frame.pack(fill="x", padx=15, pady=5)
@@ -199,14 +357,14 @@ class ModernDiscordSummarizerGUI:
         action_inner.pack(expand=True, fill="both", padx=15, pady=15)
         
         self.start_button = ctk.CTkButton(
-            action_inner, text="🚀 Generate Summary", width=150, height=40,
+            action_inner, text="🚀 Queue Summary", width=150, height=40,
             command=self.start_summary, font=ctk.CTkFont(size=14, weight="bold"),
             fg_color=self.colors['success'], hover_color="#2d7d32"
         )
         self.start_button.pack(side="left", padx=(0, 10))
         
         self.cancel_button = ctk.CTkButton(
-            action_inner, text="❌ Cancel", width=100, height=40,
+            action_inner, text="❌ Cancel All", width=110, height=40,
             command=self.cancel_summary, font=ctk.CTkFont(size=14, weight="bold"),
             fg_color=self.colors['danger'], hover_color="#c62828", state="disabled"
         )
@@ -218,6 +376,24 @@ class ModernDiscordSummarizerGUI:
         )
         self.folder_button.pack(side="right")
         
+        # Job queue section
+        jobs_frame = ctk.CTkFrame(self.tab_main, corner_radius=12)
+        jobs_frame.pack(fill="x", padx=15, pady=5)
+        
+        ctk.CTkLabel(
+            jobs_frame,
+            text="Job Queue",
+            font=ctk.CTkFont(size=16, weight="bold")
+        ).pack(pady=(10, 0))
+        
+        self.jobs_list = ctk.CTkScrollableFrame(jobs_frame, height=80, fg_color="transparent")
+        self.jobs_list.pack(fill="x", padx=15, pady=(0, 10))
+        self.jobs_empty_label = ctk.CTkLabel(
+            self.jobs_list, text="No jobs yet - queue one or more date ranges above",
+            font=ctk.CTkFont(size=12), text_color=self.colors['text_muted']
+        )
+        self.jobs_empty_label.pack()
+        
         # Progress section
         progress_frame = ctk.CTkFrame(self.tab_main, height=100, corner_radius=12)
         progress_frame.pack(fill="x", padx=15, pady=5)
@@ -238,6 +414,39 @@ class ModernDiscordSummarizerGUI:
         )
         self.progress_label.pack(pady=(5, 15))
         
+        # Live preview section
+        preview_frame = ctk.CTkFrame(self.tab_main, height=160, corner_radius=12)
+        preview_frame.pack(fill="x", padx=15, pady=5)
+        preview_frame.pack_propagate(False)
+        
+        preview_header = ctk.CTkFrame(preview_frame, fg_color="transparent")
+        preview_header.pack(fill="x", padx=15, pady=(10, 5))
+        
+        ctk.CTkLabel(
+            preview_header,
+            text="Live Preview",
+            font=ctk.CTkFont(size=16, weight="bold")
+        ).pack(side="left")
+        
+        self.preview_source_label = ctk.CTkLabel(
+            preview_header, text="", font=ctk.CTkFont(size=12),
+            text_color=self.colors['text_secondary']
+        )
+        self.preview_source_label.pack(side="left", padx=(10, 0))
+        
+        self.preview_textbox = ctk.CTkTextbox(
+            preview_frame, height=70,
+            font=ctk.CTkFont(family="Consolas", size=11),
+            wrap="word"
+        )
+        self.preview_textbox.pack(fill="x", padx=15)
+        
+        self.timings_label = ctk.CTkLabel(
+            preview_frame, text="", font=ctk.CTkFont(size=11),
+            text_color=self.colors['text_muted'], anchor="w"
+        )
+        self.timings_label.pack(fill="x", padx=15, pady=(5, 10))
+        
         # Activity log section
         log_frame = ctk.CTkFrame(self.tab_main, corner_radius=12)
         log_frame.pack(fill="both", expand=True, padx=15, pady=(5, 15))
@@ -332,6 +541,19 @@ class ModernDiscordSummarizerGUI:
         )
         self.download_button.grid(row=0, column=2, padx=(5, 0))
         
+        # Download progress (shown while a pull is running)
+        self.pull_frame = ctk.CTkFrame(model_frame, fg_color="transparent")
+        self.pull_frame.grid(row=1, column=0, columnspan=3, sticky="ew", pady=(8, 0))
+        self.pull_bar = ctk.CTkProgressBar(self.pull_frame, height=8)
+        self.pull_bar.pack(fill="x")
+        self.pull_bar.set(0)
+        self.pull_label = ctk.CTkLabel(
+            self.pull_frame, text="", font=ctk.CTkFont(size=11),
+            text_color=self.colors['text_secondary'], anchor="w"
+        )
+        self.pull_label.pack(fill="x")
+        self.pull_frame.grid_remove()
+        
         # Ollama URL
         ctk.CTkLabel(
             config_inner, text="Ollama URL",
@@ -444,46 +666,102 @@ class ModernDiscordSummarizerGUI:
             )
             self.start_button.configure(state="normal")
     
-    def refresh_models(self):
+    def with_engine(self, action):
+        """Call ``action(engine)`` once the background engine is running
+        
+        The first call boots the engine on one thread so the window stays responsive while
+        day_summarizer is imported; actions requested meanwhile wait for it, and afterwards
+        they are submitted directly.
+        """
+        with _engine_lock:
+            if _engine is None:
+                self.engine_actions.append(action)
+                if len(self.engine_actions) == 1:
+                    threading.Thread(target=self.boot_engine, daemon=True).start()
+                return
+        action(_engine)
+    
+    def boot_engine(self):
+        engine = get_engine()
+        with _engine_lock:
+            actions, self.engine_actions = self.engine_actions, []
+        for action in actions:
+            action(engine)
+    
+    def refresh_models(self, ollama_url=None):
         """Refresh available Ollama models"""
-        def refresh():
-            self.log_to_settings("🔄 Refreshing model list...")
-            try:
-                ollama_url = self.url_entry.get().strip()
-                ollama_client = OllamaClient(ollama_url)
-                models = ollama_client.get_available_models()
-                
-                if models:
-                    # Update dropdown values
-                    self.model_dropdown.configure(values=models)
-                    self.log_to_settings(f"✅ Found {len(models)} models: {', '.join(models[:3])}{'...' if len(models) > 3 else ''}")
-                else:
-                    self.log_to_settings("❌ No models found or Ollama not accessible")
-            except Exception as e:
-                self.log_to_settings(f"❌ Error refreshing models: {str(e)}")
+        ollama_url = ollama_url or self.url_entry.get().strip()
+        self.log_to_settings("🔄 Refreshing model list...")
         
-        threading.Thread(target=refresh, daemon=True).start()
+        def done(ollama, error):
+            if error:
+                self.log_to_settings(f"❌ Error refreshing models: {error}")
+                return
+            self.record_health({'ollama': ollama})
+            
+            models = ollama.get('models', [])
+            if models:
+                self.log_to_settings(f"✅ Found {len(models)} models: {', '.join(models[:3])}{'...' if len(models) > 3 else ''}")
+            elif ollama['ok']:
+                self.log_to_settings("❌ No models found - use Download to install one")
+            else:
+                self.log_to_settings(f"❌ Error refreshing models: {ollama.get('error', 'Ollama not accessible')}")
+        
+        self.with_engine(lambda engine: engine.submit(engine.list_models(ollama_url), done))
     
     def download_model(self):
         """Download the selected model"""
-        def download():
-            model_name = self.model_var.get()
-            self.log_to_settings(f"📥 Downloading model: {model_name}")
-            
-            try:
-                ollama_url = self.url_entry.get().strip()
-                ollama_client = OllamaClient(ollama_url)
-                
-                success = ollama_client.download_model(model_name)
-                if success:
-                    self.log_to_settings(f"✅ Model {model_name} downloaded successfully")
-                    self.refresh_models()  # Refresh the list
-                else:
-                    self.log_to_settings(f"❌ Failed to download {model_name}")
-            except Exception as e:
-                self.log_to_settings(f"❌ Error downloading model: {str(e)}")
+        self.start_pull(self.model_var.get(), self.url_entry.get().strip())
+    
+    def start_pull(self, model_name, ollama_url):
+        """Stream a model pull in the background, showing bytes, percent and rate as it goes"""
+        if model_name in self.active_pulls:
+            return
+        self.active_pulls.add(model_name)
+        self.download_button.configure(state="disabled")
+        
+        self.log_to_settings(f"📥 Downloading model: {model_name}")
+        statuses = set()
+        
+        def on_progress(event):
+            # Log each phase once; byte counts only go to the progress bar
+            if event['status'] not in statuses and not event['done']:
+                statuses.add(event['status'])
+                self.log_to_settings(f"   {event['status']}")
+            self.ui_queue.put(('pull', event))
+        
+        def done(success, error):
+            if error:
+                self.log_to_settings(f"❌ Error downloading model: {error}")
+            elif success:
+                self.log_to_settings(f"✅ Model {model_name} downloaded successfully")
+                self.refresh_models(ollama_url)  # Refresh the list
+            else:
+                self.log_to_settings(f"❌ Failed to download {model_name}")
+            self.active_pulls.discard(model_name)
+            self.ui_queue.put(('call', self.update_pull_controls))
+        
+        self.with_engine(lambda engine: engine.submit(engine.pull_model(ollama_url, model_name, on_progress), done))
+    
+    def resume_pending_pulls(self):
+        """Reattach to model downloads that were still running when the app last closed"""
+        ollama_url = self.url_entry.get().strip()
+        
+        def done(pending, error):
+            for model_name in pending or []:
+                self.log_to_settings(f"🔁 Resuming interrupted download of {model_name}")
+                self.ui_queue.put(('call', lambda name=model_name: self.start_pull(name, ollama_url)))
         
-        threading.Thread(target=download, daemon=True).start()
+        self.with_engine(lambda engine: engine.submit(engine.pending_pulls(ollama_url), done))
+    
+    def apply_pull_progress(self, event):
+        self.pull_frame.grid()
+        self.pull_bar.set(event['percent'] / 100)
+        self.pull_label.configure(text=summarizer_module().PullProgress.describe(event))
+    
+    def update_pull_controls(self):
+        if not self.active_pulls:
+            self.download_button.configure(state="normal")
     
     def save_settings(self):
         """Save settings to .env file"""
@@ -509,178 +787,339 @@ OLLAMA_URL={self.url_entry.get().strip()}
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save settings: {str(e)}")
     
+    def show_cached_connection_status(self):
+        """Show the last known connection status until the background check reports back"""
+        health = self.gui_state.get('health')
+        if not health:
+            self.connection_label.configure(text="Checking connections...")
+            return
+        age = format_age(time.time() - min(entry.get('checked_at', 0) for entry in health.values()))
+        self.connection_label.configure(
+            text=f"{format_health(health)} (cached {age} ago)",
+            text_color=self.colors['text_muted']
+        )
+    
+    def record_health(self, results):
+        """Persist health check results and queue them for the status bar (worker threads)"""
+        state = dict(self.gui_state)
+        health = dict(state.get('health', {}))
+        for kind, result in results.items():
+            health[kind] = {
+                'ok': result['ok'],
+                'detail': result.get('detail') if result['ok'] else result.get('error', 'unavailable'),
+                'checked_at': result.get('checked_at', time.time())
+            }
+        state['health'] = health
+        models = results.get('ollama', {}).get('models')
+        if models:
+            state['models'] = models
+        self.gui_state = state
+        save_gui_state(state)
+        self.ui_queue.put(('connection', (health, models)))
+    
+    def apply_connection_status(self, health, models):
+        all_ok = all(entry['ok'] for entry in health.values())
+        self.connection_label.configure(
+            text=format_health(health),
+            text_color=self.colors['success'] if all_ok else self.colors['danger']
+        )
+        if models and hasattr(self, 'model_dropdown'):
+            self.model_dropdown.configure(values=models)
+    
     def log_to_settings(self, message):
         """Add message to settings activity log"""
         timestamp = datetime.now().strftime('%H:%M:%S')
-        log_message = f"[{timestamp}] {message}\n"
-        self.root.after(0, lambda: self.settings_log_textbox.insert("end", log_message))
-        self.root.after(0, lambda: self.settings_log_textbox.see("end"))
+        self.ui_queue.put(('settings', f"[{timestamp}] {message}\n"))
     
     def test_connections(self):
         """Test Discord and Ollama connections"""
-        def test():
-            self.log_to_settings("🔄 Testing connections...")
+        self.run_health_check(force=True)
+    
+    def run_health_check(self, force=False):
+        """Probe Discord and Ollama in parallel through the shared (cached) health checker"""
+        token = self.token_entry.get().strip()
+        guild_id = self.guild_entry.get().strip()
+        ollama_url = self.url_entry.get().strip()
+        selected_model = self.model_var.get()
+        
+        self.log_to_settings("🔄 Testing connections...")
+        has_discord = bool(token and guild_id.isdigit())
+        
+        def done(health, error):
+            if error:
+                self.log_to_settings(f"❌ Connection test failed: {error}")
+                return
+            discord, ollama = health['discord'], health['ollama']
+            self.record_health(health)
             
-            # Test Discord
-            try:
-                token = self.token_entry.get().strip()
-                guild_id = self.guild_entry.get().strip()
-                
-                if not token or not guild_id:
-                    self.log_to_settings("❌ Discord: Token or Guild ID missing")
-                else:
-                    client = DiscordHTTPClient(token)
-                    guild_info = client.get_guild_info(int(guild_id))
-                    if guild_info:
-                        self.log_to_settings(f"✅ Discord: Connected to {guild_info.get('name', 'server')}")
-                    else:
-                        self.log_to_settings("❌ Discord: Could not access server")
-            except Exception as e:
-                self.log_to_settings(f"❌ Discord: {str(e)}")
+            if not has_discord:
+                self.log_to_settings("❌ Discord: Token or Guild ID missing")
+            elif discord['ok']:
+                self.log_to_settings(f"✅ Discord: Connected to {discord['detail']}")
+            else:
+                self.log_to_settings(f"❌ Discord: {discord.get('error', 'Could not access server')}")
             
-            # Test Ollama
-            try:
-                ollama_url = self.url_entry.get().strip()
+            if ollama['ok']:
+                self.log_to_settings(f"✅ Ollama: Connected. Models: {', '.join(ollama['models'][:3])}")
                 
-                import requests
-                response = requests.get(f"{ollama_url}/api/tags", timeout=5)
-                if response.status_code == 200:
-                    models = response.json().get('models', [])
-                    model_names = [model['name'] for model in models[:3]]
-                    self.log_to_settings(f"✅ Ollama: Connected. Models: {', '.join(model_names)}")
-                    
-                    # Check if selected model is available
-                    selected_model = self.model_var.get()
-                    available_models = [m['name'] for m in models]
-                    if selected_model in available_models:
-                        self.log_to_settings(f"✅ Model '{selected_model}' is available")
-                    else:
-                        self.log_to_settings(f"⚠️ Model '{selected_model}' not found. Click Download to install it.")
+                # Check if selected model is available
+                if selected_model in ollama['models']:
+                    self.log_to_settings(f"✅ Model '{selected_model}' is available")
                 else:
-                    self.log_to_settings("❌ Ollama: API error")
-            except Exception as e:
-                self.log_to_settings(f"❌ Ollama: {str(e)}")
+                    self.log_to_settings(f"⚠️ Model '{selected_model}' not found. Click Download to install it.")
+            else:
+                self.log_to_settings(f"❌ Ollama: {ollama.get('error', 'API error')}")
         
-        threading.Thread(target=test, daemon=True).start()
+        self.with_engine(lambda engine: engine.submit(
+            engine.check_connections(token, int(guild_id) if has_discord else None, ollama_url, force), done
+        ))
     
     def start_summary(self):
-        """Start the summarization process"""
-        if self.is_running:
-            return
-        
+        """Queue a summary for the entered date range (and optional guild)"""
         start_date = self.start_date_entry.get().strip()
         end_date = self.end_date_entry.get().strip()
+        guild_id = self.job_guild_entry.get().strip()
         
         if not start_date or not end_date:
             messagebox.showerror("Error", "Please enter both start and end dates")
             return
+        if guild_id and not guild_id.isdigit():
+            messagebox.showerror("Error", "Guild ID must be a number")
+            return
         
-        self.is_running = True
-        self.start_button.configure(state="disabled")
-        self.cancel_button.configure(state="normal")
-        self.progress_bar.set(0)
+        guild = int(guild_id) if guild_id else None
         
-        # Clear log
-        self.log_textbox.delete("0.0", "end")
+        def found(checkpoint, error):
+            # A crashed or cancelled run with the same settings can pick up where it stopped
+            if isinstance(error, ValueError):
+                self.ui_queue.put(('call', lambda: messagebox.showerror("Error", str(error))))
+            elif error:
+                self.log(f"❌ Could not look for a checkpoint: {error}")
+            else:
+                self.ui_queue.put(('call', lambda: self.queue_summary(start_date, end_date, guild, checkpoint)))
         
-        # Start summarizer thread
-        self.current_thread = threading.Thread(
-            target=self.run_summarizer, 
-            args=(start_date, end_date),
-            daemon=True
-        )
-        self.current_thread.start()
+        # Looking for a checkpoint reads the disk, so it runs off the UI thread
+        self.with_engine(lambda engine: engine.submit(engine.run_blocking(
+            self.get_job_queue(engine).find_checkpoint, start_date, end_date, guild), found))
     
-    def run_summarizer(self, start_date, end_date):
-        """Run the summarizer in background thread"""
+    def queue_summary(self, start_date, end_date, guild, checkpoint):
+        """Ask about resuming a found checkpoint, then queue the job (on the UI thread)"""
+        jobs = self.job_queue
+        if not jobs.active_jobs():
+            # Fresh session: clear the previous batch's log and preview
+            self.clear_log()
+            self.clear_preview()
+            self.progress_bar.set(0)
+        
+        resume = bool(checkpoint) and messagebox.askyesno(
+            "Resume run?",
+            f"An unfinished run with these settings was found ({checkpoint.describe()}).\n\n"
+            "Resume it and skip the work already done?"
+        )
         try:
-            self.log("🚀 Starting Discord Day Summarizer...")
-            self.update_progress(0.05, "Initializing...")
-            
-            # Create summarizer with log callback
-            summarizer = DiscordDaySummarizer(start_date, end_date, log_callback=self.log)
-            
-            if not summarizer.client:
-                self.log("❌ Discord token not configured")
-                self.finish_with_error("Discord token not configured")
-                return
-            
-            if not summarizer.guild_id:
-                self.log("❌ Guild ID not configured")
-                self.finish_with_error("Guild ID not configured")
-                return
-            
-            self.update_progress(0.2, "Generating summaries...")
-            
-            # Generate summaries (this now returns tuple and logs everything)
-            markdown_content, html_content, filename_base = summarizer.generate_summary()
-            
-            if not html_content:  # Error case
-                self.log(f"❌ {markdown_content}")
-                self.finish_with_error(markdown_content)
-                return
-            
-            self.update_progress(0.95, "Saving files...")
-            
-            # Save markdown file
-            md_filename = f"{filename_base}.md"
-            with open(md_filename, 'w', encoding='utf-8') as f:
-                f.write(markdown_content)
-            
-            # Save HTML file
-            html_filename = f"{filename_base}.html"
-            with open(html_filename, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
+            job = jobs.submit(start_date, end_date, guild, resume=resume)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.log(f"📋 Queued job {job.label}")
+        self.cancel_button.configure(state="normal")
+    
+    def get_job_queue(self, engine):
+        if self.job_queue is None:
+            # Jobs share the engine's client pool with every other GUI action
+            self.job_queue = summarizer_module().JobQueue(
+                pool=engine.pool,
+                on_update=self.on_job_update, log_callback=self.log, stream_callback=self.on_stream
+            )
+        return self.job_queue
+    
+    def on_job_update(self, job):
+        """Queue a job status/progress change for the UI thread (called from job workers)"""
+        self.ui_queue.put(('job', job))
+        if job.status == "running" and job.progress:
+            self.on_progress(job.progress, job)
+    
+    def apply_job_updates(self, jobs):
+        """Redraw the rows of jobs that changed this tick and handle newly finished jobs"""
+        for job in {job.id: job for job in jobs}.values():
+            self.render_job_row(job)
+            if job.status not in ("queued", "running") and job.id not in self.finished_jobs:
+                self.finished_jobs.add(job.id)
+                self.on_job_finished(job)
+        
+        if not self.job_queue.active_jobs():
+            self.cancel_button.configure(state="disabled")
+    
+    def render_job_row(self, job):
+        row = self.job_rows.get(job.id)
+        if row is None:
+            self.jobs_empty_label.pack_forget()
+            frame = ctk.CTkFrame(self.jobs_list, fg_color="transparent")
+            frame.pack(fill="x", pady=1)
+            label = ctk.CTkLabel(frame, text="", font=ctk.CTkFont(size=12), anchor="w")
+            label.pack(side="left", fill="x", expand=True)
+            button = ctk.CTkButton(
+                frame, text="✖", width=28, height=24, fg_color=self.colors['danger'], hover_color="#c62828",
+                command=lambda job_id=job.id: self.job_queue.cancel(job_id)
+            )
+            button.pack(side="right")
+            row = self.job_rows[job.id] = (label, button)
+        
+        label, button = row
+        colors = {'running': self.colors['accent'], 'done': self.colors['success'],
+                  'failed': self.colors['danger'], 'cancelled': self.colors['text_muted']}
+        label.configure(text=f"{job.label}  •  {job.describe()}",
+                        text_color=colors.get(job.status, self.colors['text_secondary']))
+        if job.status not in ("queued", "running"):
+            button.configure(state="disabled")
+    
+    def on_job_finished(self, job):
+        if job.status == "done":
+            md_filename, html_filename = job.files
+            self.log(f"✅ Job #{job.id} finished in {job.elapsed:.0f}s")
             self.log(f"✅ Markdown saved: {md_filename}")
             self.log(f"✅ HTML saved: {html_filename}")
-            self.update_progress(1.0, "Summary completed!")
             
             # Auto-open HTML file
+            import webbrowser
             html_path = os.path.abspath(html_filename)
             webbrowser.open(f'file://{html_path}')
             self.log(f"🚀 Opening {html_filename} in browser...")
-            
-            # Show completion message
-            self.root.after(0, lambda: messagebox.showinfo(
-                "Summary Complete", 
-                f"Summary generated successfully!\n\nMarkdown: {md_filename}\nHTML: {html_filename}\n\nHTML file opened in browser!"
-            ))
-            
-        except Exception as e:
-            self.log(f"❌ Error: {str(e)}")
-            self.finish_with_error(str(e))
-        finally:
-            self.root.after(0, self.reset_ui)
+        elif job.status == "cancelled":
+            self.log(f"🛑 Job #{job.id} cancelled - Discord and Ollama requests stopped")
+        else:
+            self.log(f"❌ Job #{job.id} failed: {job.error}")
+        
+        if not self.job_queue.active_jobs():
+            self.update_progress(1.0 if job.status == "done" else 0, "All queued jobs finished")
     
     def update_progress(self, value, message):
-        """Update progress bar and message"""
-        self.root.after(0, lambda: self.progress_bar.set(value))
-        self.root.after(0, lambda: self.progress_label.configure(text=message))
+        """Update progress bar and message (only the latest update per tick is drawn)"""
+        self.pending_progress = (value, message)
+    
+    def on_progress(self, event, job):
+        """Map the latest running job's progress onto the 5%-95% span of the progress bar"""
+        self.update_progress(
+            0.05 + 0.9 * event['fraction'],
+            f"Job #{job.id}: {summarizer_module().ProgressTracker.describe(event)}"
+        )
     
     def log(self, message):
         """Add message to log"""
         timestamp = datetime.now().strftime('%H:%M:%S')
-        log_message = f"[{timestamp}] {message}\n"
-        self.root.after(0, lambda: self.log_textbox.insert("end", log_message))
-        self.root.after(0, lambda: self.log_textbox.see("end"))
+        self.ui_queue.put(('main', f"[{timestamp}] {message}\n"))
+    
+    def drain_ui_queue(self):
+        """Apply queued log lines and the latest progress in one batch, then reschedule"""
+        batches = {}
+        try:
+            while True:
+                target, item = self.ui_queue.get_nowait()
+                batches.setdefault(target, []).append(item)
+        except queue.Empty:
+            pass
+        
+        try:
+            if 'stream' in batches:
+                self.apply_stream_events(batches['stream'])
+            if 'main' in batches:
+                self.write_log_file(batches['main'])
+                self.append_log_lines(self.log_textbox, 'main', batches['main'])
+            if 'settings' in batches:
+                self.append_log_lines(self.settings_log_textbox, 'settings', batches['settings'])
+            if 'connection' in batches:
+                self.apply_connection_status(*batches['connection'][-1])
+            if 'pull' in batches:
+                self.apply_pull_progress(batches['pull'][-1])
+            if 'job' in batches:
+                self.apply_job_updates(batches['job'])
+            for callback in batches.get('call', []):
+                callback()
+            
+            progress, self.pending_progress = self.pending_progress, None
+            if progress:
+                self.progress_bar.set(progress[0])
+                self.progress_label.configure(text=progress[1])
+        finally:
+            self.root.after(UI_TICK_MS, self.drain_ui_queue)
     
-    def finish_with_error(self, error):
-        """Finish with error"""
-        self.root.after(0, lambda: messagebox.showerror("Error", error))
+    def on_stream(self, event):
+        """Queue a streamed-token event from the summarizer (called from worker threads)"""
+        self.ui_queue.put(('stream', event))
+    
+    def apply_stream_events(self, events):
+        """Fold a tick's worth of streamed tokens into the preview pane with one redraw"""
+        timings_changed = False
+        for event in events:
+            source = event['source']
+            if event['type'] == 'start':
+                self.preview_texts[source] = ""
+                self.preview_stats[source] = (time.time(), 0)
+                self.preview_source = source
+            elif event['type'] == 'token':
+                self.preview_texts[source] = (self.preview_texts.get(source, "") + event['text'])[-PREVIEW_MAX_CHARS:]
+                started, tokens = self.preview_stats.get(source, (time.time(), 0))
+                self.preview_stats[source] = (started, tokens + 1)
+                self.preview_source = source
+            elif event['type'] == 'end':
+                self.channel_timings.append(
+                    f"{source} {event['seconds']:.1f}s • {event['tokens_per_second']:.0f} tok/s"
+                )
+                timings_changed = True
+        
+        source = self.preview_source
+        if source is not None:
+            self.preview_textbox.delete("0.0", "end")
+            self.preview_textbox.insert("end", self.preview_texts.get(source, ""))
+            self.preview_textbox.see("end")
+            started, tokens = self.preview_stats.get(source, (time.time(), 0))
+            rate = tokens / max(time.time() - started, 1e-3)
+            self.preview_source_label.configure(text=f"{source} • {tokens} tokens • {rate:.1f} tok/s")
+        
+        if timings_changed:
+            self.timings_label.configure(text="   ".join(self.channel_timings[-4:]))
+    
+    def clear_preview(self):
+        self.preview_texts.clear()
+        self.preview_stats.clear()
+        self.preview_source = None
+        self.channel_timings = []
+        self.preview_textbox.delete("0.0", "end")
+        self.preview_source_label.configure(text="")
+        self.timings_label.configure(text="")
+    
+    def append_log_lines(self, textbox, target, lines):
+        """Insert lines with a single call and trim the textbox to LOG_MAX_LINES"""
+        lines = lines[-LOG_MAX_LINES:]
+        textbox.insert("end", "".join(lines))
+        
+        count = self.log_line_counts.get(target, 0) + len(lines)
+        if count > LOG_MAX_LINES:
+            textbox.delete("1.0", f"{count - LOG_MAX_LINES + 1}.0")
+            count = LOG_MAX_LINES
+        self.log_line_counts[target] = count
+        textbox.see("end")
+    
+    def write_log_file(self, lines):
+        """Keep the complete activity log on disk"""
+        try:
+            with open(LOG_FILE, 'a', encoding='utf-8') as f:
+                f.writelines(lines)
+        except OSError:
+            pass
+    
+    def clear_log(self):
+        self.log_textbox.delete("0.0", "end")
+        self.log_line_counts['main'] = 0
     
     def cancel_summary(self):
-        """Cancel the running summary"""
-        self.is_running = False
-        self.log("❌ Summary cancelled by user")
-        self.reset_ui()
-    
-    def reset_ui(self):
-        """Reset UI after completion or cancellation"""
-        self.is_running = False
-        self.start_button.configure(state="normal")
+        """Cancel every queued and running job"""
+        if self.job_queue:
+            self.job_queue.cancel_all()
+        self.log("❌ Cancelling all jobs...")
+        # Job rows update as each worker actually stops
         self.cancel_button.configure(state="disabled")
-        self.update_progress(0, "")
+        self.update_progress(self.progress_bar.get(), "Cancelling...")
     
     def open_output_folder(self):
         """Open the output folder"""
@@ -697,8 +1136,17 @@ OLLAMA_URL={self.url_entry.get().strip()}
     def run(self):
         """Run the application"""
         self.root.mainloop()
+        if _engine is not None:
+            _engine.shutdown()
 
 def main():
+    global PROFILE_STARTUP
+    parser = argparse.ArgumentParser(description="Discord Day Summarizer GUI")
+    parser.add_argument('--startup-profile', action='store_true',
+                        help=f'Print an import/startup time breakdown (target: window visible in < {STARTUP_TARGET_SECONDS:.0f}s)')
+    args = parser.parse_args()
+    PROFILE_STARTUP = args.startup_profile
+    
     app = ModernDiscordSummarizerGUI()
     app.run()
 
@@ -0,0 +1,210 @@
+"""
+HTTP job API for the Discord Day Summarizer
+A local Flask service that queues reports on a shared JobQueue, streams their progress over
+Server-Sent Events and serves the finished markdown/HTML. It stays running with warm
+connections and caches, so dashboards and scripts can request reports on demand without
+starting a new process for each one.
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from flask import Flask, Response, jsonify, request, send_file
+
+from day_summarizer import JobQueue, SummaryJob
+from summarize import token_fingerprint
+
+FINISHED = ("done", "failed", "cancelled")
+
+
+class JobEvents:
+    """Per-job event history that SSE responses replay from the start and then follow
+
+    A finished job's history is kept for ``retention`` seconds after its 'done' event,
+    long enough for clients to catch up, and then dropped.
+    """
+
+    def __init__(self, retention: float = 600):
+        self.retention = retention
+        self._events: Dict[int, List[tuple]] = defaultdict(list)
+        self._finished: Dict[int, float] = {}  # job_id -> time of its 'done' event
+        self._condition = threading.Condition()
+
+    def publish(self, job_id: int, kind: str, data: Dict):
+        with self._condition:
+            self._events[job_id].append((kind, data))
+            if kind == "done":
+                self._finished[job_id] = time.time()
+            self._condition.notify_all()
+
+    def has_history(self, job_id: int) -> bool:
+        with self._condition:
+            return job_id in self._events
+
+    def prune(self) -> List[int]:
+        """Drop the histories of jobs finished more than ``retention`` seconds ago; returns their ids"""
+        cutoff = time.time() - self.retention
+        with self._condition:
+            expired = [job_id for job_id, finished_at in self._finished.items() if finished_at < cutoff]
+            for job_id in expired:
+                del self._finished[job_id]
+                self._events.pop(job_id, None)
+        return expired
+
+    def follow(self, job_id: int, keepalive: float = 15.0):
+        """Yield (kind, data) events as they arrive; (None, None) after ``keepalive`` idle seconds"""
+        position = 0
+        while True:
+            with self._condition:
+                if position >= len(self._events.get(job_id, [])):
+                    self._condition.wait(keepalive)
+                events = self._events.get(job_id, [])[position:]
+            position += len(events)
+            if not events:
+                yield None, None
+            for event in events:
+                yield event
+
+
+def sse(kind: str, data: Dict) -> str:
+    return f"event: {kind}\ndata: {json.dumps(data)}\n\n"
+
+
+def create_app(max_workers: Optional[int] = None) -> Flask:
+    """Build the Flask app around its own JobQueue (available as ``app.config['JOB_QUEUE']``)"""
+    app = Flask(__name__)
+    events = JobEvents()
+    last_status: Dict[int, str] = {}
+
+    def on_update(job: SummaryJob):
+        for job_id in events.prune():
+            last_status.pop(job_id, None)
+        # Status changes carry the whole job; everything else is a progress tick
+        if last_status.get(job.id) != job.status:
+            last_status[job.id] = job.status
+            events.publish(job.id, "done" if job.status in FINISHED else "status", job.to_dict())
+        elif job.progress:
+            events.publish(job.id, "progress", dict(job.progress, description=job.describe()))
+
+    def on_log(job: SummaryJob, message: str):
+        events.publish(job.id, "log", {'message': message})
+
+    jobs = JobQueue(max_workers=max_workers, on_update=on_update, on_log=on_log)
+    app.config['JOB_QUEUE'] = jobs
+
+    def get_job(job_id: int) -> SummaryJob:
+        job = jobs.jobs.get(job_id)
+        if job is None:
+            raise LookupError(f"No job {job_id}")
+        return job
+
+    def job_response(job: SummaryJob, status: int = 200):
+        data = job.to_dict()
+        data['links'] = {
+            'self': f"/jobs/{job.id}",
+            'events': f"/jobs/{job.id}/events",
+            'markdown': f"/jobs/{job.id}/report.md",
+            'html': f"/jobs/{job.id}/report.html",
+        }
+        return jsonify(data), status
+
+    @app.errorhandler(LookupError)
+    def not_found(error):
+        return jsonify({'error': str(error)}), 404
+
+    @app.errorhandler(ValueError)
+    def bad_request(error):
+        return jsonify({'error': str(error)}), 400
+
+    @app.get("/health")
+    def health():
+        # Lets summarize.py check it would run with the same Discord account
+        return jsonify({'ok': True, 'active_jobs': len(jobs.active_jobs()),
+                        'discord_token': token_fingerprint(os.getenv('DISCORD_TOKEN', ''))})
+
+    @app.post("/jobs")
+    def submit_job():
+        """Queue a report: {"start_date", "end_date"?, "guild_id"?, "style"?, "model"?, "resume"?, "refresh"?}"""
+        body = request.get_json(silent=True) or {}
+        start_date = body.get('start_date')
+        if not start_date:
+            raise ValueError("start_date is required")
+        guild_id = body.get('guild_id')
+        if guild_id is not None and not str(guild_id).isdigit():
+            raise ValueError("guild_id must be a number")
+
+        job = jobs.submit(
+            start_date, body.get('end_date') or start_date, int(guild_id) if guild_id else None,
+            resume=bool(body.get('resume')), style=body.get('style'), model=body.get('model'),
+            refresh=bool(body.get('refresh'))
+        )
+        return job_response(job, 200 if job.status == "done" else 202)
+
+    @app.get("/jobs")
+    def list_jobs():
+        return jsonify([job.to_dict() for job in jobs.jobs.values()])
+
+    @app.get("/jobs/<int:job_id>")
+    def job_status(job_id: int):
+        return job_response(get_job(job_id))
+
+    @app.delete("/jobs/<int:job_id>")
+    def cancel_job(job_id: int):
+        jobs.cancel(job_id)
+        return job_response(get_job(job_id))
+
+    @app.get("/jobs/<int:job_id>/events")
+    def job_events(job_id: int):
+        """Server-Sent Events: status, progress and log events, ending with a 'done' event"""
+        job = get_job(job_id)
+
+        def stream():
+            if job.status in FINISHED and not events.has_history(job_id):
+                yield sse("done", job.to_dict())  # Finished long ago, its history was dropped
+                return
+            for kind, data in events.follow(job_id):
+                if kind is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield sse(kind, data)
+                if kind == "done":
+                    return
+
+        return Response(stream(), mimetype="text/event-stream", headers={'Cache-Control': 'no-cache'})
+
+    @app.get("/jobs/<int:job_id>/report.<fmt>")
+    def job_report(job_id: int, fmt: str):
+        job = get_job(job_id)
+        if fmt not in ("md", "html"):
+            raise LookupError(f"No report format {fmt}")
+        if job.status != "done":
+            return jsonify({'error': f"Job {job_id} is {job.status}"}), 409
+        path = next((path for path in job.files if path.endswith(f".{fmt}")), None)
+        if path is None:
+            raise LookupError(f"Job {job_id} has no {fmt} report")
+        mimetype = "text/markdown" if fmt == "md" else "text/html"
+        return send_file(os.path.abspath(path), mimetype=mimetype)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Discord Day Summarizer - local HTTP job server")
+    parser.add_argument('--host', default=os.getenv('SERVER_HOST', '127.0.0.1'),
+                        help='Interface to listen on (default: localhost only)')
+    parser.add_argument('--port', type=int, default=int(os.getenv('SERVER_PORT', 8765)),
+                        help='Port to listen on (overrides SERVER_PORT env var)')
+    args = parser.parse_args()
+
+    app = create_app()
+    print(f"🌐 Summarizer server listening on http://{args.host}:{args.port}")
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Thin command line client for the Discord Day Summarizer
+If a summarizer server (server.py) is running locally with the same Discord token, the report
+is generated there, on its warm connections and loaded model, for this caller's GUILD_ID and
+OLLAMA_MODEL, and its log is streamed back here. Otherwise the full summarizer runs in-process. Only the standard library is imported on the fast path, so
+back-to-back invocations from scripts start instantly.
+
+Usage: python summarize.py --start-date yesterday [--end-date today] [--style brief] [--local]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def server_url() -> str:
+    return os.getenv('SERVER_URL') or f"http://127.0.0.1:{os.getenv('SERVER_PORT', 8765)}"
+
+
+def api(base_url: str, method: str, path: str, body: Optional[Dict] = None, timeout: float = 10):
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    req = urllib.request.Request(f"{base_url}{path}", data=data, method=method,
+                                 headers={'Content-Type': 'application/json'})
+    return urllib.request.urlopen(req, timeout=timeout)
+
+
+def token_fingerprint(token: str) -> str:
+    """Short hash that tells whether two processes use the same Discord token without revealing it"""
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()[:12]
+
+
+def find_server(timeout: float = 0.3) -> Optional[str]:
+    """URL of the local summarizer server, or None if none is answering for this caller's Discord token"""
+    base_url = server_url()
+    try:
+        with api(base_url, "GET", "/health", timeout=timeout) as response:
+            health = json.load(response)
+    except (OSError, ValueError):
+        return None
+    if not health.get('ok'):
+        return None
+    if health.get('discord_token') != token_fingerprint(os.getenv('DISCORD_TOKEN', '')):
+        print("ℹ️ The summarizer server uses a different Discord token, running here instead")
+        return None
+    return base_url
+
+
+def follow_events(base_url: str, job_id: int):
+    """Yield (kind, data) Server-Sent Events of a job until its 'done' event"""
+    with api(base_url, "GET", f"/jobs/{job_id}/events", timeout=60) as response:
+        kind = None
+        for raw in response:
+            line = raw.decode('utf-8').rstrip('\n')
+            if line.startswith('event: '):
+                kind = line[len('event: '):]
+            elif line.startswith('data: ') and kind:
+                yield kind, json.loads(line[len('data: '):])
+                if kind == 'done':
+                    return
+
+
+def download_report(base_url: str, job: Dict) -> list:
+    """Save the job's report files into the current directory (unless the server already wrote them here)"""
+    saved = []
+    for path in job['files']:
+        filename = os.path.basename(path)
+        if not os.path.exists(filename):
+            with api(base_url, "GET", f"/jobs/{job['id']}/report{os.path.splitext(filename)[1]}") as response:
+                with open(filename, 'wb') as f:
+                    f.write(response.read())
+        saved.append(filename)
+    return saved
+
+
+def run_remote(base_url: str, start_date: Optional[str], end_date: Optional[str], style: Optional[str] = None,
+               resume: bool = False, progress_interval: float = 10.0) -> int:
+    """Generate a report on the server, streaming its log; returns a process exit code"""
+    # The server has its own .env, so this caller's server and model go with the job
+    body = {'start_date': start_date or 'yesterday', 'end_date': end_date, 'style': style, 'resume': resume,
+            'guild_id': os.getenv('GUILD_ID') or None, 'model': os.getenv('OLLAMA_MODEL') or None}
+    try:
+        with api(base_url, "POST", "/jobs", body) as response:
+            job = json.load(response)
+    except urllib.error.HTTPError as e:
+        print(f"❌ Configuration error: {json.load(e).get('error', e)}")
+        return 1
+    print(f"🌐 Running on the summarizer server at {base_url} (job #{job['id']})")
+
+    last_progress = 0.0
+    try:
+        for kind, data in follow_events(base_url, job['id']):
+            if kind == 'log':
+                print(data['message'])
+            elif kind == 'progress' and time.time() - last_progress >= progress_interval:
+                last_progress = time.time()
+                print(f"⏳ {data.get('fraction', 0) * 100:.0f}% • {data.get('description', '')}")
+            elif kind == 'done':
+                job = data
+    except KeyboardInterrupt:
+        print("\n🛑 Cancelling...")
+        api(base_url, "DELETE", f"/jobs/{job['id']}").close()
+        print("🛑 Operation cancelled by user")
+        return 130
+    except OSError as e:
+        print(f"❌ Lost connection to the summarizer server: {e}")
+        return 1
+
+    if job['status'] == 'cancelled':
+        print("🛑 Operation cancelled")
+        return 1
+    if job['status'] != 'done':
+        print(f"❌ {job.get('error') or job['status']}")
+        return 1
+
+    md_filename, html_filename = download_report(base_url, job)
+    print("\n✅ Summary generated successfully!" + (" (reused an identical earlier report)" if job['cached'] else ""))
+    print(f"📄 Markdown: {md_filename}")
+    print(f"🌐 HTML: {html_filename}")
+
+    import webbrowser
+    webbrowser.open(f"file://{os.path.abspath(html_filename)}")
+    print(f"🚀 Opening {html_filename} in browser...")
+    return 0
+
+
+def main():
+    # Only the options the server understands are handled here; anything else runs in-process
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--start-date', '-s')
+    parser.add_argument('--end-date', '-e')
+    parser.add_argument('--style', choices=['detailed', 'brief'])
+    parser.add_argument('--resume', action='store_true')
+    parser.add_argument('--local', action='store_true')
+    args, rest = parser.parse_known_args()
+
+    base_url = None if args.local or rest else find_server()
+    if base_url:
+        sys.exit(run_remote(base_url, args.start_date, args.end_date, args.style, args.resume))
+
+    import day_summarizer
+    sys.argv = [sys.argv[0]] + [arg for arg in sys.argv[1:] if arg != '--local']
+    day_summarizer.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import day_summarizer  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Every test gets its own empty cache directory"""
+    monkeypatch.setattr(day_summarizer, 'CACHE_DIR', str(tmp_path / "cache"))
+    return tmp_path / "cache"
@@ -0,0 +1,62 @@
+import asyncio
+
+from day_summarizer import AIMDController
+
+
+def test_limit_grows_additively_while_latency_is_steady():
+    aimd = AIMDController(max_limit=4)
+    for _ in range(10):
+        aimd.record(elapsed=1.0, expected=1.0)
+    assert aimd.in_flight_limit == 4
+    assert [limit for _, limit in aimd.history] == [1, 2, 3, 4]
+
+
+def test_limit_halves_on_latency_spike_and_error():
+    aimd = AIMDController(max_limit=8, initial=8)
+    aimd.record(elapsed=1.0, expected=1.0)
+    aimd.record(elapsed=5.0, expected=1.0)
+    assert aimd.in_flight_limit == 4
+    aimd.record(elapsed=0.0, expected=1.0, error=True)
+    assert aimd.in_flight_limit == 2
+    for _ in range(3):
+        aimd.record(elapsed=0.0, expected=1.0, error=True)
+    assert aimd.in_flight_limit == aimd.min_limit
+
+
+def test_latency_is_relative_to_expected_time():
+    aimd = AIMDController(max_limit=8, initial=4)
+    aimd.record(elapsed=1.0, expected=1.0)
+    aimd.record(elapsed=10.0, expected=10.0)  # A large request taking proportionally longer is no spike
+    assert aimd.in_flight_limit == 4
+
+
+def test_acquire_waits_for_a_free_slot():
+    async def run():
+        aimd = AIMDController(max_limit=4, initial=2)
+        peak = 0
+
+        async def request():
+            nonlocal peak
+            await aimd.acquire()
+            peak = max(peak, aimd.in_flight)
+            await asyncio.sleep(0.01)
+            aimd.release()
+
+        await asyncio.gather(*(request() for _ in range(6)))
+        return peak, aimd.in_flight
+
+    assert asyncio.run(run()) == (2, 0)
+
+
+def test_raising_the_limit_wakes_waiters():
+    async def run():
+        aimd = AIMDController(max_limit=2, initial=1)
+        await aimd.acquire()
+        waiter = asyncio.ensure_future(aimd.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        aimd.record(elapsed=1.0, expected=1.0)  # Limit 1 -> 2
+        await asyncio.wait_for(waiter, 1)
+        return aimd.in_flight
+
+    assert asyncio.run(run()) == 2
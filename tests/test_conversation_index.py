@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta, timezone
+
+from day_summarizer import ConversationIndex, datetime_to_snowflake
+
+START = datetime(2025, 1, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def message(minute: float, author: str, content: str = "hi", reply_to: str = None) -> dict:
+    at = START + timedelta(minutes=minute)
+    msg = {'id': str(datetime_to_snowflake(at)), 'timestamp': at.isoformat(),
+           'author': {'username': author}, 'content': content}
+    if reply_to:
+        msg['message_reference'] = {'message_id': reply_to}
+    return msg
+
+
+def test_replies_join_their_parents_conversation():
+    root = message(0, "ann", "question")
+    other = message(1, "bob", "unrelated")
+    reply = message(30, "cat", "answer", reply_to=root['id'])
+    nested = message(31, "dan", "follow-up", reply_to=reply['id'])
+    index = ConversationIndex([root, other, reply, nested])
+    assert [[msg['id'] for msg in c.messages] for c in index.conversations] == [
+        [root['id'], reply['id'], nested['id']], [other['id']]
+    ]
+    conversation = index.conversation_of[root['id']]
+    assert [conversation.depths[msg['id']] for msg in (root, reply, nested)] == [0, 1, 2]
+    assert index.children[root['id']] == [reply['id']]
+
+
+def test_author_continues_conversation_within_gap():
+    first = message(0, "ann")
+    soon = message(4, "ann")
+    later = message(20, "ann")
+    index = ConversationIndex([first, soon, later], gap_seconds=300)
+    assert [len(c) for c in index.conversations] == [2, 1]
+
+
+def test_newest_first_input_is_indexed_chronologically():
+    messages = [message(minute, "ann") for minute in range(3)]
+    index = ConversationIndex(list(reversed(messages)))
+    assert [msg['id'] for msg in index.conversations[0].messages] == [msg['id'] for msg in messages]
+
+
+def test_chunks_keep_conversations_whole():
+    messages = [message(minute * 10, f"user{minute}", "x" * 50) for minute in range(6)]
+    index = ConversationIndex(messages)
+    block = len(index.conversations[0].format())
+    chunks = index.chunk(block * 2 + 4)
+    assert len(chunks) == 3
+    assert all(chunk.count("\n\n") == 1 for chunk in chunks)
+    assert "\n\n".join(chunks) == index.format()
+
+
+def test_sample_keeps_largest_conversations_in_order():
+    small = message(0, "ann", "a")
+    big = [message(10, "bob", "b" * 40), message(11, "bob", "b" * 40)]
+    medium = message(30, "cat", "c" * 40)
+    index = ConversationIndex([small] + big + [medium])
+    small_size, big_size = (len(c.format()) + 2 for c in index.conversations[:2])
+    assert [c.id for c in index.sample(big_size).conversations] == [big[0]['id']]
+    assert [c.id for c in index.sample(big_size + small_size).conversations] == [small['id'], big[0]['id']]
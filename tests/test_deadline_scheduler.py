@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from day_summarizer import DeadlineScheduler, parse_deadline
+
+
+def scheduler(seconds_left, fallback_model="small"):
+    deadline = datetime.now(timezone.utc) + timedelta(seconds=seconds_left)
+    return DeadlineScheduler(deadline, fallback_model, degraded_prompt_chars=4000, reserve_seconds=0,
+                             log_callback=lambda message: None)
+
+
+def test_no_deadline_never_degrades():
+    schedule = DeadlineScheduler(log_callback=lambda message: None)
+    assert schedule.choose_level([10 ** 9]) == DeadlineScheduler.FULL
+
+
+@pytest.mark.parametrize("seconds_left, level", [
+    (1000, DeadlineScheduler.FULL),            # 2 calls: 2 * (15 + 40000 / 400) = 230s
+    (200, DeadlineScheduler.FALLBACK_MODEL),   # Half of that with the fallback model
+    (50, DeadlineScheduler.TIGHT_BUDGET),      # 2 * (15 + 10) * 0.5 = 25s
+    (10, DeadlineScheduler.EXTRACTIVE),
+])
+def test_choose_least_degraded_level_that_fits(seconds_left, level):
+    assert scheduler(seconds_left).choose_level([40000, 40000]) == level
+
+
+def test_without_fallback_model_skips_that_level():
+    assert scheduler(200, fallback_model=None).choose_level([40000, 40000]) == DeadlineScheduler.TIGHT_BUDGET
+
+
+def test_levels_only_increase():
+    schedule = scheduler(50)
+    assert schedule.choose_level([40000, 40000]) == DeadlineScheduler.TIGHT_BUDGET
+    assert schedule.choose_level([10]) == DeadlineScheduler.TIGHT_BUDGET
+
+
+def test_order_puts_largest_channels_first():
+    channels = {'small': [{'content': "a"}], 'large': [{'content': "a" * 100}]}
+    assert [name for name, _ in DeadlineScheduler.order(channels)] == ['large', 'small']
+
+
+def test_report_notes_name_degraded_channels():
+    schedule = scheduler(1000)
+    schedule.note("general", DeadlineScheduler.FULL)
+    schedule.note("random", DeadlineScheduler.FALLBACK_MODEL)
+    assert schedule.report_notes() == ["Deadline degradation - fallback model (small): #random"]
+
+
+def test_parse_deadline_clock_time_is_next_occurrence():
+    now = datetime(2025, 1, 10, 10, 0, tzinfo=timezone.utc)
+    assert parse_deadline("11:30", now) == now.replace(hour=11, minute=30)
+    assert parse_deadline("09:00", now) == datetime(2025, 1, 11, 9, 0, tzinfo=timezone.utc)
+    assert parse_deadline(None) is None
+    with pytest.raises(ValueError):
+        parse_deadline("soon")
@@ -0,0 +1,59 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from day_summarizer import DiscordAPIError, MessageStore, datetime_to_snowflake
+from gateway import GatewayListener
+
+AFTER = datetime(2025, 1, 10, tzinfo=timezone.utc)
+BEFORE = AFTER + timedelta(hours=12)
+
+
+def message(at: datetime) -> dict:
+    return {'id': str(datetime_to_snowflake(at)), 'timestamp': at.isoformat(), 'content': 'x',
+            'author': {'id': '1', 'username': 'u'}}
+
+
+class FakeRest:
+    def __init__(self, fetched=None, error=None):
+        self.fetched = fetched or {}
+        self.error = error
+
+    async def get_guild_channels(self, guild_id):
+        return [{'id': str(channel_id)} for channel_id in self.fetched] or [{'id': "1"}]
+
+    async def get_many_channel_messages(self, channel_ids, after, before, limit, raise_errors=False):
+        assert raise_errors
+        if self.error:
+            raise self.error
+        return self.fetched
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MessageStore(str(tmp_path / "messages.db"))
+    yield store
+    store.close()
+
+
+def backfill(store, rest, max_messages=100):
+    listener = GatewayListener("token", 7, store, log_callback=lambda message: None, max_messages=max_messages)
+    listener.rest = rest
+    asyncio.run(listener._backfill(AFTER, BEFORE))
+
+
+def test_failed_backfill_records_no_coverage(store):
+    backfill(store, FakeRest(error=DiscordAPIError(500, "/channels/1/messages")))
+    assert store.coverage(7) == []
+
+
+def test_complete_backfill_covers_the_gap(store):
+    backfill(store, FakeRest({1: [message(AFTER + timedelta(hours=2))], 2: []}))
+    assert store.coverage(7) == [(AFTER, BEFORE)]
+
+
+def test_truncated_backfill_covers_only_newer_than_its_oldest_message(store):
+    messages = [message(AFTER + timedelta(hours=h)) for h in (11, 10, 9)]
+    backfill(store, FakeRest({1: messages, 2: [message(AFTER + timedelta(hours=1))]}), max_messages=3)
+    assert store.coverage(7) == [(AFTER + timedelta(hours=9), BEFORE)]
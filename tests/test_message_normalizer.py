@@ -0,0 +1,28 @@
+from day_summarizer import GuildDirectory, MessageNormalizer
+
+
+def test_normalizer_resolves_mentions():
+    directory = GuildDirectory(1)
+    directory.members = {'111111111111111111': "ann"}
+    directory.channels = {'222222222222222222': "general"}
+    directory.roles = {'333333333333333333': "mods"}
+    normalizer = MessageNormalizer(directory)
+    text = "<@111111111111111111> <@!111111111111111111> <#222222222222222222> <@&333333333333333333> <@999999999999999999>"
+    assert normalizer.normalize_text(text) == "@ann @ann #general @mods @user"
+
+
+def test_normalizer_shortens_urls_and_collapses_long_code():
+    normalizer = MessageNormalizer(max_code_lines=2)
+    assert normalizer.normalize_text("see https://www.example.com/a/b/page?x=1") == "see example.com/…/page"
+    assert normalizer.normalize_text("https://example.com/") == "example.com"
+    assert normalizer.normalize_text("```py\na\nb\nc\n```") == "[py code block: 3 lines]"
+    assert normalizer.normalize_text("```\na\nb\n```") == "```\na\nb\n```"
+
+
+def test_normalize_counts_savings_and_copies_messages():
+    normalizer = MessageNormalizer()
+    original = {'id': "1", 'content': "https://example.com/" + "x" * 100}
+    [result] = normalizer.normalize([original])
+    assert original['content'].startswith("https://")
+    assert result['content'] == "example.com/" + "x" * 40
+    assert normalizer.tokens_saved == (len(original['content']) - len(result['content'])) // 4
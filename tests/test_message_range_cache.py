@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, timezone
+
+from day_summarizer import DiscordAPIError, MessageRangeCache, datetime_to_snowflake
+
+DAY = datetime(2025, 1, 10, tzinfo=timezone.utc)
+
+
+def hours(h: float) -> datetime:
+    return DAY + timedelta(hours=h)
+
+
+def message(at: datetime, seq: int = 0) -> dict:
+    return {'id': str(datetime_to_snowflake(at) + seq), 'timestamp': at.isoformat(), 'content': 'x'}
+
+
+class FakeAsyncClient:
+    """Serves get_channel_messages from a list, optionally failing for some gaps"""
+
+    def __init__(self, messages, fail=False):
+        self.messages = messages
+        self.fail = fail
+        self.calls = []
+
+    async def get_channel_messages(self, channel_id, after, before, limit, on_page=None, raise_errors=False):
+        self.calls.append((after, before, raise_errors))
+        if self.fail:
+            if raise_errors:
+                raise DiscordAPIError(500, f"/channels/{channel_id}/messages")
+            return self.messages[:1]  # What a page-2 failure used to look like: a short, partial batch
+        in_range = [msg for msg in self.messages
+                    if after <= datetime.fromisoformat(msg['timestamp']) <= before]
+        return sorted(in_range, key=lambda msg: int(msg['id']), reverse=True)[:limit]
+
+
+class FakeClient:
+    def __init__(self, async_client):
+        self.async_client = async_client
+
+
+def test_gaps_skip_covered_ranges():
+    ranges = [(hours(1), hours(2)), (hours(4), hours(5))]
+    assert MessageRangeCache._gaps(ranges, hours(0), hours(6)) == [
+        (hours(0), hours(1)), (hours(2), hours(4)), (hours(5), hours(6))
+    ]
+    assert MessageRangeCache._gaps(ranges, hours(1), hours(2)) == []
+    assert MessageRangeCache._gaps([], hours(0), hours(1)) == [(hours(0), hours(1))]
+
+
+def test_merge_joins_overlapping_and_touching_ranges():
+    merged = MessageRangeCache._merge([(hours(3), hours(4)), (hours(0), hours(1)), (hours(1), hours(2))])
+    assert merged == [(hours(0), hours(2)), (hours(3), hours(4))]
+
+
+def test_record_empty_batch_is_not_coverage():
+    cache = MessageRangeCache()
+    entry = cache._entry(1)
+    cache._record(entry, (hours(0), hours(6)), [], hours(24), limit=10)
+    assert entry['ranges'] == []
+
+
+def test_record_truncated_batch_covers_only_its_newest_part():
+    cache = MessageRangeCache()
+    entry = cache._entry(1)
+    batch = [message(hours(5)), message(hours(4))]
+    cache._record(entry, (hours(0), hours(6)), batch, hours(24), limit=2)
+    assert entry['ranges'] == [(hours(4), hours(6))]
+
+
+def test_record_never_covers_past_fetch_time():
+    cache = MessageRangeCache()
+    entry = cache._entry(1)
+    cache._record(entry, (hours(0), hours(6)), [message(hours(1))], hours(3), limit=10)
+    assert entry['ranges'] == [(hours(0), hours(3))]
+
+
+def test_failed_fetch_is_not_recorded_and_is_retried():
+    cache = MessageRangeCache()
+    failing = FakeAsyncClient([message(hours(2)), message(hours(1))], fail=True)
+    result = cache.fetch_many(FakeClient(failing), [1], hours(0), hours(6), limit=100)
+    assert result == {1: []}
+    assert failing.calls[0][2] is True  # Errors are raised, not turned into a partial batch
+    assert cache._entry(1)['ranges'] == []
+
+    healthy = FakeAsyncClient([message(hours(2)), message(hours(1))])
+    result = cache.fetch_many(FakeClient(healthy), [1], hours(0), hours(6), limit=100)
+    assert len(result[1]) == 2
+    assert len(healthy.calls) == 1
+
+
+def test_covered_range_is_served_from_cache():
+    cache = MessageRangeCache()
+    client = FakeAsyncClient([message(hours(2)), message(hours(1))])
+    cache.fetch_many(FakeClient(client), [1], hours(0), hours(6), limit=100)
+    result = cache.fetch_many(FakeClient(client), [1], hours(1), hours(3), limit=100)
+    assert [msg['id'] for msg in result[1]] == [message(hours(2))['id'], message(hours(1))['id']]
+    assert len(client.calls) == 1
+    assert cache.reused_ranges == 1
+
+
+def test_least_recently_used_channels_are_evicted():
+    cache = MessageRangeCache()
+    cache.MAX_MESSAGES = 3
+    client = FakeAsyncClient([message(hours(1), seq) for seq in range(2)])
+    cache.fetch_many(FakeClient(client), [1], hours(0), hours(6), limit=100)
+    cache.fetch_many(FakeClient(client), [2], hours(0), hours(6), limit=100)
+    assert list(cache._channels) == [2]
@@ -0,0 +1,84 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from day_summarizer import AsyncDiscordHTTPClient, datetime_to_snowflake, snowflake_to_datetime
+
+DAY = datetime(2025, 1, 10, tzinfo=timezone.utc)
+END = DAY + timedelta(days=1)
+
+
+def message(at: datetime, seq: int = 0) -> dict:
+    at = at.replace(microsecond=at.microsecond // 1000 * 1000)  # Snowflakes have millisecond resolution
+    return {'id': str(datetime_to_snowflake(at) + seq), 'timestamp': at.isoformat(), 'content': 'x'}
+
+
+def fake_client(messages, max_shards):
+    """A client whose HTTP layer serves Discord's ``after``/``before``/``limit`` paging from a list"""
+    client = AsyncDiscordHTTPClient("token")
+    client.max_shards = max_shards
+    newest_first = sorted(messages, key=lambda msg: int(msg['id']), reverse=True)
+    client.requests = 0
+
+    async def request(method, path, params=None):
+        client.requests += 1
+        after, before = int(params['after']), int(params['before'])
+        page = [msg for msg in newest_first if after < int(msg['id']) < before]
+        return 200, page[:params['limit']]
+
+    client.request = request
+    return client
+
+
+def fetch(messages, limit, max_shards):
+    client = fake_client(messages, max_shards)
+    return [msg['id'] for msg in asyncio.run(client.get_channel_messages(1, DAY, END, limit))]
+
+
+def uniform(count, start, spacing):
+    return [message(start + timedelta(seconds=i * spacing)) for i in range(count)]
+
+
+SCENARIOS = {
+    'uniform': uniform(3000, DAY, 20),
+    'dense older burst': (uniform(100, DAY + timedelta(hours=23), 36)
+                          + uniform(1500, DAY + timedelta(hours=14), 0.2)
+                          + uniform(100, DAY + timedelta(hours=2), 300)),
+    'quiet older history': uniform(400, DAY + timedelta(hours=20), 1) + uniform(50, DAY, 60),
+    'same millisecond at boundaries': [message(DAY + timedelta(hours=20, seconds=i // 5), i % 5)
+                                       for i in range(2500)],
+}
+
+
+@pytest.mark.parametrize("name", sorted(SCENARIOS))
+@pytest.mark.parametrize("limit", [150, 1000, 1700])
+def test_sharded_fetch_matches_serial_paging(name, limit):
+    messages = SCENARIOS[name]
+    assert fetch(messages, limit, max_shards=4) == fetch(messages, limit, max_shards=1)
+
+
+def test_plan_shards_boundaries():
+    client = AsyncDiscordHTTPClient("token")
+    client.max_shards = 4
+    first_page = [message(END - timedelta(seconds=i)) for i in range(1, 101)]
+    oldest = snowflake_to_datetime(first_page[-1]['id'])
+    shards = client._plan_shards(first_page, DAY, 2000)
+    assert len(shards) == 4
+    # Oldest first, and neighbouring windows overlap by the 1 ms snowflake bounds exclude
+    for (_, end, _), (start, _, _) in zip(shards, shards[1:]):
+        assert end - start == timedelta(milliseconds=1)
+    assert shards[-1][1] == oldest
+    assert shards[0][0] >= DAY
+    assert all(0 < window_limit <= 2000 - len(first_page) for _, _, window_limit in shards)
+
+
+def test_plan_shards_skips_quiet_channels():
+    client = AsyncDiscordHTTPClient("token")
+    client.max_shards = 4
+    short_page = [message(END - timedelta(seconds=i)) for i in range(1, 51)]
+    assert client._plan_shards(short_page, DAY, 2000) is None
+    full_page = [message(END - timedelta(seconds=i)) for i in range(1, 101)]
+    assert client._plan_shards(full_page, DAY, 150) is None  # Fewer expected than SHARD_MIN_MESSAGES
+    client.max_shards = 1
+    assert client._plan_shards(full_page, DAY, 2000) is None
@@ -0,0 +1,64 @@
+import json
+import os
+import threading
+
+from day_summarizer import RunCheckpoint, ThroughputStats, cache_writer, load_cache, save_cache
+
+
+def test_save_cache_round_trip_leaves_no_temp_files(cache_dir):
+    save_cache("state.json", {'value': 1})
+    assert load_cache("state.json")['value'] == 1
+    assert os.listdir(cache_dir) == ["state.json"]
+
+
+def test_concurrent_save_cache_writers_do_not_collide(cache_dir):
+    def write(n):
+        for _ in range(20):
+            save_cache("shared.json", {'writer': n})
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with open(cache_dir / "shared.json", encoding='utf-8') as f:
+        assert json.load(f)['writer'] in range(4)
+    assert os.listdir(cache_dir) == ["shared.json"]
+
+
+def test_run_checkpoint_round_trip():
+    settings = {'guild_id': 1, 'start': "2025-01-01", 'end': "2025-01-01", 'model': "m"}
+    checkpoint = RunCheckpoint(settings)
+    messages = [{'id': "10", 'content': "hello"}]
+    checkpoint.record_channel(5, messages)
+    checkpoint.record_channel(6, [])
+    checkpoint.record_summary("general", {'summary': "text"})
+
+    resumed = RunCheckpoint(dict(settings))
+    assert resumed.key == checkpoint.key
+    assert resumed.load()
+    assert resumed.fetched_messages(5) == messages
+    assert resumed.fetched_messages(6) == []
+    assert resumed.fetched_messages(7) is None
+    assert resumed.summaries == {'general': {'summary': "text"}}
+
+    resumed.clear()
+    assert not RunCheckpoint(settings).load()
+
+
+def test_run_checkpoint_key_depends_on_settings():
+    assert RunCheckpoint({'model': "a"}).key != RunCheckpoint({'model': "b"}).key
+
+
+def test_throughput_stats_persist_per_host():
+    stats = ThroughputStats("http://ollama", "m")
+    stats.record({'prompt_eval_count': 100, 'prompt_eval_duration': 1e9,
+                  'eval_count': 20, 'eval_duration': 2e9, 'load_duration': 0})
+    ThroughputStats("http://other", "m").save()
+    assert cache_writer.flush(5)
+
+    reloaded = ThroughputStats("http://ollama", "m")
+    assert reloaded.prompt_tps == 100.0
+    assert reloaded.generation_tps == 10.0
+    assert reloaded.samples == 1
+    assert set(load_cache(ThroughputStats.CACHE_NAME)['hosts']) == {"http://ollama|m", "http://other|m"}
@@ -0,0 +1,79 @@
+import time
+from datetime import datetime, timezone
+
+import pytest
+from day_summarizer import ReportSchedule, ZoneInfo
+
+pytestmark = pytest.mark.skipif(ZoneInfo is None, reason="zoneinfo needs Python 3.9")
+
+BERLIN = ZoneInfo("Europe/Berlin") if ZoneInfo else None
+
+
+def at(*args, zone=BERLIN):
+    return datetime(*args, tzinfo=zone)
+
+
+def test_parses_daily_and_weekly_entries():
+    schedule = ReportSchedule("daily 08:00, 17:30; weekly mon 09:00", "UTC")
+    assert schedule.entries == [
+        {'weekday': None, 'hour': 8, 'minute': 0},
+        {'weekday': None, 'hour': 17, 'minute': 30},
+        {'weekday': 0, 'hour': 9, 'minute': 0},
+    ]
+
+
+@pytest.mark.parametrize("spec", ["", "weekly 09:00", "daily", "daily 25:00"])
+def test_rejects_invalid_specs(spec):
+    with pytest.raises(ValueError):
+        ReportSchedule(spec, "UTC")
+
+
+def test_rejects_unknown_time_zone():
+    with pytest.raises(ValueError):
+        ReportSchedule("daily 08:00", "Not/AZone")
+
+
+def test_next_run_picks_the_earliest_entry():
+    schedule = ReportSchedule("daily 08:00, 17:30", "Europe/Berlin")
+    when, entry = schedule.next_run(at(2025, 6, 2, 12, 0))
+    assert (when.hour, when.minute) == (17, 30)
+    when, entry = schedule.next_run(at(2025, 6, 2, 18, 0))
+    assert when.replace(tzinfo=None) == datetime(2025, 6, 3, 8, 0)
+
+
+def test_weekly_entry_waits_for_its_weekday():
+    entry = {'weekday': 0, 'hour': 9, 'minute': 0}
+    # Monday 2025-06-02, just after the run: next Monday
+    assert ReportSchedule._next_for(entry, at(2025, 6, 2, 9, 1), BERLIN).day == 9
+    # Wednesday: the following Monday
+    assert ReportSchedule._next_for(entry, at(2025, 6, 4, 12, 0), BERLIN).day == 9
+
+
+def test_daily_time_stays_on_the_wall_clock_across_dst():
+    entry = {'weekday': None, 'hour': 8, 'minute': 0}
+    # Clocks go forward at 02:00 on 2025-03-30 in Berlin
+    when = ReportSchedule._next_for(entry, at(2025, 3, 29, 9, 0), BERLIN)
+    assert when.replace(tzinfo=None) == datetime(2025, 3, 30, 8, 0)
+    assert when.astimezone(timezone.utc).hour == 6  # CEST, not the CET offset of "now"
+    # Clocks go back at 03:00 on 2025-10-26
+    when = ReportSchedule._next_for(entry, at(2025, 10, 25, 9, 0), BERLIN)
+    assert when.astimezone(timezone.utc).hour == 7
+
+
+def test_time_skipped_by_dst_moves_to_the_real_time_after_it():
+    entry = {'weekday': None, 'hour': 2, 'minute': 30}
+    when = ReportSchedule._next_for(entry, at(2025, 3, 29, 12, 0), BERLIN)
+    assert when.astimezone(timezone.utc) == datetime(2025, 3, 30, 1, 30, tzinfo=timezone.utc)
+    assert (when.hour, when.minute) == (3, 30)
+
+
+def test_local_zone_uses_each_dates_own_offset(monkeypatch):
+    monkeypatch.setenv("TZ", "Europe/Berlin")
+    time.tzset()
+    try:
+        entry = {'weekday': None, 'hour': 8, 'minute': 0}
+        when = ReportSchedule._next_for(entry, at(2025, 3, 29, 9, 0))
+        assert when.astimezone(timezone.utc) == datetime(2025, 3, 30, 6, 0, tzinfo=timezone.utc)
+    finally:
+        monkeypatch.delenv("TZ")
+        time.tzset()
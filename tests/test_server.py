@@ -0,0 +1,40 @@
+from day_summarizer import SummaryJob
+from server import create_app
+
+
+def add_job(app, status="done", files=()):
+    jobs = app.config['JOB_QUEUE']
+    job = SummaryJob(1, "2025-01-01", "2025-01-01")
+    job.status = status
+    job.files = files
+    jobs.jobs[job.id] = job
+    return job
+
+
+def test_report_of_unknown_job_is_404():
+    client = create_app().test_client()
+    assert client.get("/jobs/99/report.md").status_code == 404
+
+
+def test_report_of_unfinished_job_is_409():
+    app = create_app()
+    add_job(app, status="running")
+    assert app.test_client().get("/jobs/1/report.md").status_code == 409
+
+
+def test_missing_report_format_is_404_not_500():
+    app = create_app()
+    add_job(app, files=("report.md",))  # A digest-style job with no HTML file
+    response = app.test_client().get("/jobs/1/report.html")
+    assert response.status_code == 404
+    assert "no html report" in response.get_json()['error']
+
+
+def test_report_is_served(tmp_path):
+    report = tmp_path / "report.md"
+    report.write_text("# Report", encoding='utf-8')
+    app = create_app()
+    add_job(app, files=(str(report),))
+    response = app.test_client().get("/jobs/1/report.md")
+    assert response.status_code == 200
+    assert response.data == b"# Report"